@@ -2,154 +2,405 @@ import pygame
 import random
 import math
 from config import *
+from spatial import candidates
+from obstacle_field import ObstacleField
+
+
+class BoundVector(pygame.math.Vector2):
+    #Vector2 legat de doua campuri float ale unei entitati (position -> x, y; velocity -> vx, vy)
+    #citirea e o copie de la momentul accesului; orice modificare pe loc (v.x = ..., v[0] = ...,
+    #v *= -1, v.rotate_ip(...)) se scrie inapoi in entitate, ca la vechiul Vector2 din atribut
+    #vectorii calculati din el (v + w, v.normalize()) nu sunt legati de nimic
+    __slots__ = ('owner', 'fields')
+    
+    def __init__(self, owner, fields):
+        super().__init__(getattr(owner, fields[0]), getattr(owner, fields[1]))
+        self.owner = owner
+        self.fields = fields
+        
+    def write_back(self):
+        owner = getattr(self, 'owner', None)
+        if owner is not None:
+            setattr(owner, self.fields[0], self.x)
+            setattr(owner, self.fields[1], self.y)
+            
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name not in BoundVector.__slots__:
+            self.write_back()
+
+
+def _writing_back(method):
+    def wrapper(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        self.write_back()
+        return result
+    return wrapper
+
+
+for _name in ('__setitem__', '__iadd__', '__isub__', '__imul__', '__itruediv__', '__ifloordiv__',
+              'normalize_ip', 'scale_to_length', 'rotate_ip', 'rotate_rad_ip', 'reflect_ip',
+              'clamp_magnitude_ip', 'move_towards_ip', 'update', 'from_polar'):
+    if hasattr(pygame.math.Vector2, _name):
+        setattr(BoundVector, _name, _writing_back(getattr(pygame.math.Vector2, _name)))
+
+
+class Trail:
+    #urma unui agent ca secventa de Vector2, de la cel mai vechi punct la cel mai nou
+    #e o vedere peste ring-ul agentului: append / pop(0) / clear il modifica direct
+    __slots__ = ('agent',)
+    
+    def __init__(self, agent):
+        self.agent = agent
+        
+    def __len__(self):
+        return self.agent.trail_count
+    
+    def __iter__(self):
+        return (pygame.math.Vector2(x, y) for x, y in self.agent.trail_points())
+    
+    def __getitem__(self, index):
+        return list(self)[index]
+    
+    def append(self, point):
+        #cand ring-ul e plin, cel mai vechi punct se pierde (ca la vechiul pop(0) dupa max_trail)
+        self.agent.push_trail(float(point[0]), float(point[1]))
+        
+    def pop(self, index=-1):
+        points = list(self)
+        point = points.pop(index)
+        self.agent.trail = points
+        return point
+    
+    def clear(self):
+        self.agent.trail_count = 0
+
 
 class Agent:    
-    def __init__(self, x, y, speed, color):
-        self.position = pygame.math.Vector2(x, y)
-        self.velocity = pygame.math.Vector2(
-            random.uniform(-1, 1), 
-            random.uniform(-1, 1)
-        ).normalize()
-        self.speed = speed
+    #pozitia si viteza sunt float-uri simple (x, y, vx, vy), fara Vector2 per agent
+    #position/velocity raman ca proprietati (BoundVector: copie la citire, scrierile ajung in x, y, vx, vy),
+    #pentru codul din afara; calculele din bucle sunt facute pe float-uri, in aceeasi ordine ca
+    #operatiile Vector2, deci rezultatele sunt identice bit cu bit
+    __slots__ = ('x', 'y', 'vx', 'vy', 'speed', 'color', 'max_trail',
+                 'trail_buffer', 'trail_head', 'trail_count', 'removed', 'generation')
+    
+    def __init__(self, x, y, speed, color, rng=random):
         self.color = color
-        self.trail = []
-        self.max_trail = 10
-        
+        #urma e un ring de marime fixa, alocat la prima pozitie salvata
+        #fiecare punct e scris de doua ori (i si i + max_trail), ca ultimele puncte sa fie mereu
+        #o bucata continua din buffer, in ordine, fara rotiri
+        #un obiect refolosit din pool isi pastreaza buffer-ul, doar il goleste
+        self.trail_buffer = None
+        #creste de fiecare data cand obiectul se intoarce in pool (vezi pool.py)
+        self.generation = 0
+        self.place(x, y, speed, rng)
+        
+    def place(self, x, y, speed, rng):
+        #starea de la nastere, comuna pt prada si pradator; rng = generatorul simularii
+        self.x = float(x)
+        self.y = float(y)
+        vx = rng.uniform(-1, 1)
+        vy = rng.uniform(-1, 1)
+        length = math.sqrt(vx * vx + vy * vy)
+        self.vx = vx / length
+        self.vy = vy / length
+        self.speed = speed
+        self.max_trail = TRAIL_LENGTH #se poate schimba per agent; ring-ul se realoca la urmatorul punct
+        self.trail_head = 0
+        self.trail_count = 0
+        #marcat de engine cand agentul moare sau e mancat; iese din liste la finalul tick-ului
+        self.removed = False
+        
+    @property
+    def position(self):
+        return BoundVector(self, ('x', 'y'))
+    
+    @position.setter
+    def position(self, value):
+        self.x, self.y = float(value[0]), float(value[1])
+    
+    @property
+    def velocity(self):
+        return BoundVector(self, ('vx', 'vy'))
+    
+    @velocity.setter
+    def velocity(self, value):
+        self.vx, self.vy = float(value[0]), float(value[1])
+    
     def update_position(self, obstacles):
-        avoidance = self.avoid_obstacles(obstacles)
-        if avoidance.length() > 0:
-            self.velocity = avoidance.normalize() #schimb directia agentului pt a evita obstacolul
-        
-        self.position += self.velocity * self.speed
-        
-        if self.position.x < 0 or self.position.x > WIDTH:
-            self.velocity.x *= -1
-        if self.position.y < 0 or self.position.y > HEIGHT:
-            self.velocity.y *= -1
+        ax, ay = self.avoid_obstacles(obstacles)
+        length = math.sqrt(ax * ax + ay * ay)
+        if length > 0:
+            #schimb directia agentului pt a evita obstacolul
+            self.vx = ax / length
+            self.vy = ay / length
+        
+        self.x += self.vx * self.speed
+        self.y += self.vy * self.speed
+        
+        if self.x < 0 or self.x > WIDTH:
+            self.vx *= -1
+        if self.y < 0 or self.y > HEIGHT:
+            self.vy *= -1
         #aici daca se loveste de margini, schimb directia
             
-        self.position.x = max(0, min(self.position.x, WIDTH))
-        self.position.y = max(0, min(self.position.y, HEIGHT))
-        
-        self.trail.append(self.position.copy())
-        if len(self.trail) > self.max_trail:
-            self.trail.pop(0)
+        if self.x < 0:
+            self.x = 0.0
+        elif self.x > WIDTH:
+            self.x = float(WIDTH)
+        if self.y < 0:
+            self.y = 0.0
+        elif self.y > HEIGHT:
+            self.y = float(HEIGHT)
+    
+    def record_trail(self):
+        #apelat de engine dupa miscare, doar daca el deseneaza urmele (record_trails e al fiecarui engine)
+        self.push_trail(self.x, self.y)
+    
+    def push_trail(self, x, y):
+        size = self.max_trail
+        if self.trail_buffer is None or len(self.trail_buffer) != 2 * size:
+            #max_trail schimbat: ring nou, cu ultimele puncte care mai incap
+            points = self.trail_points()[-size:] if self.trail_buffer is not None else []
+            self.trail_buffer = [[0.0, 0.0] for _ in range(2 * size)]
+            self.trail_head = 0
+            self.trail_count = 0
+            for px, py in points:
+                self.push_trail(px, py)
+        point = self.trail_buffer[self.trail_head]
+        point[0] = x
+        point[1] = y
+        point = self.trail_buffer[self.trail_head + size]
+        point[0] = x
+        point[1] = y
+        self.trail_head = (self.trail_head + 1) % size
+        if self.trail_count < size:
+            self.trail_count += 1
+    
+    def trail_points(self):
+        #punctele urmei, de la cel mai vechi la cel mai nou (bucata din buffer, fara copiere de puncte)
+        if self.trail_count == 0:
+            return []
+        size = len(self.trail_buffer) // 2
+        start = (self.trail_head - self.trail_count) % size
+        return self.trail_buffer[start:start + self.trail_count]
+    
+    @property
+    def trail(self):
+        return Trail(self)
+    
+    @trail.setter
+    def trail(self, points):
+        points = [(float(p[0]), float(p[1])) for p in points]
+        self.trail_count = 0
+        for x, y in points:
+            self.push_trail(x, y)
+    
+    def distance_to(self, other):
+        dx = self.x - other.x
+        dy = self.y - other.y
+        return math.sqrt(dx * dx + dy * dy)
+    
+    def direction_from(self, x, y):
+        #vectorul unitar de la (x, y) spre agent, sau directia curenta daca sunt in acelasi punct
+        dx = self.x - x
+        dy = self.y - y
+        length = math.sqrt(dx * dx + dy * dy)
+        if length > 0:
+            return dx / length, dy / length
+        return self.vx, self.vy
+    
+    def direction_to(self, target):
+        dx = target.x - self.x
+        dy = target.y - self.y
+        length = math.sqrt(dx * dx + dy * dy)
+        if length > 0:
+            return dx / length, dy / length
+        return self.vx, self.vy
     
     def avoid_obstacles(self, obstacles):
-        avoidance = pygame.math.Vector2(0, 0)
+        if isinstance(obstacles, ObstacleField):
+            #camp precalculat: O(1), oricate obstacole ar fi
+            sample = obstacles.sample(self.x, self.y)
+            if sample is None:
+                return 0.0, 0.0
+            return sample
+        
+        ax = 0.0
+        ay = 0.0
         
         for obstacle in obstacles:
-            distance = self.position.distance_to(obstacle.position)
+            dx = self.x - obstacle.position.x # directia de la obstacol la agent
+            dy = self.y - obstacle.position.y
+            distance = math.sqrt(dx * dx + dy * dy)
             if distance < obstacle.radius + 30:  # 30 = distanta de evitare
-                direction = (self.position - obstacle.position) # directia de la obstacol la agent
-                if direction.length() > 0:
-                    avoidance += direction.normalize() * (1 / max(distance, 1))
+                if distance > 0:
+                    weight = 1 / max(distance, 1)
+                    ax += dx / distance * weight
+                    ay += dy / distance * weight
         
-        return avoidance
+        return ax, ay
     
     def draw_trail(self, screen):
         #Desenez urma agentului
-        if len(self.trail) > 1:
-            pygame.draw.lines(screen, self.color, False, 
-                            [(int(p.x), int(p.y)) for p in self.trail], 1)
+        if self.trail_count > 1:
+            pygame.draw.lines(screen, self.color, False, self.trail_points(), 1)
 
 
 class Prey(Agent):    
-    def __init__(self, x, y):
-        super().__init__(x, y, BASE_PREY_SPEED, PREY_COLOR)
+    __slots__ = ('energy', 'reproduction_cooldown', 'vision', 'food_vision', 'idle')
+    
+    def __init__(self, x, y, rng=random):
+        super().__init__(x, y, BASE_PREY_SPEED, PREY_COLOR, rng)
+        self.reset_vitals()
+        
+    def respawn(self, x, y, rng=random):
+        #o prada noua in (x, y); apelat si cand obiectul e refolosit din pool
+        self.place(x, y, BASE_PREY_SPEED, rng)
+        self.reset_vitals()
+        
+    def reset_vitals(self):
         self.energy = PREY_INITIAL_ENERGY
         self.reproduction_cooldown = 0
         self.vision = PREY_VISION
         self.food_vision = PREY_FOOD_VISION
+        #> 0: cate tick-uri mai sare peste decizie (izolata, vezi SimulationEngine.idle_horizon)
+        #< 0: decide normal, iar izolarea se mai verifica abia peste -idle tick-uri
+        self.idle = 0
         
     def update(self, predators, prey_list, food_list, obstacles):
+        #True daca a decis sa-si pastreze directia (nimic in raza de perceptie, probabil izolata)
+        self.spend_energy()
+        vx, vy, speed = self.plan(predators, prey_list, food_list)
+        kept = self.adopt(vx, vy, speed)
+        self.update_position(obstacles)
+        return kept
+    
+    def plan(self, predators, prey_list, food_list):
+        #decizia pt tick-ul asta; cat timp e izolata isi pastreaza directia fara sa se uite in jur
+        if self.idle > 0:
+            return self.vx, self.vy, self.speed
+        return self.decide(predators, prey_list, food_list)
+    
+    def adopt(self, vx, vy, speed):
+        #aplic decizia si avansez contorul idle; True la o decizie reala care a pastrat directia
+        kept = False
+        if self.idle > 0:
+            self.idle -= 1
+        elif self.idle < 0:
+            self.idle += 1
+        else:
+            kept = vx == self.vx and vy == self.vy
+        self.vx = vx
+        self.vy = vy
+        self.speed = speed
+        return kept
+    
+    def spend_energy(self):
         self.energy -= PREY_ENERGY_LOSS
         
         if self.reproduction_cooldown > 0:
             self.reproduction_cooldown -= 1
-        
+    
+    def decide(self, predators, prey_list, food_list):
+        #(vx, vy, speed) pentru tick-ul asta; doar citeste starea celorlalti, nu modifica nimic,
+        #deci in modul sincron toate prazile pot decide din aceeasi stare
         nearest_predator = self.find_nearest(predators, self.vision)
         
         if nearest_predator:
             # PRIORITATE 1: Fugi de predator
-            self.flee_from(nearest_predator)
-        elif self.energy < 80:  
+            return self.flee_direction(nearest_predator) + (self.speed,)
+        elif self.energy < PREY_HUNGER_ENERGY: # sub prag cauta mancare, peste face flocking
             # PRIORITATE 2: Cauta food
             nearest_food = self.find_nearest(food_list, self.food_vision)
             if nearest_food:
-                self.move_towards(nearest_food)
-        else:
-            # PRIORITATE 3: Flocking 
-            self.flock(prey_list)
-        
-        self.update_position(obstacles)
+                return self.direction_to(nearest_food) + (self.speed,)
+            return self.vx, self.vy, self.speed
+        # PRIORITATE 3: Flocking 
+        return self.flock_steering(prey_list)
         
     def find_nearest(self, entities, vision_range):
         nearest = None
         min_dist = vision_range
+        x, y = self.x, self.y
         
-        for entity in entities:
-            if entity == self:
+        for entity in candidates(entities, x, y, vision_range, self):
+            if entity is self or entity.removed:
                 continue
-            dist = self.position.distance_to(entity.position)
+            dx = x - entity.x
+            dy = y - entity.y
+            dist = math.sqrt(dx * dx + dy * dy)
             if dist < min_dist:
                 min_dist = dist
                 nearest = entity
         
         return nearest
     
+    def flee_direction(self, predator):
+        return self.direction_from(predator.x, predator.y) #schimb directia pt a fugi
+    
     def flee_from(self, predator):
-        flee_direction = (self.position - predator.position) #schimb directia pt a fugi
-        if flee_direction.length() > 0:
-            self.velocity = flee_direction.normalize()
+        self.vx, self.vy = self.flee_direction(predator)
     
     def move_towards(self, target): #opusul lui flee_from
-        direction = (target.position - self.position)
-        if direction.length() > 0:
-            self.velocity = direction.normalize()
+        self.vx, self.vy = self.direction_to(target)
     
     def flock(self, prey_list):
-        separation = pygame.math.Vector2(0, 0)
-        alignment = pygame.math.Vector2(0, 0)
-        cohesion = pygame.math.Vector2(0, 0)
+        self.vx, self.vy, self.speed = self.flock_steering(prey_list)
+    
+    def flock_steering(self, prey_list):
+        x, y = self.x, self.y
+        separation_x = separation_y = 0.0
+        alignment_x = alignment_y = 0.0
+        cohesion_x = cohesion_y = 0.0
         neighbors = 0
         
-        for other in prey_list:
-            if other == self:
+        for other in candidates(prey_list, x, y, FLOCKING_RADIUS, self):
+            if other is self or other.removed:
                 continue
                 
-            distance = self.position.distance_to(other.position)
+            dx = x - other.x
+            dy = y - other.y
+            distance = math.sqrt(dx * dx + dy * dy)
             
             if distance < FLOCKING_RADIUS:
                 neighbors += 1
                 
                 # Separation, evita aglomerarea, coliziunea
                 if distance < 20:
-                    separation += (self.position - other.position)
+                    separation_x += dx
+                    separation_y += dy
                 
                 # Alignment, da viteza 
-                alignment += other.velocity
+                alignment_x += other.vx
+                alignment_y += other.vy
                 
                 # Cohesion, Mergi spre centrul grupului
-                cohesion += other.position
+                cohesion_x += other.x
+                cohesion_y += other.y
         
         if neighbors > 0:
-            alignment /= neighbors
-            cohesion /= neighbors
-            cohesion = (cohesion - self.position)
+            #Vector2 imparte inmultind cu inversul; pastrez asta ca rezultatul sa fie acelasi
+            inverse = 1.0 / neighbors
+            alignment_x *= inverse
+            alignment_y *= inverse
+            cohesion_x = cohesion_x * inverse - x
+            cohesion_y = cohesion_y * inverse - y
             
             # Aplic weight-uri
-            separation *= SEPARATION_WEIGHT
-            alignment *= ALIGNMENT_WEIGHT
-            cohesion *= COHESION_WEIGHT
+            steering_x = (separation_x * SEPARATION_WEIGHT + alignment_x * ALIGNMENT_WEIGHT
+                          + cohesion_x * COHESION_WEIGHT)
+            steering_y = (separation_y * SEPARATION_WEIGHT + alignment_y * ALIGNMENT_WEIGHT
+                          + cohesion_y * COHESION_WEIGHT)
             
-            steering = separation + alignment + cohesion
-            if steering.length() > 0:
-                self.velocity = steering.normalize()
+            vx, vy = self.vx, self.vy
+            length = math.sqrt(steering_x * steering_x + steering_y * steering_y)
+            if length > 0:
+                vx = steering_x / length
+                vy = steering_y / length
             
-            self.speed = BASE_PREY_SPEED + min(neighbors * FLOCK_SPEED_BONUS, 1.5)
-        else:
-            self.speed = BASE_PREY_SPEED
+            return vx, vy, BASE_PREY_SPEED + min(neighbors * FLOCK_SPEED_BONUS, 1.5)
+        return self.vx, self.vy, BASE_PREY_SPEED
     
     def eat_food(self, food):
         self.energy = min(self.energy + PREY_ENERGY_GAIN_FOOD, PREY_MAX_ENERGY)
@@ -158,15 +409,18 @@ class Prey(Agent):
         return (self.energy >= PREY_REPRODUCTION_ENERGY and 
                 self.reproduction_cooldown == 0)
     
-    def reproduce(self):
+    def reproduce(self, pool=None, rng=random):
+        #cu pool, puiul e un obiect refolosit (vezi EntityPool)
         self.energy -= PREY_REPRODUCTION_COST
         self.reproduction_cooldown = PREY_REPRODUCTION_COOLDOWN
         
         # Offset mic pentru nou-nascut
-        offset_x = random.randint(-20, 20)
-        offset_y = random.randint(-20, 20)
+        offset_x = rng.randint(-20, 20)
+        offset_y = rng.randint(-20, 20)
         
-        return Prey(self.position.x + offset_x, self.position.y + offset_y)
+        if pool is not None:
+            return pool.acquire(self.x + offset_x, self.y + offset_y)
+        return Prey(self.x + offset_x, self.y + offset_y, rng)
     
     def is_alive(self):
         return self.energy > 0
@@ -180,52 +434,73 @@ class Prey(Agent):
             color = (255, 150, 50)  # Portocaliu
         
         pygame.draw.circle(screen, color, 
-                         (int(self.position.x), int(self.position.y)), 5)
+                         (int(self.x), int(self.y)), 5)
         self.draw_trail(screen)
         
         pygame.draw.rect(screen, (255, 0, 0), 
-                        (int(self.position.x) - 10, int(self.position.y) - 15, 20, 3))
+                        (int(self.x) - 10, int(self.y) - 15, 20, 3))
         pygame.draw.rect(screen, (0, 255, 0), 
-                        (int(self.position.x) - 10, int(self.position.y) - 15, 
+                        (int(self.x) - 10, int(self.y) - 15,
                          int(20 * (self.energy / PREY_MAX_ENERGY)), 3))
 
 
 class Predator(Agent):    
-    def __init__(self, x, y):
-        super().__init__(x, y, BASE_PREDATOR_SPEED, PREDATOR_COLOR)
+    __slots__ = ('energy', 'reproduction_cooldown', 'vision')
+    
+    def __init__(self, x, y, rng=random):
+        super().__init__(x, y, BASE_PREDATOR_SPEED, PREDATOR_COLOR, rng)
+        self.reset_vitals()
+        
+    def respawn(self, x, y, rng=random):
+        self.place(x, y, BASE_PREDATOR_SPEED, rng)
+        self.reset_vitals()
+        
+    def reset_vitals(self):
         self.energy = PREDATOR_INITIAL_ENERGY
         self.reproduction_cooldown = 0
         self.vision = PREDATOR_VISION
         
     def update(self, prey_list, predators, obstacles):
+        self.spend_energy()
+        self.vx, self.vy = self.decide(prey_list)
+        self.update_position(obstacles)
+    
+    def spend_energy(self):
         self.energy -= PREDATOR_ENERGY_LOSS
         
         if self.reproduction_cooldown > 0:
             self.reproduction_cooldown -= 1
-        
+    
+    def decide(self, prey_list):
+        #(vx, vy) pentru tick-ul asta, fara sa modific nimic (vezi Prey.decide)
         if prey_list:
             nearest_prey = self.find_nearest_prey(prey_list)
             if nearest_prey:
-                self.hunt(nearest_prey)
-        
-        self.update_position(obstacles)
+                return self.hunt_direction(nearest_prey)
+        return self.vx, self.vy
     
     def find_nearest_prey(self, prey_list):
         nearest = None
         min_dist = self.vision
+        x, y = self.x, self.y
         
-        for prey in prey_list:
-            dist = self.position.distance_to(prey.position)
+        for prey in candidates(prey_list, x, y, self.vision, self):
+            if prey.removed:
+                continue
+            dx = x - prey.x
+            dy = y - prey.y
+            dist = math.sqrt(dx * dx + dy * dy)
             if dist < min_dist:
                 min_dist = dist
                 nearest = prey
         
         return nearest
     
+    def hunt_direction(self, prey):
+        return self.direction_to(prey)
+    
     def hunt(self, prey):
-        direction = (prey.position - self.position)
-        if direction.length() > 0:
-            self.velocity = direction.normalize()
+        self.vx, self.vy = self.hunt_direction(prey)
     
     def eat_prey(self, prey):
         self.energy = min(self.energy + PREDATOR_ENERGY_GAIN_PREY, PREDATOR_MAX_ENERGY)
@@ -234,14 +509,16 @@ class Predator(Agent):
         return (self.energy >= PREDATOR_REPRODUCTION_ENERGY and 
                 self.reproduction_cooldown == 0)
     
-    def reproduce(self):
+    def reproduce(self, pool=None, rng=random):
         self.energy -= PREDATOR_REPRODUCTION_COST
         self.reproduction_cooldown = PREDATOR_REPRODUCTION_COOLDOWN
         
-        offset_x = random.randint(-20, 20)
-        offset_y = random.randint(-20, 20)
+        offset_x = rng.randint(-20, 20)
+        offset_y = rng.randint(-20, 20)
         
-        return Predator(self.position.x + offset_x, self.position.y + offset_y)
+        if pool is not None:
+            return pool.acquire(self.x + offset_x, self.y + offset_y)
+        return Predator(self.x + offset_x, self.y + offset_y, rng)
     
     def is_alive(self):
         return self.energy > 0
@@ -254,7 +531,7 @@ class Predator(Agent):
         else:
             color = (150, 50, 50)
         
-        angle = self.velocity.angle_to(pygame.math.Vector2(1, 0))
+        angle = pygame.math.Vector2(self.vx, self.vy).angle_to(pygame.math.Vector2(1, 0))
         
         points = [
             pygame.math.Vector2(12, 0),
@@ -262,25 +539,43 @@ class Predator(Agent):
             pygame.math.Vector2(-6, 6),
         ]
         
-        rotated = [self.position + p.rotate(-angle) for p in points]
+        position = pygame.math.Vector2(self.x, self.y)
+        rotated = [position + p.rotate(-angle) for p in points]
         pygame.draw.polygon(screen, color, rotated)
         self.draw_trail(screen)
         
         pygame.draw.rect(screen, (255, 0, 0), 
-                        (int(self.position.x) - 12, int(self.position.y) - 18, 24, 3))
+                        (int(self.x) - 12, int(self.y) - 18, 24, 3))
         pygame.draw.rect(screen, (0, 255, 0), 
-                        (int(self.position.x) - 12, int(self.position.y) - 18, 
+                        (int(self.x) - 12, int(self.y) - 18,
                          int(24 * (self.energy / PREDATOR_MAX_ENERGY)), 3))
 
 
 class Food:    
-    def __init__(self, x, y):
-        self.position = pygame.math.Vector2(x, y)
+    __slots__ = ('x', 'y', 'radius', 'removed', 'generation')
+    
+    def __init__(self, x, y, rng=None):
         self.radius = 4
-        
+        self.generation = 0
+        self.respawn(x, y)
+        
+    def respawn(self, x, y, rng=None):
+        #rng nefolosit: mancarea nu are directie (semnatura e aceeasi ca la agenti, pt EntityPool)
+        self.x = float(x)
+        self.y = float(y)
+        self.removed = False
+        
+    @property
+    def position(self):
+        return BoundVector(self, ('x', 'y'))
+    
+    @position.setter
+    def position(self, value):
+        self.x, self.y = float(value[0]), float(value[1])
+    
     def draw(self, screen):
         pygame.draw.circle(screen, FOOD_COLOR, 
-                         (int(self.position.x), int(self.position.y)), self.radius)
+                         (int(self.x), int(self.y)), self.radius)
 
 
 class Obstacle:    
@@ -291,4 +586,4 @@ class Obstacle:
     def draw(self, screen):
         pygame.draw.circle(screen, OBSTACLE_COLOR, 
                          (int(self.position.x), int(self.position.y)), 
-                         self.radius, 2)  # 2 = grosime contur
\ No newline at end of file
+                         self.radius, 2)  # 2 = grosime contur
@@ -0,0 +1,231 @@
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+import config
+from engine import create_engine
+from sweep import apply_parameters
+
+#scenariile pornesc din reset_simulation si sunt marite pana la N prada,
+#cu pradatori si mancare in aceleasi proportii ca la inceputul simularii
+SIZES = [100, 1000, 10000, 100000]
+PHASE_NAMES = ['update_prey', 'update_predators', 'spawn_food', 'update_history']
+
+#peste densitatea asta (1000 de prazi in fereastra implicita) lumea se mareste, altfel la 10^5
+#fiecare prada ar avea mii de vecini si scenariul n-ar mai masura ceva realist
+DENSITY = 1000 / (config.WIDTH * config.HEIGHT)
+#fereastra implicita; config.WIDTH/HEIGHT raman cu lumea scenariului anterior pana la urmatorul apply_parameters
+WINDOW = (config.WIDTH, config.HEIGHT)
+
+
+def world_size(prey, density=DENSITY):
+    width, height = WINDOW
+    scale = max(1.0, math.sqrt(prey / (density * width * height)))
+    return round(width * scale), round(height * scale)
+
+
+def build_scenario(backend, prey, seed, record_trails=False, density=DENSITY, workers=None):
+    #workers = procesele backend-ului "tiles" (TILE_WORKERS); la celelalte nu conteaza
+    width, height = world_size(prey, density)
+    apply_parameters({'WIDTH': width, 'HEIGHT': height, 'TILE_WORKERS': workers})
+    engine = create_engine(backend, record_trails=record_trails, seed=seed)
+    predators = max(config.INITIAL_PREDATORS, round(prey * config.INITIAL_PREDATORS / config.INITIAL_PREY))
+    food = max(config.INITIAL_FOOD, round(prey * config.INITIAL_FOOD / config.INITIAL_PREY))
+    for _ in range(prey - config.INITIAL_PREY):
+        engine.add_prey()
+    for _ in range(predators - config.INITIAL_PREDATORS):
+        engine.add_predator()
+    if food > config.INITIAL_FOOD:
+        engine.add_food(food - config.INITIAL_FOOD)
+    return engine
+
+
+def peak_memory(fn, repeats):
+    #varful de memorie alocata (KB) peste ce exista deja, pe `repeats` apeluri
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        for _ in range(repeats):
+            fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return (peak - base) / 1024
+
+
+def timed(fn, count, budget):
+    #cel putin un apel; se opreste la `count` apeluri sau dupa `budget` secunde
+    #intoarce durata fiecarui apel (s), mediana e mai stabila decat media la rulari scurte
+    durations = []
+    start = time.perf_counter()
+    while True:
+        before = time.perf_counter()
+        fn()
+        after = time.perf_counter()
+        durations.append(after - before)
+        if len(durations) >= count or after - start >= budget:
+            return durations
+
+
+def bench_ticks(backend, prey, seed, ticks, budget, density=DENSITY, workers=None):
+    engine = build_scenario(backend, prey, seed, density=density, workers=workers)
+    population = engine.population()
+
+    engine.update() #incalzire (alocari, cache-uri)
+    memory = peak_memory(engine.update, 1)
+
+    engine.profiler.resize(max(engine.profiler.window, ticks))
+    engine.profiler.enabled = True
+    durations = timed(engine.update, ticks, budget)
+    summary = engine.profiler.summary()
+
+    return {
+        'population': list(population),
+        'ticks': len(durations),
+        'tps': len(durations) / sum(durations),
+        'ms_per_tick': float(np.median(durations)) * 1000,
+        'phases_ms': {name: summary[name]['p50'] for name in PHASE_NAMES if name in summary},
+        'neighbor_checks': summary['neighbor_checks']['mean'] if 'neighbor_checks' in summary else 0,
+        'peak_kb': memory,
+    }
+
+
+def bench_render(backend, prey, seed, frames, budget, density=DENSITY, workers=None):
+    from simulation import Simulation
+
+    #fereastra ramane de marimea implicita; intr-o lume marita se deseneaza doar ce intra in camera
+    #(centrul lumii, zoom 1), deci costul ar trebui sa depinda de densitate, nu de marimea lumii
+    engine = build_scenario(backend, prey, seed, record_trails=True, density=density, workers=workers)
+    engine.step(10) #urmele se umplu
+    sim = Simulation(engine, export=False)
+
+    sim.render()
+    memory = peak_memory(sim.render, 1)
+    durations = timed(sim.render, frames, budget)
+    return {
+        'frames': len(durations),
+        'fps': len(durations) / sum(durations),
+        'ms_per_frame': float(np.median(durations)) * 1000,
+        'peak_kb': memory,
+    }
+
+
+def run_benchmarks(backends, sizes, seed=0, ticks=100, frames=30, budget=10.0, render=True,
+                   density=DENSITY, workers=None):
+    #workers: lista de TILE_WORKERS de incercat la backend-ul "tiles" (scalare), fiecare cu scenariul lui
+    results = []
+    for backend in backends:
+        for count in (workers or [None]) if backend == "tiles" else [None]:
+            for prey in sizes:
+                name = f"{backend}-{prey}" if count is None else f"{backend}-{prey}-w{count}"
+                result = {'name': name, 'backend': backend, 'prey': prey,
+                          'world': list(world_size(prey, density))}
+                if count is not None:
+                    result['workers'] = count
+                result['tick'] = bench_ticks(backend, prey, seed, ticks, budget, density, count)
+                print(f"{name}: {result['tick']['ms_per_tick']:.2f} ms/tick, "
+                      f"varf {result['tick']['peak_kb']:.0f} KB")
+                if render:
+                    result['render'] = bench_render(backend, prey, seed, frames, budget, density, count)
+                    print(f"{name}: render {result['render']['ms_per_frame']:.2f} ms/frame")
+                results.append(result)
+    apply_parameters({})
+
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'seed': seed,
+            'ticks': ticks,
+            'frames': frames,
+            'density': density,
+        },
+        'results': results,
+    }
+
+
+#(sectiune, metrica) comparate cu baseline-ul; la toate, mai mic e mai bine
+#timpii sunt mediane pe tick/frame
+METRICS = [
+    ('tick', 'ms_per_tick'),
+    ('tick', 'peak_kb'),
+    ('render', 'ms_per_frame'),
+    ('render', 'peak_kb'),
+]
+
+
+def compare(current, baseline, threshold=0.15):
+    #lista de regresii: metricile care s-au inrautatit cu mai mult de `threshold` fata de baseline
+    old = {result['name']: result for result in baseline['results']}
+    regressions = []
+    for result in current['results']:
+        before = old.get(result['name'])
+        if before is None:
+            continue
+        for section, metric in METRICS:
+            if section not in result or section not in before:
+                continue
+            new_value = result[section][metric]
+            old_value = before[section][metric]
+            if old_value <= 0:
+                continue
+            change = new_value / old_value - 1
+            status = "REGRESIE" if change > threshold else "ok"
+            print(f"{result['name']:>16} {section}.{metric:<13} {old_value:12.2f} -> {new_value:12.2f}"
+                  f" ({change:+.1%}) {status}")
+            if change > threshold:
+                regressions.append((result['name'], section, metric, old_value, new_value))
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark: ticks/s, timp pe faze si memorie, pe scenarii de 10^2..10^5 agenti")
+    parser.add_argument("--backend", action="append", choices=["objects", "numpy", "tiles"], default=None,
+                        help="se poate da de mai multe ori (implicit BACKEND din config)")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in SIZES),
+                        help="numarul de prazi per scenariu, separat prin virgula")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--ticks", type=int, default=100, help="tick-uri masurate per scenariu")
+    parser.add_argument("--frames", type=int, default=30, help="frame-uri randate per scenariu")
+    parser.add_argument("--budget", type=float, default=10.0,
+                        help="secunde maxime per masuratoare (minim un tick/frame)")
+    parser.add_argument("--density", type=float, default=DENSITY * 1e6,
+                        help="prazi pe milion de px^2 peste care lumea se mareste")
+    parser.add_argument("--workers", default=None,
+                        help="la --backend tiles: numarul de procese, separat prin virgula (ex. 1,2,4)")
+    parser.add_argument("--no-render", action="store_true", help="doar tick-urile, fara render")
+    parser.add_argument("--out", default="benchmark_results.json")
+    parser.add_argument("--baseline", default=None, help="rezultate salvate anterior, pentru comparatie")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="inrautatirea relativa peste care o metrica e regresie")
+    args = parser.parse_args()
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy") #render-ul se masoara fara fereastra vizibila
+
+    results = run_benchmarks(args.backend or [config.BACKEND],
+                             [int(size) for size in args.sizes.split(",")],
+                             args.seed, args.ticks, args.frames, args.budget, not args.no_render,
+                             args.density / 1e6,
+                             [int(count) for count in args.workers.split(",")] if args.workers else None)
+    with open(args.out, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Rezultate salvate în {args.out}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regresii peste {args.threshold:.0%}")
+            sys.exit(1)
+        print("Nicio regresie")
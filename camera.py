@@ -0,0 +1,78 @@
+from config import *
+
+#camera peste lume: fereastra arata doar o parte din ea, care se poate muta si mari
+#(x, y) = coltul stanga-sus al ferestrei, in coordonate lume; zoom = px de ecran per px de lume
+#cu lumea cat fereastra si zoom 1, coordonatele de ecran sunt chiar cele din lume
+
+
+class Camera:
+
+    def __init__(self, view_width, view_height, world_width, world_height):
+        self.view_width = view_width
+        self.view_height = view_height
+        self.world_width = world_width
+        self.world_height = world_height
+        self.zoom = 1.0
+        self.center()
+
+    def center(self):
+        self.x = (self.world_width - self.view_width / self.zoom) / 2
+        self.y = (self.world_height - self.view_height / self.zoom) / 2
+        self.clamp()
+
+    def fit_zoom(self):
+        #zoom-ul la care toata lumea incape in fereastra (mai departe de atat nu se poate)
+        return min(1.0, self.view_width / self.world_width, self.view_height / self.world_height)
+
+    def clamp(self):
+        self.zoom = max(self.fit_zoom(), min(self.zoom, MAX_ZOOM))
+        self.x = self.clamp_axis(self.x, self.view_width / self.zoom, self.world_width)
+        self.y = self.clamp_axis(self.y, self.view_height / self.zoom, self.world_height)
+
+    def clamp_axis(self, start, visible, world):
+        #lumea mai mica decat ce se vede: centrata; altfel camera nu iese din ea
+        if visible >= world:
+            return (world - visible) / 2
+        return max(0.0, min(start, world - visible))
+
+    def pan(self, dx, dy):
+        #deplasare in px de ecran
+        self.x += dx / self.zoom
+        self.y += dy / self.zoom
+        self.clamp()
+
+    def zoom_at(self, factor, sx, sy):
+        #punctul din lume de sub (sx, sy) ramane sub cursor
+        wx, wy = self.to_world(sx, sy)
+        self.zoom *= factor
+        self.clamp()
+        self.x = wx - sx / self.zoom
+        self.y = wy - sy / self.zoom
+        self.clamp()
+
+    def toggle_fit(self):
+        #toata lumea in fereastra, sau inapoi la 1:1 in centrul ei
+        self.zoom = 1.0 if self.zoom < 1.0 else self.fit_zoom()
+        self.center()
+
+    def to_screen(self, x, y):
+        return (x - self.x) * self.zoom, (y - self.y) * self.zoom
+
+    def to_world(self, sx, sy):
+        return self.x + sx / self.zoom, self.y + sy / self.zoom
+
+    def visible(self, margin=0):
+        #dreptunghiul din lume care se vede (x0, y0, x1, y1), largit cu `margin` px de lume
+        return (self.x - margin, self.y - margin,
+                self.x + self.view_width / self.zoom + margin,
+                self.y + self.view_height / self.zoom + margin)
+
+    def is_identity(self):
+        return self.zoom == 1.0 and self.x == 0 and self.y == 0
+
+    def transform(self, points):
+        #lista de puncte din lume -> ecran (pentru urme)
+        if self.is_identity():
+            return points
+        ox, oy, zoom = self.x, self.y, self.zoom
+        return [((x - ox) * zoom, (y - oy) * zoom) for x, y in points]
@@ -0,0 +1,148 @@
+import gc
+import json
+from operator import attrgetter
+import numpy as np
+from config import *
+from agents import Obstacle
+from history import COLUMN_NAMES
+from visualizer import SimulationVisualizer
+
+#starea completa a unei simulari intr-un singur fisier .npz necomprimat
+#fiecare camp (pozitii, viteze, energii, urme, istoric...) e un array numpy, deci salvarea si
+#incarcarea sunt cateva copieri de memorie; restul (contoare, starea generatoarelor, marimea lumii)
+#e un JSON, tot in fisier
+#dupa load(), simularea continua exact ca cea salvata: aceleasi tick-uri, bit cu bit
+#
+#partea specifica backend-ului (agentii si mancarea) vine din engine.snapshot() / engine.restore()
+
+VERSION = 1
+COUNTERS = ('total_prey_births', 'total_predator_births', 'total_prey_deaths',
+            'total_predator_deaths', 'food_spawn_timer')
+
+#backend-ul objects: ce se salveaza din fiecare entitate (atribut, dtype)
+PREY_STATE = (('x', 'f8'), ('y', 'f8'), ('vx', 'f8'), ('vy', 'f8'), ('speed', 'f8'),
+              ('energy', 'f8'), ('reproduction_cooldown', 'i4'), ('idle', 'i4'))
+PREDATOR_STATE = (('x', 'f8'), ('y', 'f8'), ('vx', 'f8'), ('vy', 'f8'), ('speed', 'f8'),
+                  ('energy', 'f8'), ('reproduction_cooldown', 'i4'))
+FOOD_STATE = (('x', 'f8'), ('y', 'f8'))
+
+
+def save(engine, path):
+    arrays, engine_meta = engine.snapshot()
+    history_arrays, history_meta = engine.visualizer.history.state()
+    for name, values in history_arrays.items():
+        arrays['history.' + name] = values
+    arrays['obstacles.position'] = np.array([tuple(o.position) for o in engine.obstacles],
+                                            dtype=float).reshape(-1, 2)
+    arrays['obstacles.radius'] = np.array([o.radius for o in engine.obstacles]) #int, cum vin din randint
+    version, words, gauss = engine.random.getstate()
+    arrays['random'] = np.array(words, dtype=np.uint32)
+    meta = {
+        'version': VERSION,
+        'backend': engine.backend,
+        'world': [WIDTH, HEIGHT],
+        'random': [version, gauss],
+        'counters': {name: getattr(engine, name) for name in COUNTERS},
+        'frame_count': engine.visualizer.frame_count,
+        'history': history_meta,
+        'engine': engine_meta,
+    }
+    arrays['meta'] = np.frombuffer(json.dumps(meta).encode(), dtype=np.uint8)
+    with open(path, 'wb') as f: #cu fisier deschis, numpy nu mai adauga el extensia .npz
+        np.savez(f, **arrays)
+
+
+def load(path, engine=None, seed=None):
+    #incarca starea in `engine` (acelasi backend) sau, fara engine, intr-unul nou, headless
+    #cu seed, generatoarele o iau de la capat din el: ramuri diferite din aceeasi stare
+    with np.load(path, allow_pickle=False) as data:
+        arrays = {name: data[name] for name in data.files}
+    meta = json.loads(arrays.pop('meta').tobytes())
+    if meta['version'] != VERSION:
+        raise ValueError(f"Versiune de checkpoint necunoscuta: {meta['version']}")
+    if engine is None:
+        from engine import create_engine
+        engine = create_engine(meta['backend'])
+    if array_backend(meta['backend']) != array_backend(engine.backend):
+        raise ValueError(f"Checkpoint-ul e pentru backend-ul {meta['backend']}, nu {engine.backend}")
+    if meta['world'] != [WIDTH, HEIGHT]:
+        width, height = meta['world']
+        raise ValueError(f"Checkpoint-ul e pentru o lume de {width}x{height}, nu {WIDTH}x{HEIGHT}")
+
+    #agentii intai: restore poate trage directii din generator, a carui stare se pune abia dupa
+    #backend-ul objects face milioane de liste mici (urmele): GC-ul ciclic le-ar tot parcurge degeaba
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        engine.restore(arrays, meta['engine'])
+    finally:
+        if gc_enabled:
+            gc.enable()
+    engine.obstacles = [Obstacle(x, y, radius) for (x, y), radius in
+                        zip(arrays['obstacles.position'].tolist(), arrays['obstacles.radius'].tolist())]
+    for name, value in meta['counters'].items():
+        setattr(engine, name, value)
+    version, gauss = meta['random']
+    engine.random.setstate((version, tuple(arrays['random'].tolist()), gauss))
+
+    visualizer = SimulationVisualizer(exporter=engine.exporter)
+    visualizer.history.restore({name[len('history.'):]: values for name, values in arrays.items()
+                                if name.startswith('history.')}, meta['history'])
+    visualizer.frame_count = meta['frame_count']
+    engine.visualizer = visualizer
+    if engine.exporter is not None:
+        #fisierul exportat o ia de la capat, cu istoricul din checkpoint
+        engine.exporter.restart()
+        engine.exporter.append_columns([visualizer.history[name].copy() for name in COLUMN_NAMES])
+    if seed is not None:
+        engine.reseed(seed)
+    return engine
+
+
+def array_backend(backend):
+    #numpy si tiles au aceeasi stare (array-uri), deci checkpoint-urile lor se pot schimba intre ele
+    return backend in ("numpy", "tiles")
+
+
+#backend-ul objects: liste de entitati <-> cate un array per atribut
+
+def entity_arrays(prefix, entities, fields):
+    return {f'{prefix}.{name}': np.fromiter(map(attrgetter(name), entities), dtype, len(entities))
+            for name, dtype in fields}
+
+
+def restore_entities(pool, arrays, prefix, fields):
+    #entitatile se iau din pool (ca la nasteri, din x si y), apoi primesc restul valorilor, coloana cu coloana
+    columns = [arrays[f'{prefix}.{name}'].tolist() for name, _ in fields]
+    entities = [pool.acquire(x, y) for x, y in zip(columns[0], columns[1])]
+    for (name, _), column in zip(fields[2:], columns[2:]):
+        for entity, value in zip(entities, column):
+            setattr(entity, name, value)
+    return entities
+
+
+def trail_arrays(prefix, agents):
+    #urmele in ordine, de la cel mai vechi punct (n, TRAIL_LENGTH, 2), plus cate puncte are fiecare
+    #(acelasi format ca la numpy; un agent cu max_trail mai mare isi salveaza doar ultimele puncte)
+    points = np.zeros((len(agents), TRAIL_LENGTH, 2))
+    counts = np.zeros(len(agents), np.int32)
+    for row, agent in enumerate(agents):
+        if agent.trail_count:
+            trail = agent.trail_points()[-TRAIL_LENGTH:]
+            points[row, :len(trail)] = trail
+            counts[row] = len(trail)
+    return {f'{prefix}.trail': points, f'{prefix}.trail_count': counts}
+
+
+def restore_trails(prefix, agents, arrays):
+    #ring-ul refacut incepe de la 0: punctul i e la i si i + max_trail, ca in record_trail
+    #(agentii vin din pool, deci au max_trail = TRAIL_LENGTH)
+    size = TRAIL_LENGTH
+    points, counts = arrays[f'{prefix}.trail'], arrays[f'{prefix}.trail_count']
+    rows = np.flatnonzero(counts)
+    buffers = np.concatenate((points[rows], points[rows]), axis=1).tolist()
+    for row, buffer, count in zip(rows.tolist(), buffers, counts[rows].tolist()):
+        agent = agents[row]
+        agent.trail_buffer = buffer
+        agent.trail_head = count % size
+        agent.trail_count = count
@@ -1,5 +1,10 @@
 WIDTH, HEIGHT = 1200, 800  
-#am stabilit dimensiunile ferestei
+#am stabilit dimensiunile lumii (unde se misca agentii)
+WINDOW_WIDTH, WINDOW_HEIGHT = 1200, 800
+#si ale ferestei; daca lumea e mai mare, fereastra arata doar o parte, prin camera
+MAX_ZOOM = 4 # cat de mult se poate mari (zoom-ul minim e cel la care incape toata lumea)
+ZOOM_STEP = 1.25 # factorul de zoom la o treapta a rotitei
+CAMERA_PAN_SPEED = 800 # px de ecran pe secunda cand camera se muta cu sagetile
 
 BACKGROUND_COLOR = (25, 25, 40)
 PREY_COLOR = (100, 200, 100)
@@ -16,6 +21,7 @@ PREY_INITIAL_ENERGY = 100
 PREY_MAX_ENERGY = 200
 PREY_ENERGY_LOSS = 0.05 # la fiecare frame pierde 0.05 energie
 PREY_ENERGY_GAIN_FOOD = 40 
+PREY_HUNGER_ENERGY = 80 # sub energia asta prada cauta mancare, peste face flocking (ambele backend-uri)
 
 PREDATOR_INITIAL_ENERGY = 100
 PREDATOR_MAX_ENERGY = 200
@@ -47,6 +53,58 @@ PREY_VISION = 90
 PREDATOR_VISION = 100
 PREY_FOOD_VISION = 70
 
+#distantele de contact (ambele backend-uri)
+FOOD_EAT_DISTANCE = 10 # prada mananca mancarea de mai aproape de atat
+PREY_CATCH_DISTANCE = 8 # pradatorul prinde prada de mai aproape de atat
+PREY_MATING_DISTANCE = 30
+PREDATOR_MATING_DISTANCE = 40
+
 BASE_PREY_SPEED = 2.5
 BASE_PREDATOR_SPEED = 2.8
-FLOCK_SPEED_BONUS = 0.35  
\ No newline at end of file
+FLOCK_SPEED_BONUS = 0.35
+
+USE_SPATIAL_GRID = True # False = cautare brute force (pentru comparatie)
+GRID_CELL_SIZE = FLOCKING_RADIUS # celula ~ raza de flocking, vision-ul acopera 2-3 celule
+USE_VERLET_LISTS = True # vecinii vazuti la decizii sunt tinuti minte cateva tick-uri (doar cu grila)
+VERLET_SKIN = 50 # marginea peste raza de vedere; listele se refac dupa ce agentii s-au putut misca skin/2 px
+ADAPTIVE_UPDATES = True # prazile izolate nu mai decid la fiecare tick, doar se misca (backend-ul objects)
+IDLE_MARGIN = 40 # cat se cauta peste razele de perceptie ca sa stim cate tick-uri poate sta o prada izolata
+IDLE_RETRY = 15 # dupa o verificare fara rezultat, cate tick-uri decide normal pana la urmatoarea
+
+SEED = None # None = modulul random global, ca inainte; un numar = generator propriu simularii, rulare reproductibila
+CHECKPOINT_FILE = 'checkpoint.npz' # starea completa a simularii (F5 salveaza, F9 incarca; vezi checkpoint.py)
+
+BACKEND = "objects" # "objects" = Prey/Predator ca obiecte, "numpy" = array-uri (vectorized.py), "tiles" = numpy pe dale, in mai multe procese (domains.py)
+
+HISTORY_LIMIT = None # None = tot istoricul; N = doar ultimele N frame-uri (ring buffer)
+HISTORY_DECIMATION = 100 # cu limita, restul istoricului ramane ca min/max pe blocuri de atatea frame-uri
+
+EXPORT_FILE = 'simulation_data.csv' # datele se scriu pe disc in timpul rularii (formatul csv)
+EXPORT_DIR = 'simulation_data' # formatul binary e un director, cu o coloana per fisier
+EXPORT_FORMAT = 'csv' # 'csv' sau 'binary' (director cu o coloana per fisier, citit cu export.load_binary)
+EXPORT_CHUNK = 600 # frame-uri per scriere (~10s la 60 FPS)
+
+DASHBOARD_FPS = 10 # de cate ori pe secunda se redeseneaza graficele live (tasta G)
+DASHBOARD_POINTS = 2000 # puncte per linie in graficele live; un istoric mai lung se comprima in blocuri min/max
+
+USE_OBSTACLE_FIELD = False # True = camp de evitare precalculat, O(1) per agent dar interpolat (rularile nu mai sunt cele exacte)
+OBSTACLE_FIELD_CELL = 4 # distanta in px intre nodurile campului de evitare
+
+SPEED_MULTIPLIERS = [1, 4, 16, 0] # tick-uri de simulare per tick real (tastele 1-4); 0 = cat de repede se poate
+MAX_FRAME_TIME = 0.25 # secunde reale luate in calcul per frame, ca simularea sa nu ramana in urma la nesfarsit
+ADAPTIVE_RENDER = True # cand simularea nu tine pasul, sare peste render-uri (tasta A)
+MIN_RENDER_FPS = 10 # chiar si in modul adaptiv, ecranul se redeseneaza macar de atatea ori pe secunda
+LOD_RENDER = True # cu prea multi agenti in camera se deseneaza o harta de densitate in loc de sprite-uri (tasta L)
+LOD_MAX_SPRITES = 2000 # peste atatia agenti vizibili (prazi + pradatori) se trece pe harta de densitate
+LOD_MIN_ZOOM = 0.5 # si sub zoom-ul asta, unde sprite-urile s-ar suprapune oricum
+HEATMAP_CELL = 4 # px de ecran per celula a hartii de densitate
+HEATMAP_SATURATION = 8 # agenti dintr-o specie intr-o celula la care culoarea ei e plina
+TRAIL_LENGTH = 10 # cate pozitii tine urma unui agent (aceeasi la ambele backend-uri)
+
+PROFILE = False # porneste profiler-ul pe faze de la inceput (in fereastra se comuta cu tasta I)
+PROFILE_WINDOW = 600 # cate tick-uri/frame-uri intra in percentilele profiler-ului
+
+TILES_X, TILES_Y = 2, 2 # backend-ul "tiles": lumea impartita in TILES_X x TILES_Y dale
+TILE_WORKERS = None # procese worker; None = cate unul per dala
+
+UPDATE_MODE = "sequential" # backend objects: "sequential" = fiecare agent vede mutarile celor dinainte, "synchronous" = toti decid din starea de la inceputul fazei
\ No newline at end of file
@@ -0,0 +1,298 @@
+import multiprocessing as mp
+import queue
+import time
+
+import numpy as np
+
+from history import COLUMN_NAMES
+
+#graficele live ruleaza in alt proces: simularea doar pune esantioane intr-o coada
+#procesul dashboard-ului actualizeaza liniile existente (set_data + blit), de maxim `max_fps` ori pe secunda
+#fiecare linie are cel mult `points` blocuri (min/max), deci memoria si costul unui refresh nu cresc cu rularea
+
+SERIES = [
+    # (axa, coloana, culoare, stil, eticheta)
+    ((0, 0), 'prey_count', 'green', '-', 'Prey'),
+    ((0, 0), 'predator_count', 'red', '-', 'Predators'),
+    ((0, 0), 'food_count', 'gold', '--', 'Food'),
+    ((0, 1), 'prey_births', 'lightgreen', '-', 'Prey Births'),
+    ((0, 1), 'predator_births', 'salmon', '-', 'Predator Births'),
+    ((1, 0), 'prey_avg_energy', 'green', '-', 'Prey Avg Energy'),
+    ((1, 0), 'predator_avg_energy', 'red', '-', 'Predator Avg Energy'),
+    ((1, 1), 'ratio', 'purple', '-', 'Predator/Prey'),
+]
+
+TITLES = {
+    (0, 0): ('Population Over Time', 'Population'),
+    (0, 1): ('Birth Rates Over Time', 'Births per Frame'),
+    (1, 0): ('Average Energy Levels', 'Average Energy'),
+    (1, 1): ('Predator to Prey Ratio', 'Predator/Prey Ratio'),
+}
+
+
+class LiveDashboard:
+    #partea din procesul simularii: porneste/opreste procesul si trimite randuri in loturi
+
+    def __init__(self, max_fps=10, batch=30, points=2000):
+        self.max_fps = max_fps
+        self.batch = batch
+        self.points = points
+        self.pending = []
+        self.process = None
+        self.queue = None
+
+    def is_open(self):
+        return self.process is not None and self.process.is_alive()
+
+    def open(self, history=None):
+        if self.is_open():
+            return
+        context = mp.get_context('spawn') #fara fork: procesul copil nu mosteneste starea pygame
+        self.queue = context.Queue()
+        self.process = context.Process(target=dashboard_main,
+                                       args=(self.queue, self.max_fps, self.points), daemon=True)
+        self.process.start()
+        self.pending = []
+        if history is not None:
+            self.send_history(history)
+
+    def send_history(self, history):
+        #istoricul de pana acum, trimis o singura data, pe coloane
+        if len(history) and self.is_open():
+            self.queue.put(('columns', {name: history[name] for name in COLUMN_NAMES}))
+
+    def reload(self, history):
+        #istoricul s-a schimbat cu totul (checkpoint incarcat): graficele il iau de la capat
+        self.clear()
+        self.send_history(history)
+
+    def push(self, row):
+        #apelantul verifica is_open() inainte, ca sa nu construiasca randul degeaba
+        self.pending.append(row)
+        if len(self.pending) >= self.batch:
+            self.flush()
+
+    def flush(self):
+        if self.pending and self.is_open():
+            self.queue.put(('rows', self.pending))
+        self.pending = []
+
+    def clear(self):
+        self.pending = []
+        if self.is_open():
+            self.queue.put(('clear', None))
+
+    def close(self):
+        if self.is_open():
+            self.queue.put(('close', None))
+            self.process.join(timeout=2)
+            if self.process.is_alive():
+                self.process.terminate()
+        self.process = None
+        self.queue = None
+        self.pending = []
+
+
+class DecimatedSeries:
+    #seriile graficelor in memorie fixa, ca seria pe termen lung din HistoryStore: un punct e un bloc
+    #de frame-uri cu min si max pe fiecare serie; cand cele `points` blocuri s-au umplut, se unesc
+    #doua cate doua si blocul isi dubleaza marimea
+
+    def __init__(self, names, points):
+        self.names = names
+        self.points = points
+        self.time = np.zeros(points)
+        self.low = {name: np.zeros(points) for name in names}
+        self.high = {name: np.zeros(points) for name in names}
+        self.clear()
+
+    def clear(self):
+        self.block_size = 1
+        self.blocks = 0
+        self.block_fill = 0
+        self.peak = dict.fromkeys(self.names, 0)
+        self.last_time = None
+
+    def extend(self, time, columns):
+        #time si columns[name] = array-uri de aceeasi lungime, in ordine cronologica
+        start, total = 0, len(time)
+        while start < total:
+            if self.blocks == self.points:
+                self.merge_blocks()
+            b = self.blocks
+            end = min(start + self.block_size - self.block_fill, total)
+            for name in self.names:
+                values = columns[name][start:end]
+                low, high = values.min(), values.max()
+                if self.block_fill:
+                    low, high = min(low, self.low[name][b]), max(high, self.high[name][b])
+                else:
+                    self.time[b] = time[start]
+                self.low[name][b] = low
+                self.high[name][b] = high
+            self.block_fill += end - start
+            if self.block_fill == self.block_size:
+                self.block_fill = 0
+                self.blocks += 1
+            start = end
+        if total:
+            self.last_time = time[-1]
+            for name in self.names:
+                self.peak[name] = max(self.peak[name], np.max(columns[name]))
+
+    def merge_blocks(self):
+        half = self.points // 2
+        self.time[:half] = self.time[0:2 * half:2]
+        for name in self.names:
+            low, high = self.low[name], self.high[name]
+            low[:half] = np.minimum(low[0:2 * half:2], low[1:2 * half:2])
+            high[:half] = np.maximum(high[0:2 * half:2], high[1:2 * half:2])
+        self.blocks = half
+        self.block_size *= 2
+
+    def line(self, name):
+        #(x, y) pentru o linie: fiecare bloc devine doua puncte, min si max, ca varfurile sa ramana vizibile
+        n = self.blocks + (1 if self.block_fill else 0)
+        x = np.repeat(self.time[:n], 2)
+        y = np.column_stack((self.low[name][:n], self.high[name][:n])).ravel()
+        return x, y
+
+
+class DashboardFigure:
+    #partea din procesul dashboard-ului: figura 2x2 cu liniile create o singura data
+
+    def __init__(self, plt, points):
+        self.plt = plt
+        self.fig, self.axes = plt.subplots(2, 2, figsize=(14, 10))
+        self.fig.suptitle('Predator-Prey Simulation Statistics (live)',
+                          fontsize=16, fontweight='bold')
+        self.lines = {}
+        for (r, c), column, color, style, label in SERIES:
+            ax = self.axes[r, c]
+            line, = ax.plot([], [], color=color, linestyle=style,
+                            linewidth=1 if style == '--' else 2, label=label, animated=True)
+            self.lines[column] = (ax, line)
+        for (r, c), (title, ylabel) in TITLES.items():
+            ax = self.axes[r, c]
+            ax.set_title(title)
+            ax.set_xlabel('Time (frames)')
+            ax.set_ylabel(ylabel)
+            ax.grid(True, alpha=0.3)
+            ax.set_xlim(0, 100)
+            ax.set_ylim(0, 1)
+        self.axes[1, 1].axhline(y=0.20, color='orange', linestyle='--', label='Target Ratio (0.20)')
+        for ax in self.axes.flat:
+            ax.legend(loc='upper left')
+        self.fig.tight_layout()
+
+        self.series = DecimatedSeries([column for _, column, *_ in SERIES], points)
+        self.background = None
+        self.fig.canvas.mpl_connect('draw_event', self.on_draw)
+        self.fig.canvas.mpl_connect('close_event', self.on_close)
+        self.closed = False
+        plt.show(block=False)
+        self.full_redraw()
+
+    def on_draw(self, event):
+        #dupa un redraw complet (resize, schimbare de axe) refac fundalul pentru blit
+        self.background = self.fig.canvas.copy_from_bbox(self.fig.bbox)
+        self.draw_lines()
+
+    def on_close(self, event):
+        self.closed = True
+
+    def add_rows(self, rows):
+        self.add_columns(dict(zip(COLUMN_NAMES, np.array(rows, dtype=float).T)))
+
+    def add_columns(self, columns):
+        prey = np.asarray(columns['prey_count'], dtype=float)
+        predators = np.asarray(columns['predator_count'], dtype=float)
+        values = {name: np.asarray(columns[name], dtype=float) for name in COLUMN_NAMES}
+        values['ratio'] = np.divide(predators, prey, out=np.zeros_like(prey), where=prey > 0)
+        self.series.extend(values['time'], values)
+
+    def clear(self):
+        self.series.clear()
+        for ax in self.axes.flat:
+            ax.set_xlim(0, 100)
+            ax.set_ylim(0, 1)
+        self.full_redraw()
+
+    def refresh(self):
+        for column, (ax, line) in self.lines.items():
+            line.set_data(*self.series.line(column))
+
+        if self.limits_changed():
+            self.full_redraw()
+            return
+        if self.background is None:
+            return
+        #blit: refac doar liniile peste fundalul salvat
+        self.fig.canvas.restore_region(self.background)
+        self.draw_lines()
+        self.fig.canvas.blit(self.fig.bbox)
+        self.fig.canvas.flush_events()
+
+    def limits_changed(self):
+        #axele cresc in trepte (x se dubleaza), deci redraw-ul complet e rar
+        last = self.series.last_time
+        if last is None:
+            return False
+        changed = False
+        for (r, c) in TITLES:
+            ax = self.axes[r, c]
+            x_low, x_high = ax.get_xlim()
+            if last > x_high:
+                ax.set_xlim(x_low, max(x_high * 2, last))
+                changed = True
+            top = max(self.series.peak[column] for (rc, column, *_) in SERIES if rc == (r, c))
+            y_low, y_high = ax.get_ylim()
+            if top > y_high:
+                ax.set_ylim(y_low, top * 1.25)
+                changed = True
+        return changed
+
+    def draw_lines(self):
+        for ax, line in self.lines.values():
+            ax.draw_artist(line)
+
+    def full_redraw(self):
+        self.fig.canvas.draw()
+        self.fig.canvas.flush_events()
+
+
+def dashboard_main(samples, max_fps, points):
+    import matplotlib.pyplot as plt
+
+    plt.ion()
+    figure = DashboardFigure(plt, points)
+    interval = 1.0 / max_fps
+    last_refresh = 0.0
+    dirty = False
+
+    while not figure.closed:
+        #golesc coada fara sa astept
+        try:
+            while True:
+                kind, payload = samples.get_nowait()
+                if kind == 'rows':
+                    figure.add_rows(payload)
+                elif kind == 'columns':
+                    figure.add_columns(payload)
+                elif kind == 'clear':
+                    figure.clear()
+                elif kind == 'close':
+                    plt.close(figure.fig)
+                    return
+                dirty = True
+        except queue.Empty:
+            pass
+
+        now = time.perf_counter()
+        if dirty and now - last_refresh >= interval:
+            figure.refresh()
+            last_refresh = now
+            dirty = False
+        else:
+            figure.fig.canvas.flush_events()
+            time.sleep(interval / 4)
@@ -0,0 +1,694 @@
+import multiprocessing as mp
+import weakref
+
+import numpy as np
+
+import config
+import kernels
+import vectorized
+from agents import Obstacle
+from vectorized import (VectorizedEngine, SpeciesArrays, FoodArrays, steer_prey, steer_predators,
+                        first_contacts, arbitrate, fertile, mating_pairs, offspring)
+
+#impartirea lumii in dale (TILES_X x TILES_Y), fiecare cu starea ei, intr-un proces worker
+#
+#o dala (Tile) e un VectorizedEngine mic: doar agentii si mancarea din dreptunghiul ei, care raman
+#in worker de la un tick la altul; decizia, miscarea, mancatul si nasterile se fac local
+#vecinii de peste granita intra in perceptie ca "fantome": copii ale randurilor aflate la mai
+#putin de o raza de perceptie de granita, valabile o singura faza
+#starea unei dale e doar a workerului ei; prin pipe trec doar randurile de la granite
+#
+#mancatul si imperecherea peste granita le arbitreaza coordonatorul (TiledEngine): dupa pasul local,
+#fiecare dala intoarce candidatii ramasi (randurile la mai putin de distanta de contact de granita),
+#coordonatorul ii potriveste la fel ca VectorizedEngine si trimite inapoi cine a mancat, ce s-a
+#mancat si cine s-a imperecheat; intai se potrivesc perechile de pe aceeasi dala, apoi cele de peste
+#granita, in ordinea (dala, rand), deci rezultatul nu depinde de cum sunt impartite dalele pe procese
+#
+#un tick are 5 schimburi de mesaje: miscarea si mancatul prazilor, nasterile lor, miscarea si
+#mancatul pradatorilor, nasterile lor, apoi mancarea noua si granitele pentru tick-ul urmator;
+#agentii iesiti din dala migreaza intregi (cu tot cu urma) cu mesajul urmator
+#cu o singura dala nu exista granite, iar rularea e cea de la numpy
+
+
+def tile_boxes(tiles_x, tiles_y):
+    #dalele acopera tot planul: cele de la margine se intind pana la infinit
+    xs = [-np.inf] + [config.WIDTH * k / tiles_x for k in range(1, tiles_x)] + [np.inf]
+    ys = [-np.inf] + [config.HEIGHT * k / tiles_y for k in range(1, tiles_y)] + [np.inf]
+    return [(xs[a], ys[b], xs[a + 1], ys[b + 1]) for b in range(tiles_y) for a in range(tiles_x)]
+
+
+def inside(pos, box, margin=0):
+    #margin < 0 = doar ce e la cel putin -margin de granita, inauntru
+    x0, y0, x1, y1 = box
+    x, y = pos[:, 0], pos[:, 1]
+    return (x >= x0 - margin) & (x < x1 + margin) & (y >= y0 - margin) & (y < y1 + margin)
+
+
+def locate(pos, tiles_x, tiles_y):
+    #dala fiecarei pozitii, la fel ca inside() (granita de jos/stanga apartine dalei)
+    xs = [config.WIDTH * k / tiles_x for k in range(1, tiles_x)]
+    ys = [config.HEIGHT * k / tiles_y for k in range(1, tiles_y)]
+    return (np.searchsorted(ys, pos[:, 1], side='right') * tiles_x
+            + np.searchsorted(xs, pos[:, 0], side='right'))
+
+
+def concat_rows(parts):
+    #dictionare camp -> array, lipite pe randuri (in ordinea din lista)
+    return {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+
+
+def tile_rngs(rng, count):
+    #dala 0 continua generatorul coordonatorului (deci o singura dala da rularea de la numpy),
+    #celelalte primesc generatoare independente, derivate din starea lui
+    entropy = rng.bit_generator.state['state']['state']
+    return [rng.bit_generator.state] + [
+        np.random.default_rng(np.random.SeedSequence(entropy, spawn_key=(k,))).bit_generator.state
+        for k in range(1, count)]
+
+
+def newborn(pos, vel, energy, speed):
+    #randuri intregi pentru puii nascuti peste granita (ca SpeciesArrays.add), de trimis pe dala lor
+    n = len(pos)
+    return {'pos': pos, 'vel': vel, 'energy': np.full(n, float(energy)),
+            'cooldown': np.zeros(n, dtype=np.int32), 'speed': np.full(n, float(speed))}
+
+
+class Tile(VectorizedEngine):
+    #partea din worker: acelasi tick ca VectorizedEngine, pe randurile unei singure dale
+
+    def __init__(self, box):
+        self.box = box
+        self.record_trails = False
+        self.prey = SpeciesArrays()
+        self.predators = SpeciesArrays()
+        self.food_arrays = FoodArrays()
+        self.obstacles = []
+        self.obstacle_field = None
+        self.use_obstacle_field = config.USE_OBSTACLE_FIELD
+        self.rng = np.random.default_rng()
+        self.ghosts = {}
+
+        self.prey_births_this_frame = 0
+        self.predator_births_this_frame = 0
+        self.total_prey_births = 0
+        self.total_predator_births = 0
+        self.total_prey_deaths = 0
+        self.total_predator_deaths = 0
+
+    def load(self, message):
+        #starea de la reset / checkpoint: randurile dalei, urmele si generatorul ei
+        self.configure(message)
+        prey_head, predator_head = message['trail_head']
+        self.prey.restore(message['prey'], prey_head)
+        self.predators.restore(message['predators'], predator_head)
+        self.food_arrays.clear()
+        self.food_arrays.add(message['food'])
+        self.rng.bit_generator.state = message['rng']
+        return self.borders()
+
+    def reseed(self, state):
+        self.rng.bit_generator.state = state
+
+    def gather(self, message):
+        #toata starea dalei (pentru desenare si checkpoint)
+        return {
+            'prey': self.prey.state(self.record_trails),
+            'predators': self.predators.state(self.record_trails),
+            'food': self.food.copy(),
+            'trail_head': [self.prey.trail_head, self.predators.trail_head],
+            'rng': self.rng.bit_generator.state,
+        }
+
+    def configure(self, message):
+        self.record_trails = message['trails']
+        if message['obstacles'] is not None:
+            self.obstacles = [Obstacle(x, y, radius) for x, y, radius in message['obstacles']]
+
+    def receive(self, message):
+        #agentii care intra pe dala (la coada, dupa randurile ei) si fantomele pentru faza asta
+        self.configure(message)
+        for name, rows in message['arrivals'].items():
+            if name == 'food':
+                self.food_arrays.add(rows['pos'])
+            else:
+                getattr(self, name).extend(rows)
+        self.ghosts = message['ghosts']
+
+    #fazele unui tick, in ordine; randurile din mesaj sunt cele de la finalul fazei precedente
+
+    def prey_move(self, message):
+        #miscarea si mancatul pe dala; intoarce candidatii pentru mancatul peste granita
+        self.receive(message)
+        self.total_prey_deaths = 0
+        prey = self.prey
+        if prey.count:
+            self.move_prey()
+        elif self.record_trails:
+            prey.record_trails() #si dalele goale tin pasul: toate urmele scriu la acelasi h
+        fed = self.eat_food()
+
+        hungry = self.border_rows(prey, config.FOOD_EAT_DISTANCE, fed)
+        eaters = {'pos': prey.pos[hungry]}
+        moving, eaters['ref'] = self.emigrate(prey, hungry)
+        return {
+            'eaters': eaters,
+            'targets': self.band(self.food_arrays, config.FOOD_EAT_DISTANCE),
+            'moving': moving,
+            'deaths': self.total_prey_deaths,
+            'checks': self.checks(),
+        }
+
+    def prey_breed(self, message):
+        #mancatul de peste granita, prazile sosite, apoi nasterile pe dala
+        self.receive(message)
+        prey = self.prey
+        fed = message['fed']
+        prey.energy[fed] = np.minimum(prey.energy[fed] + config.PREY_ENERGY_GAIN_FOOD,
+                                      config.PREY_MAX_ENERGY)
+        self.remove(self.food_arrays, message['eaten'])
+        births = self.breed_prey()
+
+        mates = self.border_rows(prey, config.PREY_MATING_DISTANCE)
+        mates = mates[fertile(prey, config.PREY_REPRODUCTION_ENERGY)[mates]]
+        return {
+            'mates': {'row': mates, 'pos': prey.pos[mates]},
+            'band': self.band(prey, config.PREDATOR_VISION, ('pos',)),
+            'food': len(self.food),
+            'births': births,
+            'checks': self.checks(),
+        }
+
+    def predator_move(self, message):
+        #imperecherile prazilor peste granita (puii lor sosesc acum), apoi miscarea si mancatul pradatorilor
+        self.receive(message)
+        prey, predators = self.prey, self.predators
+        self.mate(prey, message['mated'], config.PREY_REPRODUCTION_COST, config.PREY_REPRODUCTION_COOLDOWN)
+        self.total_prey_deaths = self.total_predator_deaths = 0
+        if predators.count:
+            self.move_predators()
+        elif self.record_trails:
+            predators.record_trails()
+        fed = self.eat_prey()
+
+        hungry = self.border_rows(predators, config.PREY_CATCH_DISTANCE, fed)
+        eaters = {'pos': predators.pos[hungry]}
+        moving, eaters['ref'] = self.emigrate(predators, hungry)
+        return {
+            'eaters': eaters,
+            'targets': self.band(prey, config.PREY_CATCH_DISTANCE),
+            'moving': moving,
+            'deaths': (self.total_prey_deaths, self.total_predator_deaths),
+            'checks': self.checks(),
+        }
+
+    def predator_breed(self, message):
+        self.receive(message)
+        predators = self.predators
+        fed = message['fed']
+        predators.energy[fed] = np.minimum(predators.energy[fed] + config.PREDATOR_ENERGY_GAIN_PREY,
+                                           config.PREDATOR_MAX_ENERGY)
+        self.remove(self.prey, message['eaten'])
+        births = self.breed_predators()
+
+        mates = self.border_rows(predators, config.PREDATOR_MATING_DISTANCE)
+        mates = mates[fertile(predators, config.PREDATOR_REPRODUCTION_ENERGY)[mates]]
+        return {
+            'mates': {'row': mates, 'pos': predators.pos[mates]},
+            'births': births,
+            'checks': self.checks(),
+        }
+
+    def finish(self, message):
+        #imperecherile pradatorilor peste granita, puii lor si mancarea noua; apoi contoarele
+        #si granitele pentru tick-ul urmator
+        self.receive(message)
+        self.mate(self.predators, message['mated'], config.PREDATOR_REPRODUCTION_COST,
+                  config.PREDATOR_REPRODUCTION_COOLDOWN)
+        prey, predators = self.prey, self.predators
+        result = {
+            'counts': (prey.count, predators.count, len(self.food)),
+            'energy': (float(prey.energy[:prey.count].sum()),
+                       float(predators.energy[:predators.count].sum())),
+            'checks': self.checks(),
+        }
+        result.update(self.borders())
+        return result
+
+    def borders(self):
+        #ce au nevoie vecinii pentru faza prazilor din tick-ul urmator
+        return {
+            'prey': self.band(self.prey, config.FLOCKING_RADIUS, ('pos', 'vel')),
+            'predators': self.band(self.predators, config.PREY_VISION, ('pos',)),
+            'food': self.band(self.food_arrays, config.PREY_FOOD_VISION, ('pos',)),
+        }
+
+    def border_rows(self, species, distance, exclude=None):
+        #randurile la mai putin de `distance` de granita (sau iesite din dala), fara `exclude`:
+        #doar ele mai pot avea perechi pe alta dala
+        near = ~inside(species.pos[:species.count], self.box, -distance)
+        if exclude is not None:
+            near[exclude] = False
+        return np.flatnonzero(near)
+
+    def band(self, species, margin, fields=None):
+        #randurile de langa granita, doar `fields` (implicit, indexul randului si pozitia)
+        rows = self.border_rows(species, margin)
+        if fields is None:
+            return {'row': rows, 'pos': species.pos[rows]}
+        return {name: getattr(species, name)[rows] for name in fields}
+
+    def emigrate(self, species, rows):
+        #randurile iesite din dala pleaca intregi; intoarce (randurile lor sau None, rows renumerotate:
+        #>= 0 randul care ramane, k < 0 al (-1 - k)-lea rand plecat)
+        n = species.count
+        out = ~inside(species.pos[:n], self.box)
+        refs = np.where(out, -np.cumsum(out), np.cumsum(~out) - 1)[rows]
+        if not out.any():
+            return None, refs
+        moving = species.take(np.flatnonzero(out), self.record_trails)
+        species.keep(~out)
+        return moving, refs
+
+    def remove(self, species, rows):
+        #randurile luate peste granita (mancare sau prazi mancate)
+        if len(rows):
+            kept = np.ones(species.count, dtype=bool)
+            kept[rows] = False
+            species.keep(kept)
+
+    def mate(self, species, mated, cost, cooldown):
+        #imperecherile peste granita: parintele plateste nasterea, amandoi asteapta
+        parents, partners = mated
+        species.energy[parents] -= cost
+        species.cooldown[parents] = cooldown
+        species.cooldown[partners] = cooldown
+
+    def checks(self):
+        #perechile testate de neighbor_pairs pe dala asta; coordonatorul le aduna pentru profiler
+        checks = vectorized.pair_checks
+        vectorized.pair_checks = 0
+        return checks
+
+    def steer_prey(self, n):
+        prey, ghosts = self.prey, self.ghosts
+        predators = np.concatenate((self.predators.pos[:self.predators.count], ghosts['predators']['pos']))
+        food = np.concatenate((self.food, ghosts['food']['pos']))
+        steer_prey(prey.pos[:n], prey.vel[:n], prey.energy[:n], prey.speed[:n], predators, food,
+                   (ghosts['prey']['pos'], ghosts['prey']['vel']))
+
+    def steer_predators(self, n):
+        prey = self.prey
+        prey_pos = np.concatenate((prey.pos[:prey.count], self.ghosts['prey']['pos']))
+        steer_predators(self.predators.pos[:n], self.predators.vel[:n], prey_pos)
+
+
+def init_worker(constants):
+    #constantele procesului principal (pot fi suprascrise de sweep/benchmark)
+    for module in (config, vectorized, kernels):
+        for name, value in constants.items():
+            setattr(module, name, value)
+
+
+def worker_main(connection, constants, boxes):
+    #un worker tine una sau mai multe dale; fiecare comanda e o metoda a lui Tile, apelata pe
+    #dalele din mesaj, iar raspunsul pleaca abia dupa ce le-a terminat pe toate
+    init_worker(constants)
+    tiles = {index: Tile(box) for index, box in boxes.items()}
+    while True:
+        command, messages = connection.recv()
+        if command is None:
+            break
+        try:
+            result = {index: getattr(tiles[index], command)(message)
+                      for index, message in messages.items()}
+        except Exception as error:
+            result = error
+        connection.send(result)
+    connection.close()
+
+
+class TileWorker:
+    #capatul din coordonator al unui worker
+
+    def __init__(self, context, constants, boxes):
+        self.tiles = list(boxes)
+        self.connection, child = context.Pipe()
+        self.process = context.Process(target=worker_main, args=(child, constants, boxes), daemon=True)
+        self.process.start()
+        child.close()
+
+    def send(self, command, messages):
+        self.connection.send((command, {index: messages[index] for index in self.tiles}))
+
+    def receive(self):
+        result = self.connection.recv()
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def close(self):
+        try:
+            self.connection.send((None, None))
+        except OSError:
+            pass #procesul s-a oprit deja
+        self.process.join(5)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.connection.close()
+
+
+def close_workers(workers):
+    for worker in workers:
+        worker.close()
+
+
+class TiledEngine(VectorizedEngine):
+    backend = "tiles"
+    #coordonatorul: nu tine starea agentilor, doar ruteaza granitele intre dale, arbitreaza
+    #contactele de peste granita si aduna contoarele
+    #prey / predators / food sunt o copie adunata de pe dale abia cand le citeste cineva
+    #(desenare, checkpoint, hotkey-uri), nu la fiecare tick
+
+    def __init__(self, record_trails=False, tiles=None, workers=None, seed=None):
+        self.tiles_x, self.tiles_y = tiles or (config.TILES_X, config.TILES_Y)
+        self.boxes = tile_boxes(self.tiles_x, self.tiles_y)
+        count = len(self.boxes)
+        workers = min(workers or config.TILE_WORKERS or count, count)
+        constants = {name: getattr(config, name) for name in dir(config) if name.isupper()}
+        context = mp.get_context('spawn') #ca la dashboard: fara starea pygame din parinte
+        #dala k merge la workerul k % workers
+        self.workers = [TileWorker(context, constants,
+                                   {k: self.boxes[k] for k in range(w, count, workers)})
+                        for w in range(workers)]
+        #procesele se opresc la close(), la colectarea engine-ului sau la iesire
+        self._finalizer = weakref.finalize(self, close_workers, self.workers)
+
+        self.stale = False #copia locala nu mai e la zi (a trecut un tick de la ultima adunare)
+        self.pending = {'prey': 0, 'predators': 0, 'food': 0} #randuri adaugate local, netrimise inca
+        self.counts = (0, 0, 0)
+        self.sent_obstacles = None
+        self.outbox = None #granitele intoarse de dale la finalul tick-ului precedent
+        self.border_rng = np.random.default_rng() #puii nascuti peste granita
+        super().__init__(record_trails, seed)
+
+    def close(self):
+        self._finalizer()
+
+    #copia locala a starii, adunata la cerere
+
+    @property
+    def prey(self):
+        self.gather()
+        return self._prey
+
+    @prey.setter
+    def prey(self, value):
+        self._prey = value
+
+    @property
+    def predators(self):
+        self.gather()
+        return self._predators
+
+    @predators.setter
+    def predators(self, value):
+        self._predators = value
+
+    @property
+    def food_arrays(self):
+        self.gather()
+        return self._food_arrays
+
+    @food_arrays.setter
+    def food_arrays(self, value):
+        self._food_arrays = value
+
+    def gather(self):
+        if not self.stale:
+            return
+        self.stale = False
+        parts = self.run('gather', [None] * len(self.boxes))
+        for name, species in (('prey', self._prey), ('predators', self._predators)):
+            rows = [part[name] for part in parts]
+            species.restore(concat_rows(rows), parts[0]['trail_head'][name == 'predators'])
+        self._food_arrays.clear()
+        self._food_arrays.add(np.concatenate([part['food'] for part in parts]))
+        self.rngs = [part['rng'] for part in parts]
+
+    def run(self, command, messages):
+        #o faza sincronizata: mesajele pleaca la toti workerii, apoi se asteapta toate raspunsurile
+        for worker in self.workers:
+            worker.send(command, messages)
+        results = {}
+        for worker in self.workers:
+            results.update(worker.receive())
+        return [results[index] for index in range(len(self.boxes))]
+
+    def phase(self, command, messages):
+        #o faza a tick-ului; perechile testate pe dale intra in contorul citit de profiler
+        parts = self.run(command, messages)
+        vectorized.pair_checks += sum(part['checks'] for part in parts)
+        return parts
+
+    #starea: reset, checkpoint, generatoare
+
+    def reset_simulation(self):
+        #starea initiala se genereaza aici, ca la numpy, apoi se imparte pe dale
+        self.stale = False
+        super().reset_simulation()
+        self.distribute(tile_rngs(self.rng, len(self.boxes) + 1))
+
+    def snapshot(self):
+        arrays, meta = super().snapshot()
+        meta['tiles'] = [self.tiles_x, self.tiles_y]
+        #generatoarele dalelor, apoi cel al puilor de peste granita
+        meta['tile_rngs'] = self.rngs + [self.border_rng.bit_generator.state]
+        return arrays, meta
+
+    def restore(self, arrays, meta):
+        #un checkpoint numpy (sau cu alta impartire) porneste dalele din generatorul principal
+        self.stale = False
+        super().restore(arrays, meta)
+        if (meta.get('tiles') == [self.tiles_x, self.tiles_y]
+                and len(meta['tile_rngs']) == len(self.boxes) + 1):
+            self.distribute(meta['tile_rngs'])
+        else:
+            self.distribute(tile_rngs(self.rng, len(self.boxes) + 1))
+
+    def reseed(self, seed):
+        super().reseed(seed)
+        self.use_rngs(tile_rngs(self.rng, len(self.boxes) + 1))
+        self.run('reseed', self.rngs)
+
+    def use_rngs(self, rngs):
+        #cate o stare per dala, apoi cea a coordonatorului
+        self.rngs = list(rngs[:-1])
+        self.border_rng.bit_generator.state = rngs[-1]
+
+    def distribute(self, rngs):
+        #copia locala -> dale, fiecare cu randurile ei
+        self.use_rngs(rngs)
+        prey, predators, food = self._prey, self._predators, self.food
+        owners = [locate(species.pos[:species.count], self.tiles_x, self.tiles_y)
+                  for species in (prey, predators)]
+        food_owner = locate(food, self.tiles_x, self.tiles_y)
+        common = self.message()
+        messages = [dict(common,
+                         prey=prey.take(np.flatnonzero(owners[0] == index), self.record_trails),
+                         predators=predators.take(np.flatnonzero(owners[1] == index), self.record_trails),
+                         food=food[food_owner == index],
+                         trail_head=[prey.trail_head, predators.trail_head],
+                         rng=self.rngs[index])
+                    for index in range(len(self.boxes))]
+        self.outbox = self.run('load', messages)
+        self.pending = {'prey': 0, 'predators': 0, 'food': 0}
+        self.counts = (prey.count, predators.count, len(food))
+
+    def message(self):
+        #ce primesc toate dalele in orice faza; obstacolele doar cand s-au schimbat
+        obstacles = [(o.position.x, o.position.y, o.radius) for o in self.obstacles]
+        changed = obstacles != self.sent_obstacles
+        self.sent_obstacles = obstacles
+        return {'trails': self.record_trails, 'obstacles': obstacles if changed else None}
+
+    def messages(self, arrivals=None, ghosts=None, **fields):
+        #cate un mesaj per dala: ce e comun, randurile care intra pe ea (arrivals: specie -> bucati de
+        #randuri, oricare poate fi None), fantomele ei (per dala) si `fields` (o valoare per dala)
+        common = self.message()
+        routed = {name: self.arrivals(parts) for name, parts in (arrivals or {}).items()}
+        ghosts = ghosts or {}
+        return [dict(common,
+                     arrivals={name: rows[index] for name, rows in routed.items() if rows[index] is not None},
+                     ghosts={name: seen[index] for name, seen in ghosts.items()},
+                     **{name: values[index] for name, values in fields.items()})
+                for index in range(len(self.boxes))]
+
+    #adaugari manuale: intra in copia locala (se vad imediat) si pleaca la dalele lor cu tick-ul urmator
+
+    def add_prey(self):
+        super().add_prey()
+        self.pending['prey'] += 1
+
+    def add_predator(self):
+        super().add_predator()
+        self.pending['predators'] += 1
+
+    def add_food(self, count=1):
+        super().add_food(count)
+        self.pending['food'] += count
+
+    def population(self):
+        if self.stale:
+            return self.counts
+        return super().population()
+
+    def take_pending(self, name):
+        count = self.pending[name]
+        if count == 0:
+            return None
+        self.pending[name] = 0
+        if name == 'food':
+            return {'pos': self.food[len(self.food) - count:].copy()}
+        species = getattr(self, name)
+        return species.take(np.arange(species.count - count, species.count), self.record_trails)
+
+    #rutarea intre dale
+
+    def arrivals(self, parts):
+        #randuri intregi (migranti, pui, hotkey-uri), impartite dalelor pe care au ajuns: per dala, sau None
+        parts = [rows for rows in parts if rows is not None]
+        routed = [None] * len(self.boxes)
+        if not parts:
+            return routed
+        rows = concat_rows(parts)
+        owner = locate(rows['pos'], self.tiles_x, self.tiles_y)
+        for index in np.unique(owner).tolist():
+            mine = owner == index
+            routed[index] = {name: values[mine] for name, values in rows.items()}
+        return routed
+
+    def ghosts(self, bands, margin, extra=None):
+        #bands: per dala, randurile de langa granita; extra: randuri inca fara dala (hotkey-uri, pui)
+        #intoarce, per dala, fantomele ei: randurile altor dale aflate la mai putin de margin de ea
+        owners = [np.full(len(band['pos']), index) for index, band in enumerate(bands)]
+        if extra is not None:
+            bands = bands + [{name: extra[name] for name in bands[0]}]
+            owners.append(locate(extra['pos'], self.tiles_x, self.tiles_y))
+        rows = concat_rows(bands)
+        owners = np.concatenate(owners)
+        routed = []
+        for index, box in enumerate(self.boxes):
+            seen = (owners != index) & inside(rows['pos'], box, margin)
+            routed.append({name: values[seen] for name, values in rows.items()})
+        return routed
+
+    #arbitrajul de peste granita: candidatii dalelor, luati in ordinea (dala, rand)
+
+    def feed(self, parts, distance, gain, limit):
+        #parts: rezultatele dalelor, cu 'eaters' (ref, pos), 'targets' (row, pos) si migrantii 'moving'
+        #intoarce, per dala, randurile ramase care au mancat si randurile mancate, plus cate s-au mancat;
+        #migrantii care au mancat primesc energia direct in randurile lor, cu care ajung pe dala noua
+        eater_tile = np.concatenate([np.full(len(part['eaters']['ref']), k) for k, part in enumerate(parts)])
+        refs = np.concatenate([part['eaters']['ref'] for part in parts])
+        target_tile = np.concatenate([np.full(len(part['targets']['row']), k) for k, part in enumerate(parts)])
+        rows = np.concatenate([part['targets']['row'] for part in parts])
+        i, j = first_contacts(np.concatenate([part['eaters']['pos'] for part in parts]),
+                              np.concatenate([part['targets']['pos'] for part in parts]), distance)
+        takers, eaten = arbitrate(i, j, len(rows))
+
+        taker_tile, taker_ref = eater_tile[takers], refs[takers]
+        for index in np.unique(taker_tile[taker_ref < 0]).tolist():
+            moved = -1 - taker_ref[(taker_tile == index) & (taker_ref < 0)]
+            energy = parts[index]['moving']['energy']
+            energy[moved] = np.minimum(energy[moved] + gain, limit)
+        fed = [taker_ref[(taker_tile == index) & (taker_ref >= 0)] for index in range(len(parts))]
+        taken = [rows[eaten & (target_tile == index)] for index in range(len(parts))]
+        return fed, taken, int(eaten.sum())
+
+    def pair(self, parts, distance, energy, speed):
+        #imperecherea peste granita, ca in VectorizedEngine.reproduce, intre candidatii 'mates' ai dalelor
+        #intoarce, per dala, (parintii, partenerii), randurile puilor (sau None) si cati s-au nascut
+        tile = np.concatenate([np.full(len(part['mates']['row']), k) for k, part in enumerate(parts)])
+        rows = np.concatenate([part['mates']['row'] for part in parts])
+        pos = np.concatenate([part['mates']['pos'] for part in parts])
+        parents, partners = mating_pairs(pos, distance)
+        mated = [(rows[parents[tile[parents] == index]], rows[partners[tile[partners] == index]])
+                 for index in range(len(parts))]
+        if len(parents) == 0:
+            return mated, None, 0
+        babies, directions = offspring(self.border_rng, pos[parents])
+        return mated, newborn(babies, directions, energy, speed), len(parents)
+
+    #tick-ul
+
+    def update(self):
+        profiler = self.profiler
+        profiler.start('tick')
+        hotkeys = {name: self.take_pending(name) for name in self.pending}
+
+        profiler.start('update_prey')
+        borders = self.outbox
+        ghosts = {
+            'prey': self.ghosts([part['prey'] for part in borders], config.FLOCKING_RADIUS, hotkeys['prey']),
+            'predators': self.ghosts([part['predators'] for part in borders], config.PREY_VISION,
+                                     hotkeys['predators']),
+            'food': self.ghosts([part['food'] for part in borders], config.PREY_FOOD_VISION, hotkeys['food']),
+        }
+        self.stale = True
+        moved = self.phase('prey_move', self.messages({name: [rows] for name, rows in hotkeys.items()}, ghosts))
+        fed, eaten, _ = self.feed(moved, config.FOOD_EAT_DISTANCE, config.PREY_ENERGY_GAIN_FOOD,
+                                  config.PREY_MAX_ENERGY)
+        bred = self.phase('prey_breed', self.messages({'prey': [part['moving'] for part in moved]},
+                                                      fed=fed, eaten=eaten))
+        mated, babies, births = self.pair(bred, config.PREY_MATING_DISTANCE,
+                                          config.PREY_INITIAL_ENERGY, config.BASE_PREY_SPEED)
+        self.prey_births_this_frame = births + sum(part['births'] for part in bred)
+        self.total_prey_births += self.prey_births_this_frame
+        self.total_prey_deaths += sum(part['deaths'] for part in moved)
+        profiler.stop('update_prey')
+
+        #ca VectorizedEngine.spawn_food, cu mancarea de dupa faza prazilor (pradatorii nu o schimba);
+        #pozitia o trage coordonatorul, din generatorul mancarii, si pleaca la dala ei la final de tick
+        profiler.start('spawn_food')
+        self.food_spawn_timer += 1
+        food = None
+        if (self.food_spawn_timer >= config.FOOD_SPAWN_INTERVAL and
+            sum(part['food'] for part in bred) < config.MAX_FOOD):
+            food = {'pos': self.random_positions(1, 20, self.food_rng)}
+            self.food_spawn_timer = 0
+        profiler.stop('spawn_food')
+
+        profiler.start('update_predators')
+        ghosts = {'prey': self.ghosts([part['band'] for part in bred], config.PREDATOR_VISION, babies)}
+        hunted = self.phase('predator_move', self.messages({'prey': [babies]}, ghosts, mated=mated))
+        fed, eaten, caught = self.feed(hunted, config.PREY_CATCH_DISTANCE, config.PREDATOR_ENERGY_GAIN_PREY,
+                                       config.PREDATOR_MAX_ENERGY)
+        self.total_prey_deaths += caught + sum(part['deaths'][0] for part in hunted)
+        self.total_predator_deaths += sum(part['deaths'][1] for part in hunted)
+
+        bred = self.phase('predator_breed', self.messages({'predators': [part['moving'] for part in hunted]},
+                                                          fed=fed, eaten=eaten))
+        mated, babies, births = self.pair(bred, config.PREDATOR_MATING_DISTANCE,
+                                          config.PREDATOR_INITIAL_ENERGY, config.BASE_PREDATOR_SPEED)
+        self.predator_births_this_frame = births + sum(part['births'] for part in bred)
+        self.total_predator_births += self.predator_births_this_frame
+
+        last = self.outbox = self.phase('finish', self.messages({'predators': [babies], 'food': [food]},
+                                                                mated=mated))
+        profiler.stop('update_predators')
+
+        profiler.start('update_history')
+        self.counts = tuple(int(sum(column)) for column in zip(*(part['counts'] for part in last)))
+        prey_energy, predator_energy = (sum(column) for column in zip(*(part['energy'] for part in last)))
+        prey_count, predator_count, food_count = self.counts
+        self.visualizer.record(
+            prey_count, predator_count, food_count,
+            self.prey_births_this_frame, self.predator_births_this_frame,
+            prey_energy / prey_count if prey_count else 0,
+            predator_energy / predator_count if predator_count else 0
+        )
+        profiler.stop('update_history')
+        profiler.stop('tick')
+
+        if profiler.enabled:
+            self.count_stats()
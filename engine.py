@@ -0,0 +1,711 @@
+import random
+from config import *
+from agents import Prey, Predator, Food, Obstacle
+from visualizer import SimulationVisualizer
+from spatial import SpatialGrid, EligibleGrid, VerletLists, candidates
+from obstacle_field import ObstacleField
+from profiler import PhaseProfiler
+from pool import EntityPool
+from checkpoint import (PREY_STATE, PREDATOR_STATE, FOOD_STATE, entity_arrays, restore_entities,
+                        trail_arrays, restore_trails)
+
+def max_steps():
+    #cel mai mult se poate misca o prada (cu bonus maxim de flocking) / un pradator intr-un tick
+    return BASE_PREY_SPEED + 1.5, BASE_PREDATOR_SPEED
+
+def compact_list(entities, pool=None):
+    #scot entitatile marcate removed pe loc, pastrand ordinea (O(n), fara lista noua)
+    #cele scoase se intorc in pool (vezi refresh_perception), pentru urmatoarele nasteri
+    keep = 0
+    for entity in entities:
+        if not entity.removed:
+            entities[keep] = entity
+            keep += 1
+        elif pool is not None:
+            pool.retire(entity)
+    del entities[keep:]
+
+
+class SimulationEngine:
+    backend = "objects"
+    #toata logica simularii, fara pygame display / evenimente / limita de FPS
+    
+    def __init__(self, record_trails=False, seed=None):
+        #urmele agentilor sunt doar pentru desenare; headless nu le mai inregistrez
+        #setarea e a engine-ului: un engine headless (sweep, benchmark) nu le opreste si pe ale UI-ului
+        self.record_trails = record_trails
+        
+        #toate tragerile aleatoare ale simularii trec prin generatorul ei (pozitii, directii, obstacole)
+        #seed None = modulul random global, deci random.seed() din afara se aplica in continuare
+        self.seed = seed
+        self.random = random if seed is None else random.Random(seed)
+        
+        #liste pt agenti
+        self.prey_list = []
+        self.predator_list = []
+        self.food_list = []
+        self.obstacles = []
+        
+        #obiecte refolosite la nasteri / spawn, in loc de obiecte noi (vezi pool.py)
+        self.prey_pool = EntityPool(Prey, self.random)
+        self.predator_pool = EntityPool(Predator, self.random)
+        self.food_pool = EntityPool(Food, self.random)
+        
+        #grile spatiale pt cautarea vecinilor, refacute la fiecare tick
+        self.prey_grid = SpatialGrid(GRID_CELL_SIZE)
+        self.predator_grid = SpatialGrid(GRID_CELL_SIZE)
+        self.food_grid = SpatialGrid(GRID_CELL_SIZE)
+        self.use_grid = USE_SPATIAL_GRID
+        
+        #doar agentii care pot face pui acum (energie + cooldown): partenerul se cauta printre ei,
+        #nu printre toti vecinii; se actualizeaza la fiecare schimbare de energie / cooldown
+        self.prey_mates = EligibleGrid(self.prey_grid, Prey.can_reproduce)
+        self.predator_mates = EligibleGrid(self.predator_grid, Predator.can_reproduce)
+        
+        #ce vede fiecare agent cand decide (vecini, pradatori, mancare, prazi), cu o margine
+        #de VERLET_SKIN ca listele sa ramana bune cateva tick-uri (vezi VerletLists)
+        self.use_verlet = USE_VERLET_LISTS
+        self.flock_lists = VerletLists(self.prey_grid, self.prey_grid, FLOCKING_RADIUS, VERLET_SKIN)
+        self.threat_lists = VerletLists(self.predator_grid, self.prey_grid, PREY_VISION, VERLET_SKIN)
+        self.forage_lists = VerletLists(self.food_grid, self.prey_grid, PREY_FOOD_VISION, VERLET_SKIN)
+        self.hunt_lists = VerletLists(self.prey_grid, self.predator_grid, PREDATOR_VISION, VERLET_SKIN)
+        self.perception = (self.flock_lists, self.threat_lists, self.forage_lists, self.hunt_lists)
+        
+        #prazile izolate isi pastreaza directia fara sa mai decida, cat timp e sigur (idle_horizon)
+        self.adaptive_updates = ADAPTIVE_UPDATES
+        
+        #campul de evitare a obstacolelor, refacut doar in jurul obstacolelor care se schimba
+        #se construieste la prima folosire (vezi avoidance_field), deci fara USE_OBSTACLE_FIELD nu exista deloc
+        self.obstacle_field = None
+        self.use_obstacle_field = USE_OBSTACLE_FIELD
+        
+        #contoare pt statisitici
+        self.prey_births_this_frame = 0
+        self.predator_births_this_frame = 0
+        self.total_prey_births = 0
+        self.total_predator_births = 0
+        self.total_prey_deaths = 0
+        self.total_predator_deaths = 0
+        
+        #counter pentru spawn food
+        self.food_spawn_timer = 0
+        
+        #cate entitati au fost marcate removed in tick-ul curent (vezi compact)
+        self.pending_removals = 0
+        
+        #timpi pe faze si contoare; dezactivat nu costa aproape nimic
+        self.profiler = PhaseProfiler(PROFILE_WINDOW, PROFILE)
+        
+        #"sequential" = fiecare agent vede mutarile celor dinaintea lui (comportamentul original)
+        #"synchronous" = toti decid din aceeasi stare, vezi update_prey_synchronous
+        self.update_mode = UPDATE_MODE
+        
+        # creez vizualizatorul pentru grafice
+        self.visualizer = SimulationVisualizer()
+        self.exporter = None #StreamingExporter, vezi attach_exporter
+        
+        self.reset_simulation()
+    
+    def reset_simulation(self): #ca un fel de nou joc
+        #cu seed, fiecare reset porneste aceeasi rulare
+        if self.seed is not None:
+            self.random.seed(self.seed)
+        
+        self.prey_pool.release_all(self.prey_list)
+        self.predator_pool.release_all(self.predator_list)
+        self.food_pool.release_all(self.food_list)
+        
+        self.prey_list = [
+            self.prey_pool.acquire(self.random.randint(50, WIDTH-50), 
+                                   self.random.randint(50, HEIGHT-50))
+            for _ in range(INITIAL_PREY)
+        ]
+        
+        self.predator_list = [
+            self.predator_pool.acquire(self.random.randint(50, WIDTH-50), 
+                                       self.random.randint(50, HEIGHT-50))
+            for _ in range(INITIAL_PREDATORS)
+        ]
+        
+        self.food_list = [
+            self.food_pool.acquire(self.random.randint(20, WIDTH-20), 
+                                   self.random.randint(20, HEIGHT-20))
+            for _ in range(INITIAL_FOOD)
+        ]
+        
+        self.obstacles = [
+            Obstacle(self.random.randint(100, WIDTH-100), 
+                    self.random.randint(100, HEIGHT-100),
+                    self.random.randint(30, 60))
+            for _ in range(INITIAL_OBSTACLES)
+        ]
+        
+        self.reindex()
+        
+        self.total_prey_births = 0
+        self.total_predator_births = 0
+        self.total_prey_deaths = 0
+        self.total_predator_deaths = 0
+        
+        self.visualizer = SimulationVisualizer(exporter=self.exporter)
+        #Creez un visualizer nou (sterg istoricul vechi).
+        if self.exporter is not None:
+            self.exporter.restart()
+
+        print("Simulation reset!")
+    
+    def reindex(self):
+        #listele de entitati au fost inlocuite (reset, checkpoint): perceptia se reface de la zero
+        for lists in self.perception:
+            lists.invalidate()
+        #grilele sunt si indexul pt desenare (doar ce intra in camera), deci le refac de acum
+        self.prey_grid.rebuild(self.prey_list)
+        self.predator_grid.rebuild(self.predator_list)
+        self.food_grid.rebuild(self.food_list)
+    
+    def reseed(self, seed):
+        #de aici incolo, tragerile aleatoare vin din seed (starea agentilor ramane)
+        self.random.seed(seed)
+    
+    def snapshot(self):
+        #agentii si mancarea, ca array-uri (restul starii il salveaza checkpoint.save)
+        arrays = {}
+        arrays.update(entity_arrays('prey', self.prey_list, PREY_STATE))
+        arrays.update(entity_arrays('predators', self.predator_list, PREDATOR_STATE))
+        arrays.update(entity_arrays('food', self.food_list, FOOD_STATE))
+        if self.record_trails:
+            arrays.update(trail_arrays('prey', self.prey_list))
+            arrays.update(trail_arrays('predators', self.predator_list))
+        #cat s-au putut misca agentii de la ultima reconstructie a fiecarei liste Verlet (None = invalida)
+        return arrays, {'verlet_moved': [lists.moved if lists.valid else None for lists in self.perception]}
+    
+    def restore(self, arrays, meta):
+        #inversul lui snapshot; entitatile vechi se intorc in pool
+        for pool, entities in ((self.prey_pool, self.prey_list), (self.predator_pool, self.predator_list),
+                               (self.food_pool, self.food_list)):
+            pool.release_all(entities)
+            pool.flush()
+        
+        self.prey_list = restore_entities(self.prey_pool, arrays, 'prey', PREY_STATE)
+        self.predator_list = restore_entities(self.predator_pool, arrays, 'predators', PREDATOR_STATE)
+        self.food_list = restore_entities(self.food_pool, arrays, 'food', FOOD_STATE)
+        if self.record_trails and 'prey.trail' in arrays:
+            restore_trails('prey', self.prey_list, arrays)
+            restore_trails('predators', self.predator_list, arrays)
+        
+        self.pending_removals = 0
+        self.reindex()
+        #listele Verlet nu se salveaza, dar continua cu deplasarea salvata: fara ea, raza acoperita
+        #(deci si orizontul prazilor izolate, vezi clearance) ar diferi de cea din rularea continua
+        if self.use_grid and self.use_verlet:
+            for lists, (owners, targets), moved in zip(self.perception, self.perception_members(),
+                                                       meta.get('verlet_moved', ())):
+                if moved is not None:
+                    lists.resume(owners, targets, moved)
+    
+    def step(self, n=1):
+        #n tick-uri la viteza maxima, fara randare
+        for _ in range(n):
+            self.update()
+        return self
+    
+    def attach_exporter(self, exporter):
+        #istoricul se scrie pe disc pe masura ce ruleaza simularea
+        self.exporter = exporter
+        self.visualizer.exporter = exporter
+    
+    def population(self):
+        return len(self.prey_list), len(self.predator_list), len(self.food_list)
+    
+    #adaugari manuale (folosite de hotkey-urile din UI)
+    #intra si in grile, ca sa se vada imediat (render-ul deseneaza din grile), chiar pe pauza
+    def add_prey(self):
+        self.prey_list.append(
+            self.prey_pool.acquire(self.random.randint(50, WIDTH-50), 
+                                   self.random.randint(50, HEIGHT-50))
+        )
+        self.prey_grid.insert(self.prey_list[-1])
+        self.perceive_added(self.prey_list[-1], self.prey_grid)
+    
+    def add_predator(self):
+        self.predator_list.append(
+            self.predator_pool.acquire(self.random.randint(50, WIDTH-50), 
+                                       self.random.randint(50, HEIGHT-50))
+        )
+        self.predator_grid.insert(self.predator_list[-1])
+        self.perceive_added(self.predator_list[-1], self.predator_grid)
+    
+    def add_food(self, count=1):
+        for _ in range(count):
+            self.food_list.append(
+                self.food_pool.acquire(self.random.randint(20, WIDTH-20), 
+                                       self.random.randint(20, HEIGHT-20))
+            )
+            self.food_grid.insert(self.food_list[-1])
+            self.perceive_added(self.food_list[-1], self.food_grid)
+    
+    def add_obstacle(self, x, y):
+        self.obstacles.append(Obstacle(x, y, self.random.randint(30, 60)))
+    
+    def clear_obstacles(self):
+        self.obstacles.clear()
+    
+    def update(self):
+        profiler = self.profiler
+        profiler.start('tick')
+        self.prey_births_this_frame = 0
+        self.predator_births_this_frame = 0
+        
+        self.rebuild_grids()
+        
+        profiler.start('update_prey')
+        self.update_prey()
+        profiler.stop('update_prey')
+        
+        profiler.start('update_predators')
+        self.update_predators()
+        profiler.stop('update_predators')
+        
+        #compactarea inainte de spawn: mancarea mancata in tick-ul asta nu mai conteaza la MAX_FOOD
+        #(ca la stergerea imediata din varianta initiala)
+        self.compact()
+        
+        profiler.start('spawn_food')
+        self.spawn_food()
+        profiler.stop('spawn_food')
+        
+        #salvez datele pentru grafice, in visualizator
+        #trimit listele curente si nasterile din frame-ul asta
+        profiler.start('update_history')
+        self.visualizer.update_history(
+            self.prey_list,
+            self.predator_list,
+            self.food_list,
+            self.prey_births_this_frame,
+            self.predator_births_this_frame
+        )
+        profiler.stop('update_history')
+        profiler.stop('tick')
+        
+        if profiler.enabled:
+            self.count_stats()
+    
+    def count_stats(self):
+        prey_count, predator_count, food_count = self.population()
+        self.profiler.count('neighbor_checks', self.neighbor_checks())
+        self.profiler.count('prey', prey_count)
+        self.profiler.count('predators', predator_count)
+        self.profiler.count('food', food_count)
+    
+    def neighbor_checks(self):
+        #candidatii intorsi de grile de la ultimul apel (fara grila, brute force nu se numara)
+        checks = 0
+        for grid in (self.prey_grid, self.predator_grid, self.food_grid,
+                     self.prey_mates, self.predator_mates, self.flock_lists,
+                     self.threat_lists, self.forage_lists, self.hunt_lists):
+            checks += grid.checks
+            grid.checks = 0
+        return checks
+    
+    def rebuild_grids(self):
+        #o singura reconstructie pe tick, apoi grilele se actualizeaza incremental
+        self.prey_grid.rebuild(self.prey_list)
+        self.predator_grid.rebuild(self.predator_list)
+        self.food_grid.rebuild(self.food_list)
+        self.prey_mates.rebuild(self.prey_list)
+        self.predator_mates.rebuild(self.predator_list)
+        self.refresh_perception()
+    
+    def refresh_perception(self):
+        pools = ((self.prey_pool, self.prey_grid), (self.predator_pool, self.predator_grid),
+                 (self.food_pool, self.food_grid))
+        if not (self.use_grid and self.use_verlet):
+            for lists in self.perception:
+                lists.invalidate()
+        else:
+            step = max(max_steps())
+            for lists, (owners, targets) in zip(self.perception, self.perception_members()):
+                lists.refresh(owners, targets, step)
+        
+        #entitatile moarte raman in listele Verlet (sarite, fiind removed) pana la reconstructie;
+        #abia cand nicio lista nu le mai poate contine, obiectele se pot refolosi din pool
+        for pool, grid in pools:
+            if all(lists.grid is not grid or lists.fresh() for lists in self.perception):
+                pool.flush()
+    
+    def perception_members(self):
+        #(cine cauta, in ce) pentru fiecare lista din self.perception
+        return ((self.prey_list, self.prey_list), (self.prey_list, self.predator_list),
+                (self.prey_list, self.food_list), (self.predator_list, self.prey_list))
+    
+    def perceive_added(self, entity, grid):
+        #entitate noua in `grid`: intra in listele Verlet care o pot vedea
+        for lists in self.perception:
+            if lists.grid is grid:
+                lists.add(entity)
+        if self.adaptive_updates:
+            self.wake_idle(entity, grid)
+    
+    def idle_horizon(self, prey):
+        #cate tick-uri poate sari o prada care tocmai si-a pastrat directia (negativ: cat sa astepte
+        #pana la urmatoarea verificare, daca acum nu e izolata)
+        #cat sta, decide() trebuie sa intoarca aceeasi directie si viteza, iar prada sa nu poata
+        #manca sau face pui; pentru fiecare conditie caut cel mai apropiat vecin pana la
+        #IDLE_MARGIN peste raza si vad in cate tick-uri ar putea ajunge in raza, apropiindu-se
+        #cu viteza maxima (a ei ramane aceeasi cat sta)
+        seen_predators, seen_prey, seen_food, _ = self.perception_sources()
+        prey_step, predator_step = max_steps()
+        speed = prey.speed + 1e-6 #marja pt rotunjiri
+        hungry = prey.energy < PREY_HUNGER_ENERGY
+        
+        #niciun pradator in raza de vedere (atunci nici nu o poate manca)
+        distance = self.clearance(prey, seen_predators, prey.vision)
+        horizon = (distance - prey.vision) / (speed + predator_step)
+        if horizon < 1:
+            return -IDLE_RETRY
+        
+        #nicio mancare la distanta de mancat; flamanda nici in raza de vedere, satula abia
+        #dupa ce energia poate scadea sub prag (cat sta, energia doar scade)
+        distance = self.clearance(prey, seen_food, prey.food_vision)
+        horizon = min(horizon, (distance - FOOD_EAT_DISTANCE) / speed)
+        food_ticks = (distance - prey.food_vision) / speed
+        if not hungry:
+            food_ticks = max(food_ticks, int((prey.energy - PREY_HUNGER_ENERGY) / PREY_ENERGY_LOSS) - 1)
+        horizon = min(horizon, food_ticks)
+        
+        #niciun vecin pt flocking (satula) sau partener
+        if not hungry or prey.energy >= PREY_REPRODUCTION_ENERGY:
+            radius = max(FLOCKING_RADIUS, PREY_MATING_DISTANCE)
+            distance = self.clearance(prey, seen_prey, radius)
+            horizon = min(horizon, (distance - radius) / (speed + prey_step))
+        
+        if horizon < 1:
+            return -IDLE_RETRY
+        return int(horizon)
+    
+    def clearance(self, prey, source, radius):
+        #distanta pana la cea mai apropiata entitate, cautata pana la IDLE_MARGIN peste raza
+        #(cu liste Verlet doar cat acopera deja listele, fara cautari noi in grila)
+        reach = radius + IDLE_MARGIN
+        if isinstance(source, VerletLists):
+            reach = min(reach, source.covered)
+        nearest = prey.find_nearest(source, reach)
+        if nearest is None:
+            return reach
+        return prey.distance_to(nearest)
+    
+    def wake_idle(self, entity, grid):
+        #entitatile nou aparute (nasteri, spawn, hotkey-uri) nu erau in calculul din idle_horizon:
+        #prazile din jur care ar putea-o vedea inainte sa se trezeasca singure decid din nou
+        if grid is self.prey_grid:
+            radius = FLOCKING_RADIUS
+        elif grid is self.predator_grid:
+            radius = PREY_VISION
+        else:
+            radius = PREY_FOOD_VISION
+        for prey in self.prey_grid.nearby(entity.x, entity.y, radius + IDLE_MARGIN):
+            if prey.idle > 0:
+                prey.idle = 0
+    
+    def obstacle_source(self):
+        #ce primesc agentii pentru evitare: campul precalculat sau lista de obstacole
+        if self.use_obstacle_field:
+            return self.avoidance_field()
+        return self.obstacles
+    
+    def avoidance_field(self):
+        if self.obstacle_field is None:
+            self.obstacle_field = ObstacleField(WIDTH, HEIGHT, OBSTACLE_FIELD_CELL)
+        return self.obstacle_field.sync(self.obstacles)
+    
+    def neighbor_sources(self):
+        #ce primesc agentii pentru cautari: grilele sau listele intregi (brute force)
+        if self.use_grid:
+            return self.prey_grid, self.predator_grid, self.food_grid
+        return self.prey_list, self.predator_list, self.food_list
+    
+    def perception_sources(self):
+        #ce vad agentii cand decid: listele Verlet sau, fara ele, aceleasi surse ca la cautari
+        #(pradatori, prazi si mancare pentru prada; prazi pentru pradator)
+        if self.use_grid and self.use_verlet:
+            return self.threat_lists, self.flock_lists, self.forage_lists, self.hunt_lists
+        prey_source, predator_source, food_source = self.neighbor_sources()
+        return predator_source, prey_source, food_source, prey_source
+    
+    def mate_sources(self):
+        #unde se cauta partenerul: indexul de eligibili sau, fara grila, listele intregi
+        if self.use_grid:
+            return self.prey_mates, self.predator_mates
+        return self.prey_list, self.predator_list
+    
+    def remove(self, entity, grid, mates=None):
+        #doar marchez; listele se compacteaza o singura data, la finalul tick-ului
+        entity.removed = True
+        grid.remove(entity)
+        if mates is not None:
+            mates.remove(entity)
+        self.pending_removals += 1
+    
+    def compact(self):
+        if not self.pending_removals:
+            return
+        compact_list(self.prey_list, self.prey_pool)
+        compact_list(self.predator_list, self.predator_pool)
+        compact_list(self.food_list, self.food_pool)
+        self.pending_removals = 0
+    
+    def update_prey(self):
+        if self.update_mode == "synchronous":
+            return self.update_prey_synchronous()
+        _, _, food_source = self.neighbor_sources()
+        seen_predators, seen_prey, seen_food, _ = self.perception_sources()
+        mate_source, _ = self.mate_sources()
+        obstacles = self.obstacle_source()
+        record_trails = self.record_trails
+        prey_list = self.prey_list
+        
+        #bebelusii adaugati in timpul tick-ului nu se actualizeaza acum (ca la parcurgerea unei copii)
+        for index in range(len(prey_list)):
+            prey = prey_list[index]
+            asleep = prey.idle > 0
+            kept = prey.update(seen_predators, seen_prey, 
+                               seen_food, obstacles)
+            self.prey_grid.move(prey)
+            if record_trails:
+                prey.record_trail()
+            
+            if not prey.is_alive():
+                self.remove(prey, self.prey_grid, self.prey_mates)
+                self.total_prey_deaths += 1
+                continue
+            
+            if asleep:
+                #izolata: nu are mancare sau partener destul de aproape (vezi idle_horizon)
+                self.prey_mates.update(prey)
+                continue
+            if kept and self.adaptive_updates:
+                prey.idle = self.idle_horizon(prey)
+            
+            self.prey_eats(prey, food_source)
+            self.prey_mates.update(prey)
+            self.prey_reproduces(prey, mate_source)
+    
+    def update_prey_synchronous(self):
+        #double buffer: toate prazile decid din starea de la inceputul fazei (nimeni nu se misca
+        #pana nu au decis toti), apoi deciziile se aplica si conflictele se rezolva in ordinea listei
+        _, _, food_source = self.neighbor_sources()
+        seen_predators, seen_prey, seen_food, _ = self.perception_sources()
+        mate_source, _ = self.mate_sources()
+        obstacles = self.obstacle_source()
+        record_trails = self.record_trails
+        prey_list = self.prey_list
+        count = len(prey_list)
+        
+        for prey in prey_list:
+            prey.spend_energy()
+        decisions = [prey.plan(seen_predators, seen_prey, seen_food) for prey in prey_list]
+        
+        awake = []
+        for prey, (vx, vy, speed) in zip(prey_list, decisions):
+            awake.append(prey.idle <= 0)
+            kept = prey.adopt(vx, vy, speed)
+            prey.update_position(obstacles)
+            self.prey_grid.move(prey)
+            if record_trails:
+                prey.record_trail()
+            if not prey.is_alive():
+                self.remove(prey, self.prey_grid, self.prey_mates)
+                self.total_prey_deaths += 1
+            elif kept and self.adaptive_updates:
+                prey.idle = self.idle_horizon(prey)
+        
+        #arbitraj: prada cu index mic mananca prima, apoi perechile se formeaza tot in ordinea listei
+        #prazile izolate nu au mancare sau partener destul de aproape (vezi idle_horizon)
+        for index in range(count):
+            prey = prey_list[index]
+            if not prey.removed:
+                if awake[index]:
+                    self.prey_eats(prey, food_source)
+                self.prey_mates.update(prey)
+        for index in range(count):
+            prey = prey_list[index]
+            if not prey.removed and awake[index]:
+                self.prey_reproduces(prey, mate_source)
+    
+    def prey_eats(self, prey, food_source):
+        for food in candidates(food_source, prey.x, prey.y, FOOD_EAT_DISTANCE):
+            if food.removed:
+                continue
+            if prey.distance_to(food) < FOOD_EAT_DISTANCE:
+                prey.eat_food(food)
+                self.remove(food, self.food_grid)
+                break
+    
+    def prey_reproduces(self, prey, mate_source):
+        if prey.can_reproduce():
+            for other in candidates(mate_source, prey.x, prey.y, PREY_MATING_DISTANCE):
+                if other == prey or other.removed:
+                    continue
+                if (other.can_reproduce() and 
+                    prey.distance_to(other) < PREY_MATING_DISTANCE):
+                    baby = prey.reproduce(self.prey_pool, self.random)
+                    other.reproduction_cooldown = PREY_REPRODUCTION_COOLDOWN
+                    self.prey_mates.update(prey)
+                    self.prey_mates.update(other)
+                    self.prey_list.append(baby)
+                    self.prey_grid.insert(baby)
+                    self.perceive_added(baby, self.prey_grid)
+                    self.prey_mates.update(baby)
+                    self.prey_births_this_frame += 1
+                    self.total_prey_births += 1
+                    break
+    
+    def update_predators(self):
+        if self.update_mode == "synchronous":
+            return self.update_predators_synchronous()
+        prey_source, predator_source, _ = self.neighbor_sources()
+        _, _, _, seen_prey = self.perception_sources()
+        _, mate_source = self.mate_sources()
+        obstacles = self.obstacle_source()
+        record_trails = self.record_trails
+        predator_list = self.predator_list
+        
+        for index in range(len(predator_list)):
+            predator = predator_list[index]
+            predator.update(seen_prey, predator_source, obstacles)
+            self.predator_grid.move(predator)
+            if record_trails:
+                predator.record_trail()
+            
+            if not predator.is_alive():
+                self.remove(predator, self.predator_grid, self.predator_mates)
+                self.total_predator_deaths += 1
+                continue
+            
+            self.predator_eats(predator, prey_source)
+            self.predator_mates.update(predator)
+            self.predator_reproduces(predator, mate_source)
+    
+    def update_predators_synchronous(self):
+        prey_source, _, _ = self.neighbor_sources()
+        _, _, _, seen_prey = self.perception_sources()
+        _, mate_source = self.mate_sources()
+        obstacles = self.obstacle_source()
+        record_trails = self.record_trails
+        predator_list = self.predator_list
+        count = len(predator_list)
+        
+        for predator in predator_list:
+            predator.spend_energy()
+        decisions = [predator.decide(seen_prey) for predator in predator_list]
+        
+        for predator, (vx, vy) in zip(predator_list, decisions):
+            predator.vx = vx
+            predator.vy = vy
+            predator.update_position(obstacles)
+            self.predator_grid.move(predator)
+            if record_trails:
+                predator.record_trail()
+            if not predator.is_alive():
+                self.remove(predator, self.predator_grid, self.predator_mates)
+                self.total_predator_deaths += 1
+        
+        for index in range(count):
+            predator = predator_list[index]
+            if not predator.removed:
+                self.predator_eats(predator, prey_source)
+                self.predator_mates.update(predator)
+        for index in range(count):
+            predator = predator_list[index]
+            if not predator.removed:
+                self.predator_reproduces(predator, mate_source)
+    
+    def predator_eats(self, predator, prey_source):
+        for prey in candidates(prey_source, predator.x, predator.y, PREY_CATCH_DISTANCE):
+            if prey.removed:
+                continue
+            if predator.distance_to(prey) < PREY_CATCH_DISTANCE:
+                predator.eat_prey(prey)
+                self.remove(prey, self.prey_grid, self.prey_mates)
+                self.total_prey_deaths += 1
+                break
+    
+    def predator_reproduces(self, predator, mate_source):
+        if predator.can_reproduce():
+            for other in candidates(mate_source, predator.x, predator.y, PREDATOR_MATING_DISTANCE):
+                if other == predator or other.removed:
+                    continue
+                if (other.can_reproduce() and 
+                    predator.distance_to(other) < PREDATOR_MATING_DISTANCE):
+                    baby = predator.reproduce(self.predator_pool, self.random)
+                    other.reproduction_cooldown = PREDATOR_REPRODUCTION_COOLDOWN
+                    self.predator_mates.update(predator)
+                    self.predator_mates.update(other)
+                    self.predator_list.append(baby)
+                    self.predator_grid.insert(baby)
+                    self.perceive_added(baby, self.predator_grid)
+                    self.predator_mates.update(baby)
+                    self.predator_births_this_frame += 1
+                    self.total_predator_births += 1
+                    break
+    
+    def spawn_food(self):
+        self.food_spawn_timer += 1
+        if (self.food_spawn_timer >= FOOD_SPAWN_INTERVAL and 
+            len(self.food_list) < MAX_FOOD):
+            food = self.food_pool.acquire(self.random.randint(20, WIDTH-20), 
+                                          self.random.randint(20, HEIGHT-20))
+            self.food_list.append(food)
+            self.food_grid.insert(food)
+            self.perceive_added(food, self.food_grid)
+            self.food_spawn_timer = 0
+
+
+def create_engine(backend=BACKEND, record_trails=False, seed=None):
+    if backend == "numpy":
+        from vectorized import VectorizedEngine #backend-ul se incarca doar daca e ales (numpy il folosesc oricum istoricul, profiler-ul si listele Verlet)
+        return VectorizedEngine(record_trails, seed)
+    if backend == "tiles":
+        from domains import TiledEngine
+        return TiledEngine(record_trails, seed=seed)
+    return SimulationEngine(record_trails, seed)
+
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Simulare headless, fara fereastra")
+    parser.add_argument("--frames", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--out", default=None,
+                        help="implicit EXPORT_FILE pentru csv, EXPORT_DIR pentru binary")
+    parser.add_argument("--format", choices=["csv", "binary"], default=EXPORT_FORMAT)
+    parser.add_argument("--backend", choices=["objects", "numpy", "tiles"], default=BACKEND)
+    parser.add_argument("--mode", choices=["sequential", "synchronous"], default=UPDATE_MODE,
+                        help="ordinea update-ului pentru backend-ul objects")
+    parser.add_argument("--profile", default=None, 
+                        help="salveaza timpii pe faze in acest fisier (.json sau .csv)")
+    parser.add_argument("--load", default=None, help="porneste din acest checkpoint (vezi checkpoint.py)")
+    parser.add_argument("--save", default=None, help="salveaza checkpoint-ul la final in acest fisier")
+    args = parser.parse_args()
+    
+    import checkpoint
+    from export import StreamingExporter, default_path
+    
+    engine = create_engine(args.backend, seed=args.seed)
+    engine.update_mode = args.mode
+    engine.attach_exporter(StreamingExporter(args.out or default_path(args.format), args.format, EXPORT_CHUNK))
+    if args.load:
+        checkpoint.load(args.load, engine)
+    if args.profile:
+        engine.profiler.resize(max(engine.profiler.window, args.frames))
+        engine.profiler.enabled = True
+    try:
+        engine.step(args.frames)
+    finally:
+        engine.exporter.close()
+        if args.profile:
+            engine.profiler.save(args.profile)
+    if args.save:
+        checkpoint.save(engine, args.save)
+        print(f"Checkpoint salvat în {args.save}")
@@ -0,0 +1,160 @@
+import csv
+import json
+import os
+import queue
+import threading
+import numpy as np
+from config import *
+from history import COLUMNS, CSV_HEADER
+
+
+def default_path(fmt):
+    #fiecare format are locul lui: csv e un fisier, binary un director
+    return EXPORT_DIR if fmt == 'binary' else EXPORT_FILE
+
+
+class StreamingExporter:
+    #scrie istoricul pe disc in timpul rularii, pe bucati de `chunk` frame-uri
+    #scrierea efectiva se face pe un thread separat; append() doar pune randul intr-o lista
+    #fmt='csv' -> fisier csv, fmt='binary' -> director cu cate un fisier brut per coloana (vezi load_binary)
+
+    def __init__(self, path, fmt='csv', chunk=1024):
+        if fmt not in ('csv', 'binary'):
+            raise ValueError(f"Format necunoscut: {fmt}")
+        self.path = path
+        self.fmt = fmt
+        self.chunk = chunk
+        self.pending = []
+        self.rows_written = 0
+        self.error = None
+        self.reported = False
+
+        #fisierul / directorul se deschide aici, pe loc: o cale gresita opreste rularea de la inceput,
+        #nu abia la close(), dupa ce toate tick-urile au rulat degeaba
+        self.handles = self.open_handles()
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self.writer_loop, daemon=True)
+        self.thread.start()
+
+    def append(self, row):
+        self.pending.append(row)
+        if len(self.pending) >= self.chunk:
+            self.flush()
+
+    def append_columns(self, columns):
+        #multe randuri deodata, deja pe coloane (ordinea COLUMNS), ex. istoricul dintr-un checkpoint:
+        #pleaca intr-o singura scriere, nu rand cu rand prin append()
+        self.flush()
+        self.push('columns', columns)
+
+    def flush(self):
+        if self.pending:
+            self.push('rows', self.pending)
+            self.pending = []
+
+    def restart(self):
+        #simularea a fost resetata: fisierul o ia de la capat, ca save_data
+        self.pending = []
+        self.push('restart')
+
+    def push(self, kind, rows=None):
+        #o eroare de pe thread-ul de scriere (disc plin, fisier sters...) se ridica la urmatoarea trimitere
+        self.raise_error()
+        self.queue.put((kind, rows))
+
+    def raise_error(self):
+        #o singura data: close() de dupa (din finally) nu o mai arunca inca o data
+        if self.error is not None and not self.reported:
+            self.reported = True
+            raise self.error
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self.queue.put(('close', None))
+            self.thread.join()
+        self.raise_error()
+        if self.error is None:
+            print(f"Date salvate în {self.path}")
+
+    def writer_loop(self):
+        handles = self.handles
+        while True:
+            kind, rows = self.queue.get()
+            if self.error is not None and kind != 'close':
+                continue
+            try:
+                if kind == 'restart':
+                    self.close_handles(handles)
+                    handles = self.open_handles()
+                    self.rows_written = 0
+                elif kind == 'rows':
+                    self.write_rows(handles, rows)
+                    self.rows_written += len(rows)
+                elif kind == 'columns':
+                    self.write_columns(handles, rows)
+                    self.rows_written += len(rows[0])
+                else:
+                    self.close_handles(handles)
+                    return
+            except Exception as exc: #eroarea iese in thread-ul simularii, la urmatorul push()
+                self.error = exc
+
+    def open_handles(self):
+        if self.fmt == 'csv':
+            f = open(self.path, 'w', newline='')
+            writer = csv.writer(f)
+            writer.writerow(CSV_HEADER)
+            f.flush()
+            return f, writer
+
+        os.makedirs(self.path, exist_ok=True)
+        with open(os.path.join(self.path, 'meta.json'), 'w') as meta:
+            json.dump({'columns': [[name, np.dtype(dtype).str] for name, dtype in COLUMNS]}, meta)
+        return [open(os.path.join(self.path, name + '.bin'), 'wb') for name, _ in COLUMNS]
+
+    def write_rows(self, handles, rows):
+        if self.fmt == 'csv':
+            f, writer = handles
+            writer.writerows(rows)
+            f.flush()
+            return
+
+        self.write_columns(handles, list(zip(*rows)))
+
+    def write_columns(self, handles, columns):
+        if self.fmt == 'csv':
+            f, writer = handles
+            writer.writerows(zip(*(np.asarray(values).tolist() for values in columns)))
+            f.flush()
+            return
+
+        for f, (name, dtype), values in zip(handles, COLUMNS, columns):
+            np.asarray(values, dtype=dtype).tofile(f)
+            f.flush()
+
+    def close_handles(self, handles):
+        if handles is None:
+            return
+        if self.fmt == 'csv':
+            handles[0].close()
+        else:
+            for f in handles:
+                f.close()
+
+
+def load_binary(path, mmap=True):
+    #citeste formatul binar: dict coloana -> array (memory-mapped, fara sa incarce tot in RAM)
+    with open(os.path.join(path, 'meta.json')) as meta:
+        columns = json.load(meta)['columns']
+    data = {}
+    for name, dtype in columns:
+        filename = os.path.join(path, name + '.bin')
+        if mmap and os.path.getsize(filename) > 0:
+            data[name] = np.memmap(filename, dtype=dtype, mode='r')
+        else:
+            data[name] = np.fromfile(filename, dtype=dtype)
+    #daca s-a oprit in mijlocul unei scrieri, coloanele pot avea lungimi diferite
+    rows = min(len(values) for values in data.values())
+    return {name: values[:rows] for name, values in data.items()}
@@ -0,0 +1,47 @@
+import numpy as np
+import pygame
+from config import *
+
+#nivelul de detaliu pentru populatii mari: in loc de cate un sprite per agent, ecranul se imparte
+#in celule de HEATMAP_CELL px si fiecare celula se coloreaza dupa cati agenti din fiecare specie cad in ea
+#numararea e un np.bincount per specie, iar imaginea se scrie dintr-o bucata cu surfarray,
+#deci costul unui frame depinde de numarul de celule, nu de cel de agenti
+
+
+class DensityHeatmap:
+
+    def __init__(self, view_width, view_height, cell):
+        self.cell = cell
+        self.columns = -(-view_width // cell)
+        self.rows = -(-view_height // cell)
+        self.surface = pygame.Surface((self.columns, self.rows))
+        self.scaled = pygame.Surface((self.columns * cell, self.rows * cell))
+        self.image = np.empty((self.columns, self.rows, 3), np.float32) #indexat (x, y), ca surfarray
+        self.pixels = np.empty((self.columns, self.rows, 3), np.uint8)
+
+    def counts(self, pos, camera):
+        #cati agenti cad in fiecare celula a ecranului; pozitiile sunt in coordonate lume
+        scale = camera.zoom / self.cell
+        cx = (pos[:, 0] - camera.x) * scale
+        cy = (pos[:, 1] - camera.y) * scale
+        inside = (cx >= 0) & (cx < self.columns) & (cy >= 0) & (cy < self.rows)
+        cells = cx[inside].astype(np.intp) * self.rows + cy[inside].astype(np.intp)
+        return np.bincount(cells, minlength=self.columns * self.rows).reshape(self.columns, self.rows)
+
+    def draw(self, screen, camera, layers):
+        #layers = [(pozitii (n, 2), culoare)], in ordinea in care se suprapun
+        #o celula cu un singur agent se vede deja, cu HEATMAP_SATURATION sau mai multi are culoarea plina
+        image = self.image
+        image[...] = BACKGROUND_COLOR
+        saturation = np.log1p(np.float32(HEATMAP_SATURATION))
+        for pos, color in layers:
+            if len(pos) == 0:
+                continue
+            counts = self.counts(pos, camera)
+            occupied = counts > 0
+            alpha = np.minimum(np.log1p(counts[occupied], dtype=np.float32) / saturation, 1)[:, None]
+            image[occupied] += (np.array(color, np.float32) - image[occupied]) * alpha
+        np.copyto(self.pixels, image, casting='unsafe')
+        pygame.surfarray.blit_array(self.surface, self.pixels)
+        pygame.transform.scale(self.surface, self.scaled.get_size(), self.scaled)
+        screen.blit(self.scaled, (0, 0))
@@ -0,0 +1,147 @@
+import numpy as np
+
+#coloanele istoricului, in ordinea din simulation_data.csv
+COLUMNS = [
+    ('time', np.int64),
+    ('prey_count', np.int32),
+    ('predator_count', np.int32),
+    ('food_count', np.int32),
+    ('prey_births', np.int32),
+    ('predator_births', np.int32),
+    ('prey_avg_energy', np.float64),
+    ('predator_avg_energy', np.float64),
+]
+COLUMN_NAMES = [name for name, _ in COLUMNS]
+CSV_HEADER = ['Time', 'Prey', 'Predators', 'Food', 
+              'Prey_Births', 'Predator_Births',
+              'Prey_Avg_Energy', 'Predator_Avg_Energy']
+#ce mai trebuie, pe langa array-uri, ca un HistoryStore sa continue exact de unde a ramas
+STATE_KEYS = ('chunk', 'limit', 'count', 'decimation', 'long_term_size', 'block_size', 'blocks',
+              'block_fill')
+
+
+class HistoryStore:
+    #istoric pe coloane, in array-uri prealocate care cresc cu cate un chunk
+    #cu limit=N devine ring buffer: pastreaza ultimele N frame-uri, iar restul ramane
+    #doar ca serie min/max pe blocuri de `decimation` frame-uri (si aceea de marime fixa)
+
+    def __init__(self, chunk=4096, limit=None, decimation=100, long_term_size=4096):
+        self.chunk = chunk
+        self.limit = limit
+        self.count = 0  # cate frame-uri s-au adaugat in total
+        capacity = limit if limit else chunk
+        self.columns = {name: np.zeros(capacity, dtype=dtype) for name, dtype in COLUMNS}
+
+        #seria pe termen lung: un rand per bloc, cu min si max pe fiecare coloana
+        self.decimation = decimation
+        self.long_term_size = long_term_size
+        self.block_size = decimation
+        self.blocks = 0
+        self.block_fill = 0
+        self.block_min = {name: np.zeros(long_term_size, dtype=dtype) for name, dtype in COLUMNS}
+        self.block_max = {name: np.zeros(long_term_size, dtype=dtype) for name, dtype in COLUMNS}
+
+    def append(self, row):
+        #row = valorile in ordinea COLUMNS
+        if self.limit:
+            index = self.count % self.limit
+        else:
+            index = self.count
+            if index == len(self.columns['time']):
+                self.grow()
+        for (name, _), value in zip(COLUMNS, row):
+            self.columns[name][index] = value
+        self.count += 1
+
+        if self.limit:
+            self.add_to_block(row)
+
+    def grow(self):
+        for name, dtype in COLUMNS:
+            old = self.columns[name]
+            new = np.zeros(len(old) + self.chunk, dtype=dtype)
+            new[:len(old)] = old
+            self.columns[name] = new
+
+    def add_to_block(self, row):
+        b = self.blocks
+        if self.block_fill == 0:
+            for (name, _), value in zip(COLUMNS, row):
+                self.block_min[name][b] = value
+                self.block_max[name][b] = value
+        else:
+            for (name, _), value in zip(COLUMNS, row):
+                if value < self.block_min[name][b]:
+                    self.block_min[name][b] = value
+                if value > self.block_max[name][b]:
+                    self.block_max[name][b] = value
+        self.block_fill += 1
+
+        if self.block_fill == self.block_size:
+            self.block_fill = 0
+            self.blocks += 1
+            if self.blocks == self.long_term_size:
+                self.merge_blocks()
+
+    def merge_blocks(self):
+        #seria lunga e plina: unesc blocurile doua cate doua si dublez marimea blocului
+        half = self.long_term_size // 2
+        for name, _ in COLUMNS:
+            mins, maxs = self.block_min[name], self.block_max[name]
+            mins[:half] = np.minimum(mins[0:2 * half:2], mins[1:2 * half:2])
+            maxs[:half] = np.maximum(maxs[0:2 * half:2], maxs[1:2 * half:2])
+        self.blocks = half
+        self.block_size *= 2
+
+    def state(self):
+        #(array-uri, meta) pt checkpoint: doar partea ocupata din buffere, in ordinea din memorie
+        blocks = self.blocks + (1 if self.block_fill else 0)
+        arrays = {}
+        for name in COLUMN_NAMES:
+            arrays[name] = self.columns[name][:len(self)]
+            arrays['min.' + name] = self.block_min[name][:blocks]
+            arrays['max.' + name] = self.block_max[name][:blocks]
+        meta = {key: getattr(self, key) for key in STATE_KEYS}
+        return arrays, meta
+
+    def restore(self, arrays, meta):
+        #inversul lui state(); parametrii (limita, decimarea) sunt cei din checkpoint
+        for key in STATE_KEYS:
+            setattr(self, key, meta[key])
+        capacity = self.limit or max(self.chunk, self.count)
+        for name, dtype in COLUMNS:
+            values = arrays[name]
+            self.columns[name] = np.zeros(capacity, dtype=dtype)
+            self.columns[name][:len(values)] = values
+            for prefix, blocks in (('min.', self.block_min), ('max.', self.block_max)):
+                values = arrays[prefix + name]
+                blocks[name] = np.zeros(self.long_term_size, dtype=dtype)
+                blocks[name][:len(values)] = values
+
+    def __len__(self):
+        #cate frame-uri sunt disponibile la rezolutie completa
+        if self.limit:
+            return min(self.count, self.limit)
+        return self.count
+
+    def __getitem__(self, name):
+        #coloana in ordine cronologica (view fara copiere, cat timp ring-ul nu s-a rotit)
+        column = self.columns[name]
+        if self.limit and self.count > self.limit:
+            start = self.count % self.limit
+            return np.concatenate((column[start:], column[:start]))
+        return column[:len(self)]
+
+    def last(self):
+        #ultimul rand adaugat, ca tuplu de valori Python
+        index = (self.count - 1) % self.limit if self.limit else self.count - 1
+        return tuple(self.columns[name][index].item() for name in COLUMN_NAMES)
+
+    def long_term(self, name):
+        #(min, max) pe blocuri complete; blocul i acopera frame-urile [i*block_size, (i+1)*block_size)
+        return self.block_min[name][:self.blocks], self.block_max[name][:self.blocks]
+
+    def ratio(self, numerator='predator_count', denominator='prey_count'):
+        top = self[numerator].astype(float)
+        bottom = self[denominator]
+        return np.divide(top, bottom, out=np.zeros_like(top), where=bottom > 0)
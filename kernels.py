@@ -0,0 +1,36 @@
+import numpy as np
+from config import *
+
+
+def flock_steering(pos, vel, i, j, d, n):
+    #Boids pentru toata prada odata, din perechile de vecini (i, j, d) cu d < FLOCKING_RADIUS
+    #aceleasi reguli ca Prey.flock: separare (<20px), aliniere, coeziune, ponderate la fel
+    #intoarce directia noua (normalizata), masca randurilor care si-o schimba, nr. vecini si viteza
+    neighbors = np.bincount(i, minlength=n)
+
+    close = d < 20
+    ic, jc = i[close], j[close]
+    sep_x = np.bincount(ic, weights=pos[ic, 0] - pos[jc, 0], minlength=n)
+    sep_y = np.bincount(ic, weights=pos[ic, 1] - pos[jc, 1], minlength=n)
+    align_x = np.bincount(i, weights=vel[j, 0], minlength=n)
+    align_y = np.bincount(i, weights=vel[j, 1], minlength=n)
+    coh_x = np.bincount(i, weights=pos[j, 0], minlength=n)
+    coh_y = np.bincount(i, weights=pos[j, 1], minlength=n)
+
+    has = neighbors > 0
+    count = np.where(has, neighbors, 1)
+    steer_x = (sep_x * SEPARATION_WEIGHT
+               + align_x / count * ALIGNMENT_WEIGHT
+               + (coh_x / count - pos[:, 0]) * COHESION_WEIGHT)
+    steer_y = (sep_y * SEPARATION_WEIGHT
+               + align_y / count * ALIGNMENT_WEIGHT
+               + (coh_y / count - pos[:, 1]) * COHESION_WEIGHT)
+
+    length = np.sqrt(steer_x * steer_x + steer_y * steer_y)
+    steer = has & (length > 0)
+    safe = np.where(steer, length, 1)
+    direction = np.column_stack((steer_x / safe, steer_y / safe))
+
+    speed = np.where(has, BASE_PREY_SPEED + np.minimum(neighbors * FLOCK_SPEED_BONUS, 1.5),
+                     BASE_PREY_SPEED)
+    return direction, steer, neighbors, speed
@@ -0,0 +1,170 @@
+import math
+from collections import Counter
+import numpy as np
+
+AVOID_DISTANCE = 30 # aceeasi distanta de evitare ca in Agent.avoid_obstacles
+TILE = 32 # celule per latura de dala; campul e tinut doar pe dalele la care ajunge un obstacol
+
+
+class ObstacleField:
+    #campul de respingere al obstacolelor, precalculat pe o grila rara (noduri la `cell` px)
+    #un agent il citeste in O(1) cu interpolare biliniara, indiferent cate obstacole sunt
+    #
+    #pe langa vectorul de respingere tin si marginea (distanta pana la zona de evitare, <0 = inauntru),
+    #ca sa nu apara respingere falsa intr-o banda de o celula in jurul zonei
+    #
+    #grila e impartita in dale de TILE x TILE celule (TILE + 1 noduri pe latura, nodurile de pe granita
+    #sunt in ambele dale) si doar dalele atinse de un obstacol au valori; restul lumii e "departe de tot"
+    #la o schimbare (B / C / reset) se recalculeaza doar dalele din jurul obstacolelor adaugate sau scoase
+
+    def __init__(self, width, height, cell):
+        self.cell = cell
+        self.nx = int(math.ceil(width / cell)) + 1
+        self.ny = int(math.ceil(height / cell)) + 1
+        #pentru fiecare dala, randul ei din `blocks`, sau -1 daca niciun obstacol nu ajunge pana acolo
+        self.tile_index = np.full((-(-(self.ny - 1) // TILE), -(-(self.nx - 1) // TILE)), -1, dtype=np.intp)
+        #(dale, 3, TILE + 1, TILE + 1): ax, ay si marginea fiecarei dale ocupate
+        self.blocks = np.zeros((0, 3, TILE + 1, TILE + 1))
+        self.free = []
+        self.signature = ()
+        self.empty = True
+
+    def sync(self, obstacles):
+        #apelat o data pe tick; comparatia costa O(nr. obstacole), recalcularea doar la schimbari
+        signature = tuple((o.position.x, o.position.y, o.radius) for o in obstacles)
+        if signature != self.signature:
+            self.update(signature)
+        return self
+
+    def update(self, signature):
+        old, new = Counter(self.signature), Counter(signature)
+        tiles = set()
+        for obstacle in ((old - new) + (new - old)).elements():
+            tiles.update(self.tiles(self.box(obstacle)))
+        self.signature = signature
+        boxes = [self.box(obstacle) for obstacle in signature]
+        for tile in tiles:
+            self.build_tile(tile, boxes)
+        self.empty = not signature
+
+    def box(self, obstacle):
+        #nodurile din jurul obstacolului (+1 celula, pentru interpolare): [i0, i1) x [j0, j1)
+        ox, oy, radius = obstacle
+        cell = self.cell
+        reach = radius + AVOID_DISTANCE
+        return (max(0, int((ox - reach) // cell) - 1), min(self.nx, int((ox + reach) // cell) + 3),
+                max(0, int((oy - reach) // cell) - 1), min(self.ny, int((oy + reach) // cell) + 3))
+
+    def tiles(self, box):
+        #dalele care contin macar un nod din box
+        i0, i1, j0, j1 = box
+        rows, columns = self.tile_index.shape
+        return [(tx, ty)
+                for ty in range(max(0, (j0 - 1) // TILE), min(rows, (j1 - 1) // TILE + 1))
+                for tx in range(max(0, (i0 - 1) // TILE), min(columns, (i1 - 1) // TILE + 1))]
+
+    def build_tile(self, tile, boxes):
+        #dala de la zero, din toate obstacolele care ajung in ea, in ordinea listei (ca sumele
+        #sa iasa la fel ca la o reconstructie completa)
+        tx, ty = tile
+        cell = self.cell
+        x0, y0 = tx * TILE, ty * TILE
+        block = np.zeros((3, TILE + 1, TILE + 1))
+        block[2] = 2.0 * cell
+        xs = (x0 + np.arange(TILE + 1)) * cell
+        ys = (y0 + np.arange(TILE + 1)) * cell
+
+        touched = False
+        for (ox, oy, radius), (i0, i1, j0, j1) in zip(self.signature, boxes):
+            i0, i1 = max(i0, x0) - x0, min(i1, x0 + TILE + 1) - x0
+            j0, j1 = max(j0, y0) - y0, min(j1, y0 + TILE + 1) - y0
+            if i0 >= i1 or j0 >= j1:
+                continue
+            touched = True
+            reach = radius + AVOID_DISTANCE
+            dx = xs[None, i0:i1] - ox
+            dy = ys[j0:j1, None] - oy
+            d = np.sqrt(dx * dx + dy * dy)
+            inside = (d < reach) & (d > 0)
+            weight = np.where(inside, 1 / (np.maximum(d, 1) * np.where(d > 0, d, 1)), 0)
+            block[0, j0:j1, i0:i1] += dx * weight
+            block[1, j0:j1, i0:i1] += dy * weight
+            np.minimum(block[2, j0:j1, i0:i1], d - reach, out=block[2, j0:j1, i0:i1])
+
+        index = self.tile_index[ty, tx]
+        if not touched:
+            if index >= 0:
+                self.free.append(index)
+                self.tile_index[ty, tx] = -1
+            return
+        if index < 0:
+            index = self.allocate()
+            self.tile_index[ty, tx] = index
+        self.blocks[index] = block
+
+    def allocate(self):
+        if not self.free:
+            used = len(self.blocks)
+            grown = np.zeros((max(16, 2 * used),) + self.blocks.shape[1:])
+            grown[:used] = self.blocks
+            self.blocks = grown
+            self.free = list(range(len(grown) - 1, used - 1, -1))
+        return self.free.pop()
+
+    def sample(self, x, y):
+        #(ax, ay) interpolat in punctul (x, y), sau None daca punctul e in afara oricarei zone de evitare
+        if self.empty:
+            return None
+        fx = min(max(x / self.cell, 0.0), self.nx - 1.000001)
+        fy = min(max(y / self.cell, 0.0), self.ny - 1.000001)
+        i = int(fx)
+        j = int(fy)
+        index = self.tile_index.item(j // TILE, i // TILE)
+        if index < 0:
+            return None
+        tx = fx - i
+        ty = fy - j
+        i %= TILE
+        j %= TILE
+        w00 = (1 - tx) * (1 - ty)
+        w10 = tx * (1 - ty)
+        w01 = (1 - tx) * ty
+        w11 = tx * ty
+
+        v = self.blocks.item
+        if (v(index, 2, j, i) * w00 + v(index, 2, j, i + 1) * w10 + v(index, 2, j + 1, i) * w01
+                + v(index, 2, j + 1, i + 1) * w11 >= 0):
+            return None
+        return (v(index, 0, j, i) * w00 + v(index, 0, j, i + 1) * w10
+                + v(index, 0, j + 1, i) * w01 + v(index, 0, j + 1, i + 1) * w11,
+                v(index, 1, j, i) * w00 + v(index, 1, j, i + 1) * w10
+                + v(index, 1, j + 1, i) * w01 + v(index, 1, j + 1, i + 1) * w11)
+
+    def sample_many(self, pos):
+        #acelasi lucru pentru un array (n, 2) de pozitii; randurile din afara zonelor dau (0, 0)
+        out = np.zeros_like(pos)
+        if self.empty:
+            return out
+        fx = np.clip(pos[:, 0] / self.cell, 0, self.nx - 1.000001)
+        fy = np.clip(pos[:, 1] / self.cell, 0, self.ny - 1.000001)
+        i = fx.astype(np.intp)
+        j = fy.astype(np.intp)
+        index = self.tile_index[j // TILE, i // TILE]
+        rows = np.flatnonzero(index >= 0)
+        if len(rows) == 0:
+            return out
+        index = index[rows]
+        tx = fx[rows] - i[rows]
+        ty = fy[rows] - j[rows]
+        i = i[rows] % TILE
+        j = j[rows] % TILE
+
+        def interpolate(field):
+            values = self.blocks[:, field]
+            return (values[index, j, i] * (1 - tx) * (1 - ty) + values[index, j, i + 1] * tx * (1 - ty)
+                    + values[index, j + 1, i] * (1 - tx) * ty + values[index, j + 1, i + 1] * tx * ty)
+
+        inside = interpolate(2) < 0
+        out[rows, 0] = np.where(inside, interpolate(0), 0)
+        out[rows, 1] = np.where(inside, interpolate(1), 0)
+        return out
@@ -0,0 +1,60 @@
+#obiecte refolosite pentru nasteri, morti si mancare (backend-ul objects)
+#
+#entitatile scoase din simulare nu mai sunt lasate GC-ului: la compactare se intorc in pool,
+#iar nasterile / spawn-ul le reinitializeaza (respawn) in loc sa construiasca obiecte noi
+#pana la flush() stau deoparte (retired), cat timp pot fi inca referite de listele Verlet
+#dupa ce populatia s-a stabilizat, un tick nu mai aloca agenti, mancare sau buffere de urme
+#
+#fiecare eliberare creste `generation`, deci o referinta pastrata ca (entitate, generatie)
+#se poate recunoaste ca expirata chiar daca obiectul a fost refolosit intre timp
+#(asa le tin minte listele Verlet pe owneri, vezi spatial.py)
+
+
+class EntityPool:
+
+    def __init__(self, cls, rng):
+        self.cls = cls #Prey, Predator sau Food: constructor (x, y, rng) si respawn(x, y, rng)
+        self.rng = rng #generatorul simularii (directia initiala a agentilor)
+        self.free = []
+        self.retired = []
+
+    def acquire(self, x, y):
+        if self.free:
+            entity = self.free.pop()
+            entity.respawn(x, y, self.rng)
+            return entity
+        return self.cls(x, y, self.rng)
+
+    def release(self, entity):
+        entity.removed = True
+        entity.generation += 1
+        self.free.append(entity)
+
+    def release_all(self, entities):
+        for entity in entities:
+            self.release(entity)
+
+    def retire(self, entity):
+        #scoasa in tick-ul asta; devine refolosibila abia la flush()
+        entity.removed = True
+        self.retired.append(entity)
+
+    def flush(self):
+        self.release_all(self.retired)
+        self.retired.clear()
+
+    def __len__(self):
+        return len(self.free)
+
+
+def handle(entity):
+    #referinta care nu tine minte doar obiectul, ci si "viata" lui curenta
+    return entity, entity.generation
+
+
+def resolve(ref):
+    #entitatea, daca e tot cea de cand s-a luat referinta, altfel None
+    entity, generation = ref
+    if entity.generation != generation or entity.removed:
+        return None
+    return entity
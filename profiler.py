@@ -0,0 +1,103 @@
+import csv
+import json
+import time
+import numpy as np
+
+#fazele masurate, in ordinea in care apar in overlay si in export
+PHASES = ['update_prey', 'update_predators', 'spawn_food', 'update_history', 'tick',
+          'render', 'draw_ui', 'flip']
+COUNTERS = ['neighbor_checks', 'prey', 'predators', 'food']
+PERCENTILES = [50, 90, 99]
+
+
+class PhaseProfiler:
+    #timpi pe faze (ms) si contoare per tick, tinute in ferestre circulare de `window` valori
+    #dezactivat, start/stop/count se opresc la primul if, deci costul e cateva apeluri goale pe tick
+
+    def __init__(self, window=600, enabled=False):
+        self.window = window
+        self.enabled = enabled
+        self.values = {}
+        self.counts = {}
+        self.started = {}
+
+    def start(self, name):
+        if self.enabled:
+            self.started[name] = time.perf_counter()
+
+    def stop(self, name):
+        if self.enabled:
+            started = self.started.pop(name, None)
+            if started is not None:
+                self.add(name, (time.perf_counter() - started) * 1000)
+
+    def count(self, name, value):
+        if self.enabled:
+            self.add(name, value)
+
+    def add(self, name, value):
+        ring = self.values.get(name)
+        if ring is None:
+            ring = self.values[name] = np.zeros(self.window)
+            self.counts[name] = 0
+        ring[self.counts[name] % self.window] = value
+        self.counts[name] += 1
+
+    def resize(self, window):
+        #doar inainte de primul esantion (sau dupa reset): ring-urile existente sunt indexate modulo window
+        if self.values:
+            raise ValueError("Fereastra profiler-ului nu se poate schimba dupa primele esantioane; apelati reset()")
+        self.window = window
+
+    def reset(self):
+        self.values = {}
+        self.counts = {}
+        self.started = {}
+
+    def samples(self, name):
+        #valorile din fereastra (ordinea nu conteaza pentru percentile)
+        ring = self.values.get(name)
+        if ring is None:
+            return np.zeros(0)
+        return ring[:min(self.counts[name], self.window)]
+
+    def summary(self):
+        #nume -> {'samples', 'mean', 'p50', 'p90', 'p99', 'max'}, doar pentru ce s-a masurat
+        result = {}
+        for name in PHASES + COUNTERS + sorted(set(self.values) - set(PHASES + COUNTERS)):
+            values = self.samples(name)
+            if len(values) == 0:
+                continue
+            row = {'samples': int(self.counts[name]), 'mean': float(values.mean())}
+            for q, value in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+                row[f'p{q}'] = float(value)
+            row['max'] = float(values.max())
+            result[name] = row
+        return result
+
+    def overlay_lines(self):
+        lines = ["PROFILE (ms, p50/p90/p99):"]
+        summary = self.summary()
+        for name in PHASES:
+            if name in summary:
+                row = summary[name]
+                lines.append(f"  {name}: {row['p50']:.2f}/{row['p90']:.2f}/{row['p99']:.2f}")
+        for name in COUNTERS:
+            if name in summary:
+                lines.append(f"  {name}: {summary[name]['p50']:.0f}")
+        return lines
+
+    def save(self, path):
+        #formatul dupa extensie: .json sau .csv
+        summary = self.summary()
+        if path.endswith('.json'):
+            with open(path, 'w') as f:
+                json.dump({'window': self.window, 'metrics': summary}, f, indent=2)
+        else:
+            columns = ['samples', 'mean'] + [f'p{q}' for q in PERCENTILES] + ['max']
+            with open(path, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(['metric'] + columns)
+                for name, row in summary.items():
+                    writer.writerow([name] + [row[column] for column in columns])
+        print(f"Profil salvat în {path}")
@@ -0,0 +1,115 @@
+import math
+import pygame
+from config import *
+
+ANGLE_BUCKETS = 72 # predatorii se deseneaza rotiti in pasi de 5 grade
+
+
+def prepare(surface):
+    #convert_alpha merge doar dupa ce exista fereastra
+    if pygame.display.get_surface() is not None:
+        return surface.convert_alpha()
+    return surface
+
+
+def prey_color(energy):
+    if energy > 70:
+        return PREY_COLOR
+    elif energy > 30:
+        return (200, 200, 50)  # Galben
+    return (255, 150, 50)  # Portocaliu
+
+
+def predator_color(energy):
+    if energy > 100:
+        return PREDATOR_COLOR
+    elif energy > 50:
+        return (200, 80, 80)
+    return (150, 50, 50)
+
+
+class TextCache:
+    #suprafetele de text se refac doar cand textul se schimba
+
+    def __init__(self, font, max_size=512):
+        self.font = font
+        self.max_size = max_size
+        self.surfaces = {}
+
+    def render(self, text, color):
+        key = (text, color)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            if len(self.surfaces) >= self.max_size:
+                self.surfaces.clear()
+            surface = self.font.render(text, True, color)
+            self.surfaces[key] = surface
+        return surface
+
+
+class SpriteCache:
+    #sprite-uri pre-randate pentru agenti si barele de energie, refolosite la fiecare frame
+    #render-ul doar strange perechi (sprite, pozitie) si le deseneaza cu un singur screen.blits()
+
+    def __init__(self):
+        self.prey = {}
+        self.predators = {}
+        self.bars = {}
+        self.food = None
+
+    def prey_sprite(self, energy):
+        color = prey_color(energy)
+        sprite = self.prey.get(color)
+        if sprite is None:
+            sprite = pygame.Surface((11, 11), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, color, (5, 5), 5)
+            sprite = self.prey[color] = prepare(sprite)
+        return sprite
+
+    def predator_sprite(self, energy, vx, vy):
+        color = predator_color(energy)
+        bucket = round(math.atan2(vy, vx) / (2 * math.pi) * ANGLE_BUCKETS) % ANGLE_BUCKETS
+        key = (color, bucket)
+        sprite = self.predators.get(key)
+        if sprite is None:
+            angle = bucket * 2 * math.pi / ANGLE_BUCKETS
+            cos, sin = math.cos(angle), math.sin(angle)
+            sprite = pygame.Surface((27, 27), pygame.SRCALPHA)
+            points = [(12, 0), (-6, -6), (-6, 6)]
+            pygame.draw.polygon(sprite, color, [
+                (13 + px * cos - py * sin, 13 + px * sin + py * cos) for px, py in points
+            ])
+            sprite = self.predators[key] = prepare(sprite)
+        return sprite
+
+    def bar(self, width, energy, max_energy):
+        #bara rosie de fundal + partea verde, pentru fiecare latime posibila a partii verzi
+        fill = max(0, min(width, int(width * (energy / max_energy))))
+        key = (width, fill)
+        sprite = self.bars.get(key)
+        if sprite is None:
+            sprite = pygame.Surface((width, 3))
+            sprite.fill((255, 0, 0))
+            if fill:
+                sprite.fill((0, 255, 0), (0, 0, fill, 3))
+            sprite = self.bars[key] = prepare(sprite)
+        return sprite
+
+    def food_sprite(self):
+        if self.food is None:
+            sprite = pygame.Surface((9, 9), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, FOOD_COLOR, (4, 4), 4)
+            self.food = prepare(sprite)
+        return self.food
+
+    def prey_blits(self, blits, x, y, energy):
+        x, y = int(x), int(y)
+        blits.append((self.prey_sprite(energy), (x - 5, y - 5)))
+        blits.append((self.bar(20, energy, PREY_MAX_ENERGY), (x - 10, y - 15)))
+
+    def predator_blits(self, blits, x, y, vx, vy, energy):
+        blits.append((self.predator_sprite(energy, vx, vy), (int(x) - 13, int(y) - 13)))
+        blits.append((self.bar(24, energy, PREDATOR_MAX_ENERGY), (int(x) - 12, int(y) - 18)))
+
+    def food_blits(self, blits, x, y):
+        blits.append((self.food_sprite(), (int(x) - 4, int(y) - 4)))
@@ -1,95 +1,141 @@
+import time
+import numpy as np
 import pygame
-import random
 from config import *
-from agents import Prey, Predator, Food, Obstacle
-from visualizer import SimulationVisualizer
+from engine import create_engine
+from export import StreamingExporter, default_path
+from dashboard import LiveDashboard
+from render_cache import TextCache, SpriteCache
+from camera import Camera
+from heatmap import DensityHeatmap
+import checkpoint
+
+CULL_MARGIN = 40 #px de lume: cat poate intra in camera urma (10 pozitii) unui agent aflat in afara ei
+
+
+def visible_rows(pos, rect):
+    #randurile din array-ul de pozitii care cad in dreptunghiul (x0, y0, x1, y1); None = toate
+    if rect is None:
+        return np.arange(len(pos))
+    x0, y0, x1, y1 = rect
+    x, y = pos[:, 0], pos[:, 1]
+    return np.flatnonzero((x >= x0) & (x <= x1) & (y >= y0) & (y <= y1))
+
+
+def positions(entities):
+    #backend-ul objects: pozitiile unei liste de entitati, ca array (n, 2)
+    pos = np.empty((len(entities), 2))
+    pos[:, 0] = np.fromiter((entity.x for entity in entities), float, len(entities))
+    pos[:, 1] = np.fromiter((entity.y for entity in entities), float, len(entities))
+    return pos
+
 
 class Simulation:
+    #interfata pygame peste SimulationEngine: fereastra, input, desenare
     
-    def __init__(self):
+    def __init__(self, engine=None, export=True):
         pygame.init() #porniea motorului :))
-        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         pygame.display.set_caption("Predator-Prey Simulation")
         self.clock = pygame.time.Clock()
         self.font = pygame.font.SysFont(None, 22)
         self.big_font = pygame.font.SysFont(None, 32)
+        self.text_cache = TextCache(self.font)
+        self.big_text_cache = TextCache(self.big_font)
+        self.sprites = SpriteCache()
+        self._controls_panel = None
+        self._trail_points = np.zeros((0, TRAIL_LENGTH, 2))
         
-        #liste pt agenti
-        self.prey_list = []
-        self.predator_list = []
-        self.food_list = []
-        self.obstacles = []
+        #ce parte din lume se vede; se deseneaza doar ce intra in ea (vezi visible_rect)
+        self.camera = Camera(WINDOW_WIDTH, WINDOW_HEIGHT, WIDTH, HEIGHT)
         
-        #contoare pt statisitici
-        self.prey_births_this_frame = 0
-        self.predator_births_this_frame = 0
-        self.total_prey_births = 0
-        self.total_predator_births = 0
-        self.total_prey_deaths = 0
-        self.total_predator_deaths = 0
+        #nivel de detaliu: cu prea multi agenti vizibili, harta de densitate in loc de sprite-uri (tasta L)
+        self.heatmap = DensityHeatmap(WINDOW_WIDTH, WINDOW_HEIGHT, HEATMAP_CELL)
+        self.lod = LOD_RENDER
+        self.heatmap_on = False
         
-        #counter pentru spawn food
-        self.food_spawn_timer = 0
+        #toata starea simularii e in engine
+        self.engine = engine if engine is not None else create_engine(BACKEND, record_trails=True, seed=SEED)
+        if export and self.engine.exporter is None:
+            self.engine.attach_exporter(StreamingExporter(default_path(EXPORT_FORMAT), EXPORT_FORMAT, EXPORT_CHUNK))
         
-        # creez vizualizatorul pentru grafice
-        self.visualizer = SimulationVisualizer()
+        self.dashboard = LiveDashboard(max_fps=DASHBOARD_FPS, points=DASHBOARD_POINTS)
         
         self.running = True
         self.paused = False
         
-        self.reset_simulation()
-    
-    def reset_simulation(self): #ca un fel de nou joc
-        self.prey_list = [
-            Prey(random.randint(50, WIDTH-50), 
-                 random.randint(50, HEIGHT-50))
-            for _ in range(INITIAL_PREY)
-        ]
+        #viteza: cate tick-uri de simulare (de 1/FPS secunde) pe secunda reala
+        self.speed = SPEED_MULTIPLIERS[0]
+        self.adaptive = ADAPTIVE_RENDER
+        self.ticks = 0
+        self.ticks_per_second = 0
+        self._tps_start = time.perf_counter()
+        self._tps_ticks = 0
         
-        self.predator_list = [
-            Predator(random.randint(50, WIDTH-50), 
-                     random.randint(50, HEIGHT-50))
-            for _ in range(INITIAL_PREDATORS)
-        ]
-        
-        self.food_list = [
-            Food(random.randint(20, WIDTH-20), 
-                 random.randint(20, HEIGHT-20))
-            for _ in range(INITIAL_FOOD)
-        ]
-        
-        self.obstacles = [
-            Obstacle(random.randint(100, WIDTH-100), 
-                    random.randint(100, HEIGHT-100),
-                    random.randint(30, 60))
-            for _ in range(INITIAL_OBSTACLES)
-        ]
-        
-        self.total_prey_births = 0
-        self.total_predator_births = 0
-        self.total_prey_deaths = 0
-        self.total_predator_deaths = 0
-        
-        self.visualizer = SimulationVisualizer()
-        #Creez un visualizer nou (sterg istoricul vechi).
-
-        print("Simulation reset!")
+        #overlay-ul profiler-ului (tasta I); textul se reface de 2 ori pe secunda
+        self.show_profiler = self.engine.profiler.enabled
+        self._profile_lines = []
+        self._profile_time = 0.0
+    
+    def reset_simulation(self):
+        self.engine.reset_simulation()
+        self.dashboard.clear()
     
     def run(self):
-        while self.running:
-            self.clock.tick(FPS)
-            
-            self.handle_events() #verific input-ul
-            
-            if not self.paused:
-                self.update()
-            
-            self.render() #desenez totul pe ecran
+        #pas fix: simularea avanseaza cu tick-uri de 1/FPS secunde, independent de cate frame-uri se deseneaza
+        tick_time = 1.0 / FPS
+        accumulator = 0.0
+        last_time = time.perf_counter()
+        last_render = 0.0
+        try:
+            while self.running:
+                self.handle_events() #verific input-ul
+                
+                now = time.perf_counter()
+                elapsed = min(now - last_time, MAX_FRAME_TIME)
+                last_time = now
+                self.pan_camera(elapsed)
+                behind = False
+                
+                if self.paused:
+                    accumulator = 0.0
+                elif self.speed == 0:
+                    #viteza maxima: simulez cat tine un frame, apoi desenez
+                    deadline = now + tick_time
+                    self.update()
+                    while time.perf_counter() < deadline:
+                        self.update()
+                    behind = True
+                else:
+                    accumulator += elapsed * self.speed
+                    deadline = now + tick_time
+                    while accumulator >= tick_time:
+                        self.update()
+                        accumulator -= tick_time
+                        #modul adaptiv nu tine input-ul blocat mai mult de un frame
+                        if self.adaptive and time.perf_counter() >= deadline:
+                            break
+                    behind = accumulator >= tick_time
+                    accumulator = min(accumulator, MAX_FRAME_TIME * self.speed)
+                
+                now = time.perf_counter()
+                if self.adaptive and behind and now - last_render < 1.0 / MIN_RENDER_FPS:
+                    continue #sar peste render, evenimentele se citesc din nou imediat
+                
+                self.render() #desenez totul pe ecran
+                last_render = now
+                if self.speed != 0 or self.paused:
+                    self.clock.tick(FPS)
+        finally:
+            #datele s-au scris deja pe parcurs, aici doar golesc ultimul chunk
+            #(fara export, de ex. Simulation(export=False), nu e nimic de inchis)
+            if self.engine.exporter is not None:
+                self.engine.exporter.close()
+            self.dashboard.close()
         
         # La final, arată graficele
         print("\nGenerare grafice...")
-        self.visualizer.plot_graphs()
-        self.visualizer.save_data()
+        self.engine.visualizer.plot_graphs()
         
         pygame.quit()
     
@@ -98,6 +144,16 @@ class Simulation:
             if event.type == pygame.QUIT:
                 self.running = False
             
+            # Rotita = zoom in jurul cursorului
+            elif event.type == pygame.MOUSEWHEEL:
+                mx, my = pygame.mouse.get_pos()
+                self.camera.zoom_at(ZOOM_STEP ** event.y, mx, my)
+            
+            # Click dreapta / mijloc + drag = muta camera
+            elif event.type == pygame.MOUSEMOTION:
+                if event.buttons[1] or event.buttons[2]:
+                    self.camera.pan(-event.rel[0], -event.rel[1])
+            
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_SPACE:
                     self.paused = not self.paused
@@ -107,190 +163,353 @@ class Simulation:
                 elif event.key == pygame.K_r:
                     self.reset_simulation()
                 
-                # G = Show graphs 
+                # G = Graficele live (in alt proces, simularea nu se opreste)
                 elif event.key == pygame.K_g:
-                    print("Afișare grafice...")
-                    self.visualizer.plot_graphs()
+                    if self.dashboard.is_open():
+                        self.dashboard.close()
+                    else:
+                        print("Afișare grafice...")
+                        self.dashboard.open(self.engine.visualizer.history)
                 
                 # P = Add Prey
                 elif event.key == pygame.K_p:
-                    self.prey_list.append(
-                        Prey(random.randint(50, WIDTH-50), 
-                             random.randint(50, HEIGHT-50))
-                    )
+                    self.engine.add_prey()
                 
                 # O = Add Predator
                 elif event.key == pygame.K_o:
-                    self.predator_list.append(
-                        Predator(random.randint(50, WIDTH-50), 
-                                random.randint(50, HEIGHT-50))
-                    )
+                    self.engine.add_predator()
                 
                 # F = Add Food
                 elif event.key == pygame.K_f:
-                    for _ in range(5):  # Adaug 5 bucati
-                        self.food_list.append(
-                            Food(random.randint(20, WIDTH-20), 
-                                random.randint(20, HEIGHT-20))
-                        )
+                    self.engine.add_food(5)  # Adaug 5 bucati
                 
                 # B = Add Obstacle
                 elif event.key == pygame.K_b:
-                    mx, my = pygame.mouse.get_pos()
-                    self.obstacles.append(Obstacle(mx, my, random.randint(30, 60)))
+                    mx, my = self.camera.to_world(*pygame.mouse.get_pos())
+                    self.engine.add_obstacle(int(mx), int(my))
                 
                 # C = Clear Obstacles
                 elif event.key == pygame.K_c:
-                    self.obstacles.clear()
+                    self.engine.clear_obstacles()
+                
+                # Z = Toata lumea in fereastra / inapoi la 1:1
+                elif event.key == pygame.K_z:
+                    self.camera.toggle_fit()
+                
+                # L = Harta de densitate automata / mereu sprite-uri
+                elif event.key == pygame.K_l:
+                    self.lod = not self.lod
+                    print(f"Heatmap LOD: {'AUTO' if self.lod else 'OFF'}")
+                
+                # F5 / F9 = Salveaza / incarca starea completa (checkpoint)
+                elif event.key == pygame.K_F5:
+                    checkpoint.save(self.engine, CHECKPOINT_FILE)
+                    print(f"Checkpoint salvat în {CHECKPOINT_FILE}")
+                
+                elif event.key == pygame.K_F9:
+                    self.load_checkpoint()
+                
+                # 1-4 = Viteza simularii (1x, 4x, 16x, max)
+                elif pygame.K_1 <= event.key < pygame.K_1 + len(SPEED_MULTIPLIERS):
+                    self.speed = SPEED_MULTIPLIERS[event.key - pygame.K_1]
+                    print(f"Viteza: {self.speed_label()}")
+                
+                # A = Render adaptiv (sare peste frame-uri cand simularea nu tine pasul)
+                elif event.key == pygame.K_a:
+                    self.adaptive = not self.adaptive
+                    print(f"Render adaptiv: {'ON' if self.adaptive else 'OFF'}")
+                
+                # I = Profiler pe faze (masoara doar cat timp e afisat)
+                elif event.key == pygame.K_i:
+                    self.show_profiler = not self.show_profiler
+                    self.engine.profiler.enabled = self.show_profiler
+                    if self.show_profiler:
+                        self.engine.profiler.reset()
+                        self._profile_lines = []
+    
+    def load_checkpoint(self):
+        try:
+            checkpoint.load(CHECKPOINT_FILE, self.engine)
+        except (OSError, ValueError) as exc: #fisier lipsa sau pentru alta lume/backend: simularea continua
+            print(f"Checkpoint-ul nu s-a putut incarca: {exc}")
+            return
+        self.dashboard.reload(self.engine.visualizer.history)
+        print(f"Checkpoint incarcat din {CHECKPOINT_FILE}")
+    
+    def pan_camera(self, elapsed):
+        #sagetile muta camera continuu, cat timp sunt tinute apasate
+        keys = pygame.key.get_pressed()
+        dx = keys[pygame.K_RIGHT] - keys[pygame.K_LEFT]
+        dy = keys[pygame.K_DOWN] - keys[pygame.K_UP]
+        if dx or dy:
+            step = CAMERA_PAN_SPEED * elapsed
+            self.camera.pan(dx * step, dy * step)
     
     def update(self):
-        self.prey_births_this_frame = 0
-        self.predator_births_this_frame = 0
+        self.engine.update()
+        if self.dashboard.is_open(): #cu graficele inchise nu mai citesc randul din istoric
+            self.dashboard.push(self.engine.visualizer.history.last())
+        self.ticks += 1
         
-        self.update_prey()
+        #tick-uri pe secunda, masurate o data pe secunda
+        self._tps_ticks += 1
+        now = time.perf_counter()
+        if now - self._tps_start >= 1.0:
+            self.ticks_per_second = round(self._tps_ticks / (now - self._tps_start))
+            self._tps_start = now
+            self._tps_ticks = 0
+    
+    def speed_label(self):
+        return "max" if self.speed == 0 else f"{self.speed}x"
+    
+    def render(self):
+        engine = self.engine
+        profiler = engine.profiler
+        profiler.start('render')
+        rect = self.visible_rect()
+        food, prey, predators = self.visible_entities(rect)
         
-        self.update_predators()
+        #cu prea multi agenti in camera, harta de densitate inlocuieste fundalul, urmele si sprite-urile
+        heatmap = self.use_heatmap(len(prey) + len(predators))
+        if heatmap:
+            self.draw_heatmap(food, prey, predators)
+        else:
+            self.screen.fill(BACKGROUND_COLOR)
         
-        self.spawn_food()
+        self.draw_world_border()
+        self.draw_obstacles(rect)
         
-        #salvez datele pentru grafice, in visualizator
-        #trimit listele curente si nasterile din frame-ul asta
-        self.visualizer.update_history(
-            self.prey_list,
-            self.predator_list,
-            self.food_list,
-            self.prey_births_this_frame,
-            self.predator_births_this_frame
-        )
+        if not heatmap:
+            self.draw_sprites(food, prey, predators)
+        profiler.stop('render')
+        
+        profiler.start('draw_ui')
+        self.draw_ui()
+        profiler.stop('draw_ui')
+        
+        profiler.start('flip')
+        pygame.display.flip()
+        profiler.stop('flip')
     
-    def update_prey(self):
-        for prey in self.prey_list[:]: #parcurg o copie a listei
-            prey.update(self.predator_list, self.prey_list, 
-                       self.food_list, self.obstacles)
+    def visible_entities(self, rect):
+        #(mancare, prazi, pradatori) care intra in camera
+        #backend-ul objects: liste de obiecte, din celulele grilelor atinse de camera, tot in ordinea listelor
+        #numpy/tiles: randurile din array-uri
+        engine = self.engine
+        if engine.backend in ("numpy", "tiles"):
+            return (visible_rows(engine.food, rect),
+                    visible_rows(engine.prey.pos[:engine.prey.count], rect),
+                    visible_rows(engine.predators.pos[:engine.predators.count], rect))
+        if rect is None:
+            return engine.food_list, engine.prey_list, engine.predator_list
+        return (engine.food_grid.in_rect(*rect),
+                engine.prey_grid.in_rect(*rect),
+                engine.predator_grid.in_rect(*rect))
+    
+    def use_heatmap(self, visible):
+        #peste LOD_MAX_SPRITES agenti vizibili sau sub LOD_MIN_ZOOM -> harta de densitate
+        #inapoi la sprite-uri abia sub 80% din prag, ca imaginea sa nu palpaie cand populatia e chiar la limita
+        if not self.lod:
+            self.heatmap_on = False
+        else:
+            limit = LOD_MAX_SPRITES * 0.8 if self.heatmap_on else LOD_MAX_SPRITES
+            self.heatmap_on = visible > limit or self.camera.zoom < LOD_MIN_ZOOM
+        return self.heatmap_on
+    
+    def draw_heatmap(self, food, prey, predators):
+        engine = self.engine
+        if engine.backend in ("numpy", "tiles"):
+            food = engine.food[food]
+            prey = engine.prey.pos[prey]
+            predators = engine.predators.pos[predators]
+        else:
+            food, prey, predators = positions(food), positions(prey), positions(predators)
+        self.heatmap.draw(self.screen, self.camera,
+                          [(food, FOOD_COLOR), (prey, PREY_COLOR), (predators, PREDATOR_COLOR)])
+    
+    def draw_sprites(self, food, prey, predators):
+        engine = self.engine
+        screen = self.screen
+        sprites = self.sprites
+        camera = self.camera
+        
+        #toate sprite-urile intr-o singura lista, desenate cu un singur blits()
+        blits = []
+        if engine.backend in ("numpy", "tiles"):
+            self.draw_array_trails(prey, predators)
+            self.collect_array_blits(blits, food, prey, predators)
+        else:
+            ox, oy, zoom = camera.x, camera.y, camera.zoom
             
-            if not prey.is_alive():
-                self.prey_list.remove(prey)
-                self.total_prey_deaths += 1
-                continue
+            for item in food:
+                sprites.food_blits(blits, (item.x - ox) * zoom, (item.y - oy) * zoom)
             
-            for food in self.food_list[:]:
-                if prey.position.distance_to(food.position) < 10:
-                    prey.eat_food(food)
-                    self.food_list.remove(food)
-                    break
+            #toate urmele intr-o trecere, direct din buffer-ele ring ale agentilor
+            for agent in prey:
+                if agent.trail_count > 1:
+                    self.draw_trail(agent.color, agent.trail_points())
+            for agent in predators:
+                if agent.trail_count > 1:
+                    self.draw_trail(agent.color, agent.trail_points())
             
-            if prey.can_reproduce():
-                for other in self.prey_list:
-                    if other == prey:
-                        continue
-                    if (other.can_reproduce() and 
-                        prey.position.distance_to(other.position) < 30):
-                        baby = prey.reproduce()
-                        other.reproduction_cooldown = PREY_REPRODUCTION_COOLDOWN
-                        self.prey_list.append(baby)
-                        self.prey_births_this_frame += 1
-                        self.total_prey_births += 1
-                        break
-    
-    def update_predators(self):
-        for predator in self.predator_list[:]:
-            predator.update(self.prey_list, self.predator_list, self.obstacles)
+            for agent in prey:
+                sprites.prey_blits(blits, (agent.x - ox) * zoom, (agent.y - oy) * zoom, agent.energy)
             
-            if not predator.is_alive():
-                self.predator_list.remove(predator)
-                self.total_predator_deaths += 1
+            for agent in predators:
+                sprites.predator_blits(blits, (agent.x - ox) * zoom, (agent.y - oy) * zoom,
+                                       agent.vx, agent.vy, agent.energy)
+        screen.blits(blits, doreturn=False)
+    
+    def visible_rect(self):
+        #ce parte din lume se deseneaza: camera, plus cat pot intra in ea sprite-urile (~20 px
+        #de ecran) si urmele (CULL_MARGIN px de lume) entitatilor aflate chiar in afara ei
+        #None = se vede toata lumea, deci nu are rost sa filtrez
+        camera = self.camera
+        x0, y0, x1, y1 = rect = camera.visible(CULL_MARGIN + 20 / camera.zoom)
+        if x0 <= 0 and y0 <= 0 and x1 >= WIDTH and y1 >= HEIGHT:
+            return None
+        return rect
+    
+    def draw_world_border(self):
+        #cand lumea nu e cat fereastra, marginile ei se vad (la zoom out sau la capatul camerei)
+        if (WIDTH, HEIGHT) == (WINDOW_WIDTH, WINDOW_HEIGHT):
+            return
+        x0, y0 = self.camera.to_screen(0, 0)
+        x1, y1 = self.camera.to_screen(WIDTH, HEIGHT)
+        pygame.draw.rect(self.screen, OBSTACLE_COLOR, (x0, y0, x1 - x0, y1 - y0), 1)
+    
+    def draw_obstacles(self, rect):
+        x0, y0, x1, y1 = rect or (-np.inf, -np.inf, np.inf, np.inf)
+        camera = self.camera
+        for obstacle in self.engine.obstacles:
+            x, y = obstacle.position
+            radius = obstacle.radius
+            if x + radius < x0 or x - radius > x1 or y + radius < y0 or y - radius > y1:
                 continue
-            
-            for prey in self.prey_list[:]:
-                if predator.position.distance_to(prey.position) < 8:
-                    predator.eat_prey(prey)
-                    self.prey_list.remove(prey)
-                    self.total_prey_deaths += 1
-                    break
-            
-            if predator.can_reproduce():
-                for other in self.predator_list:
-                    if other == predator:
-                        continue
-                    if (other.can_reproduce() and 
-                        predator.position.distance_to(other.position) < 40):
-                        baby = predator.reproduce()
-                        other.reproduction_cooldown = PREDATOR_REPRODUCTION_COOLDOWN
-                        self.predator_list.append(baby)
-                        self.predator_births_this_frame += 1
-                        self.total_predator_births += 1
-                        break
+            sx, sy = camera.to_screen(x, y)
+            pygame.draw.circle(self.screen, OBSTACLE_COLOR, (int(sx), int(sy)),
+                               max(1, int(radius * camera.zoom)), 2)  # 2 = grosime contur
     
-    def spawn_food(self):
-        self.food_spawn_timer += 1
-        if (self.food_spawn_timer >= FOOD_SPAWN_INTERVAL and 
-            len(self.food_list) < MAX_FOOD):
-            self.food_list.append(
-                Food(random.randint(20, WIDTH-20), 
-                     random.randint(20, HEIGHT-20))
-            )
-            self.food_spawn_timer = 0
+    def draw_trail(self, color, points):
+        pygame.draw.lines(self.screen, color, False, self.camera.transform(points), 1)
     
-    def render(self):
-        self.screen.fill(BACKGROUND_COLOR)
-        
-        for obstacle in self.obstacles:
-            obstacle.draw(self.screen)
-        
-        for food in self.food_list:
-            food.draw(self.screen)
-        
-        for prey in self.prey_list:
-            prey.draw(self.screen)
+    def draw_array_trails(self, prey_rows, predator_rows):
+        #urmele vizibile ale unei specii se copiaza si se trec pe ecran toate odata, intr-un buffer
+        #refolosit de la un frame la altul; fiecare linie e un view in el, fara liste per agent
+        camera = self.camera
+        for species, rows, color in ((self.engine.prey, prey_rows, PREY_COLOR), 
+                                     (self.engine.predators, predator_rows, PREDATOR_COLOR)):
+            counts = species.trail_count[rows]
+            rows = rows[counts > 1]
+            if len(rows) == 0:
+                continue
+            points = self.trail_buffer(len(rows))
+            np.take(species.trail_window(), rows, axis=0, out=points)
+            points -= (camera.x, camera.y)
+            points *= camera.zoom
+            for line, count in zip(points, counts[counts > 1].tolist()):
+                pygame.draw.lines(self.screen, color, False, line[TRAIL_LENGTH - count:], 1)
+    
+    def trail_buffer(self, rows):
+        #buffer-ul pentru draw_array_trails, marit doar cand apar mai multe urme vizibile
+        if len(self._trail_points) < rows:
+            self._trail_points = np.zeros((max(rows, 2 * len(self._trail_points)), TRAIL_LENGTH, 2))
+        return self._trail_points[:rows]
+    
+    def collect_array_blits(self, blits, food_rows, prey_rows, predator_rows):
+        #backend-ul numpy: aceleasi sprite-uri, citite direct din array-uri (doar randurile vizibile)
+        engine = self.engine
+        sprites = self.sprites
+        camera = self.camera
+        origin = (camera.x, camera.y)
         
-        for predator in self.predator_list:
-            predator.draw(self.screen)
+        for x, y in ((engine.food[food_rows] - origin) * camera.zoom).tolist():
+            sprites.food_blits(blits, x, y)
         
-        self.draw_ui()
+        prey = engine.prey
+        for (x, y), energy in zip(((prey.pos[prey_rows] - origin) * camera.zoom).tolist(),
+                                  prey.energy[prey_rows].tolist()):
+            sprites.prey_blits(blits, x, y, energy)
         
-        pygame.display.flip()
+        predators = engine.predators
+        rows = predator_rows
+        for (x, y), (vx, vy), energy in zip(((predators.pos[rows] - origin) * camera.zoom).tolist(), 
+                                             predators.vel[rows].tolist(),
+                                             predators.energy[rows].tolist()):
+            sprites.predator_blits(blits, x, y, vx, vy, energy)
     
     def draw_ui(self): #desenez textul cu statistici si controale
+        engine = self.engine
+        text = self.text_cache
+        prey_count, predator_count, food_count = engine.population()
         stats = [
-            f"Prey: {len(self.prey_list)}",
-            f"Predators: {len(self.predator_list)}",
-            f"Food: {len(self.food_list)}",
+            f"Prey: {prey_count}",
+            f"Predators: {predator_count}",
+            f"Food: {food_count}",
             f"",
             f"Total Births:",
-            f"  Prey: {self.total_prey_births}",
-            f"  Pred: {self.total_predator_births}",
+            f"  Prey: {engine.total_prey_births}",
+            f"  Pred: {engine.total_predator_births}",
             f"",
             f"Total Deaths:",
-            f"  Prey: {self.total_prey_deaths}",
-            f"  Pred: {self.total_predator_deaths}",
+            f"  Prey: {engine.total_prey_deaths}",
+            f"  Pred: {engine.total_predator_deaths}",
+            f"",
+            f"Speed: {self.speed_label()} ({self.ticks_per_second} ticks/s)",
+            f"Adaptive: {'ON' if self.adaptive else 'OFF'}",
+            f"View: {'heatmap' if self.heatmap_on else 'sprites'}",
         ]
         
-        y = 10
-        for stat in stats:
-            text = self.font.render(stat, True, TEXT_COLOR)
-            self.screen.blit(text, (10, y))
-            y += 22
+        #textele se randeaza doar cand se schimba, restul vin din cache
+        self.screen.blits([(text.render(stat, TEXT_COLOR), (10, 10 + 22 * i))
+                           for i, stat in enumerate(stats)], doreturn=False)
         
-        controls = [
-            "CONTROLS:",
-            "SPACE - Pause/Resume",
-            "R - Reset",
-            "G - Show Graphs",
-            "",
-            "P - Add Prey",
-            "O - Add Predator",
-            "F - Add Food (+5)",
-            "B - Add Obstacle (at mouse)",
-            "C - Clear Obstacles"
-        ]
+        self.screen.blit(self.controls_panel(), (WINDOW_WIDTH - 250, 10))
         
-        y = 10
-        for control in controls:
-            text = self.font.render(control, True, TEXT_COLOR)
-            self.screen.blit(text, (WIDTH - 250, y))
-            y += 22
+        if self.show_profiler:
+            self.draw_profiler()
         
         if self.paused:
-            pause_text = self.big_font.render("  PAUSED", True, (255, 255, 0))
-            rect = pause_text.get_rect(center=(WIDTH//2, 50))
-            self.screen.blit(pause_text, rect)
\ No newline at end of file
+            pause_text = self.big_text_cache.render("  PAUSED", (255, 255, 0))
+            rect = pause_text.get_rect(center=(WINDOW_WIDTH//2, 50))
+            self.screen.blit(pause_text, rect)
+    
+    def draw_profiler(self):
+        now = time.perf_counter()
+        if now - self._profile_time >= 0.5:
+            self._profile_lines = self.engine.profiler.overlay_lines()
+            self._profile_time = now
+        text = self.text_cache
+        top = WINDOW_HEIGHT - 10 - 22 * len(self._profile_lines)
+        self.screen.blits([(text.render(line, TEXT_COLOR), (10, top + 22 * i))
+                           for i, line in enumerate(self._profile_lines)], doreturn=False)
+    
+    def controls_panel(self):
+        #lista de controale nu se schimba: o randez o singura data intr-o suprafata
+        if self._controls_panel is None:
+            controls = [
+                "CONTROLS:",
+                "SPACE - Pause/Resume",
+                "R - Reset",
+                "G - Live Graphs (on/off)",
+                "",
+                "P - Add Prey",
+                "O - Add Predator",
+                "F - Add Food (+5)",
+                "B - Add Obstacle (at mouse)",
+                "C - Clear Obstacles",
+                "F5/F9 - Save/Load checkpoint",
+                "",
+                "Arrows / right drag - Move camera",
+                "Wheel - Zoom, Z - Whole world/1:1",
+                "L - Heatmap LOD (auto/off)",
+                "",
+                "1-4 - Speed (1x/4x/16x/max)",
+                "A - Adaptive Render (on/off)",
+                "I - Profiler (on/off)"
+            ]
+            panel = pygame.Surface((250, 22 * len(controls)), pygame.SRCALPHA)
+            for i, control in enumerate(controls):
+                panel.blit(self.font.render(control, True, TEXT_COLOR), (0, 22 * i))
+            self._controls_panel = panel
+        return self._controls_panel
\ No newline at end of file
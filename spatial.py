@@ -0,0 +1,251 @@
+import math
+from operator import itemgetter
+
+import numpy as np
+
+from pool import handle, resolve
+
+
+class SpatialGrid:
+    # grila uniforma: fiecare celula tine entitatile din ea
+    # ordinea de inserare (seq) = ordinea din lista, ca rezultatele sa fie identice cu brute force
+
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.entries = {}  # entitate -> (celula, seq)
+        self.next_seq = 0
+        self.checks = 0  # cati candidati au intors cautarile (pentru profiler)
+
+    def cell_of(self, x, y):
+        return (math.floor(x / self.cell_size),
+                math.floor(y / self.cell_size))
+
+    def rebuild(self, entities):
+        self.cells = {}
+        self.entries = {}
+        self.next_seq = 0
+        for entity in entities:
+            self.insert(entity)
+
+    def insert(self, entity):
+        cell = self.cell_of(entity.x, entity.y)
+        seq = self.next_seq
+        self.next_seq += 1
+        self.cells.setdefault(cell, {})[entity] = seq
+        self.entries[entity] = (cell, seq)
+
+    def remove(self, entity):
+        entry = self.entries.pop(entity, None)
+        if entry is None:
+            return
+        cell, _ = entry
+        bucket = self.cells[cell]
+        del bucket[entity]
+        if not bucket:
+            del self.cells[cell]
+
+    def move(self, entity):
+        # apelat dupa ce entitatea si-a schimbat pozitia
+        cell, seq = self.entries[entity]
+        new_cell = self.cell_of(entity.x, entity.y)
+        if new_cell == cell:
+            return
+        bucket = self.cells[cell]
+        del bucket[entity]
+        if not bucket:
+            del self.cells[cell]
+        self.cells.setdefault(new_cell, {})[entity] = seq
+        self.entries[entity] = (new_cell, seq)
+
+    def nearby(self, x, y, radius):
+        # candidatii din celulele atinse de cercul (x, y, radius), in ordinea listei
+        # distanta exacta o verifica apelantul
+        size = self.cell_size
+        min_cx = math.floor((x - radius) / size)
+        max_cx = math.floor((x + radius) / size)
+        min_cy = math.floor((y - radius) / size)
+        max_cy = math.floor((y + radius) / size)
+
+        found = []
+        cells = self.cells
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.extend(bucket.items())
+
+        found.sort(key=itemgetter(1))
+        self.checks += len(found)
+        return [entity for entity, _ in found]
+
+    def in_rect(self, x0, y0, x1, y1):
+        # entitatile din celulele atinse de dreptunghi, in ordinea listei (pentru desenare)
+        # cu mai multe celule in dreptunghi decat ocupate, trec doar prin cele ocupate
+        size = self.cell_size
+        min_cx = math.floor(x0 / size)
+        max_cx = math.floor(x1 / size)
+        min_cy = math.floor(y0 / size)
+        max_cy = math.floor(y1 / size)
+
+        found = []
+        cells = self.cells
+        if (max_cx - min_cx + 1) * (max_cy - min_cy + 1) > len(cells):
+            for (cx, cy), bucket in cells.items():
+                if min_cx <= cx <= max_cx and min_cy <= cy <= max_cy:
+                    found.extend(bucket.items())
+        else:
+            for cx in range(min_cx, max_cx + 1):
+                for cy in range(min_cy, max_cy + 1):
+                    bucket = cells.get((cx, cy))
+                    if bucket:
+                        found.extend(bucket.items())
+
+        found.sort(key=itemgetter(1))
+        return [entity for entity, _ in found]
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class EligibleGrid(SpatialGrid):
+    # subset dintr-o grila: doar entitatile care trec de `eligible` (ex. pot face pui)
+    # seq-ul e luat din grila completa, deci cautarile intorc tot ordinea listei
+    # apelantul cheama update() dupa fiecare schimbare care poate muta o entitate inauntru/afara
+
+    def __init__(self, grid, eligible):
+        super().__init__(grid.cell_size)
+        self.grid = grid
+        self.eligible = eligible
+
+    def rebuild(self, entities):
+        # dupa rebuild-ul grilei complete, ca seq-urile sa fie cele noi
+        self.cells = {}
+        self.entries = {}
+        for entity in entities:
+            if self.eligible(entity):
+                self.insert(entity)
+
+    def insert(self, entity):
+        cell = self.cell_of(entity.x, entity.y)
+        seq = self.grid.entries[entity][1]
+        self.cells.setdefault(cell, {})[entity] = seq
+        self.entries[entity] = (cell, seq)
+
+    def update(self, entity):
+        if entity.removed or not self.eligible(entity):
+            self.remove(entity)
+        elif entity in self.entries:
+            self.move(entity)
+        else:
+            self.insert(entity)
+
+
+class VerletLists:
+    # per agent (owner): candidatii din grila pe o raza + skin, tinuti minte intre tick-uri
+    # cat timp fiecare entitate s-a miscat cel mult skin/2 de la reconstructie, doua entitati s-au
+    # apropiat cu cel mult skin, deci orice vecin aflat acum in `radius` e deja in lista
+    # distanta exacta o verifica tot apelantul; listele pastreaza ordinea grilei (= ordinea listei)
+    # nasterile se adauga la coada listelor (add); mortile raman, marcate removed, pana la
+    # reconstructie (de aceea engine-ul le refoloseste din pool doar dupa aceea, vezi fresh)
+
+    def __init__(self, grid, owner_grid, radius, skin):
+        self.grid = grid  # tintele
+        self.owner_grid = owner_grid  # cei care cauta, pentru add
+        self.radius = radius
+        self.skin = skin
+        self.lists = {}  # owner -> (handle(owner), candidati, x, y la reconstructie)
+        self.valid = False
+        self.moved = 0.0  # deplasarea maxima posibila de la ultima reconstructie
+        self.step = 0.0
+        self.covered = radius  # pana la ce raza listele contin sigur tot (vezi refresh)
+        self.checks = 0
+
+    def invalidate(self):
+        self.valid = False
+
+    def fresh(self):
+        # nu contine entitati scoase inainte de tick-ul curent: invalida sau tocmai refacuta
+        return not self.valid or self.moved <= self.step
+
+    def refresh(self, owners, targets, step):
+        # la inceputul tick-ului; `step` = cat se poate misca o entitate in tick-ul care urmeaza
+        if not self.valid or self.moved + step >= self.skin / 2:
+            self.rebuild(owners, targets)
+        self.moved += step
+        self.step = step
+        # owner-ul si tinta s-au indepartat fiecare cel mult `moved` de ancora
+        self.covered = self.radius + self.skin - 2 * self.moved
+
+    def rebuild(self, owners, targets):
+        # `targets` = entitatile din grila, in ordinea listei; perechile vin vectorizat
+        # (acelasi binning ca la backend-ul numpy), nu cu cate o cautare in grila pe agent
+        from vectorized import neighbor_pairs
+
+        i, j, _ = neighbor_pairs(positions(owners), positions(targets), self.radius + self.skin)
+        order = np.argsort(i * len(targets) + j, kind='stable')  # dupa owner, apoi ordinea listei
+        ends = np.cumsum(np.bincount(i, minlength=len(owners))).tolist()
+        table = np.empty(len(targets), dtype=object)
+        table[:] = targets
+        near = table[j[order]].tolist()
+
+        lists = {}
+        start = 0
+        for owner, end in zip(owners, ends):
+            lists[owner] = (handle(owner), near[start:end], owner.x, owner.y)
+            start = end
+        self.lists = lists
+        self.valid = True
+        self.moved = 0.0
+
+    def resume(self, owners, targets, moved):
+        # dupa un checkpoint: liste noi din pozitiile de acum, dar cu deplasarea din rularea salvata,
+        # ca reconstructiile (si raza acoperita) sa cada la aceleasi tick-uri ca acolo
+        # `moved` supraestimeaza deplasarea reala de la reconstructie (0), deci listele raman complete
+        self.rebuild(owners, targets)
+        self.moved = moved
+
+    def add(self, entity):
+        # entitate noua (cea mai noua din lista ei, deci merge la coada): intra la toti ownerii
+        # a caror ancora (pozitia la reconstructie) e in raza + skin, ca la o reconstructie
+        # ownerii s-au miscat cel mult `moved` de la ancora, deci ii caut in grila pe raza extinsa
+        if not self.valid:
+            return
+        x, y = entity.x, entity.y
+        reach = self.radius + self.skin
+        limit = reach * reach
+        for owner in self.owner_grid.nearby(x, y, reach + self.moved):
+            entry = self.lists.get(owner)
+            if entry is None or resolve(entry[0]) is None:
+                continue
+            dx = entry[2] - x
+            dy = entry[3] - y
+            if dx * dx + dy * dy < limit:
+                entry[1].append(entity)
+
+    def around(self, owner, x, y, radius):
+        entry = self.lists.get(owner) if self.valid and radius <= self.covered else None
+        if entry is None or resolve(entry[0]) is None:
+            # agent nou (sau refolosit din pool) ori liste invalidate: cautare normala in grila
+            return self.grid.nearby(x, y, radius)
+        self.checks += len(entry[1])
+        return entry[1]
+
+    def __len__(self):
+        return len(self.grid)
+
+
+def positions(entities):
+    if not entities:
+        return np.zeros((0, 2))
+    return np.array([(entity.x, entity.y) for entity in entities])
+
+
+def candidates(entities, x, y, radius, owner=None):
+    # lista simpla -> brute force, grila -> doar vecinii din celulele apropiate,
+    # liste Verlet -> candidatii tinuti minte pentru `owner`
+    if isinstance(entities, SpatialGrid):
+        return entities.nearby(x, y, radius)
+    if isinstance(entities, VerletLists):
+        return entities.around(owner, x, y, radius)
+    return entities
@@ -0,0 +1,146 @@
+import argparse
+import csv
+import itertools
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import config
+from history import COLUMN_NAMES as HISTORY_COLUMNS
+
+#modulele care fac "from config import *" si au deci copii proprii ale constantelor
+#cele care nu sunt inca importate iau oricum valorile noi din config, la import
+CONFIG_MODULES = ('config', 'agents', 'engine', 'vectorized', 'kernels', 'visualizer', 'export',
+                  'simulation', 'camera', 'render_cache', 'heatmap', 'checkpoint')
+
+_defaults = {}
+
+
+def set_constant(name, value):
+    for module_name in CONFIG_MODULES:
+        module = sys.modules.get(module_name)
+        if module is not None and hasattr(module, name):
+            setattr(module, name, value)
+
+
+def apply_parameters(params):
+    #suprascriu constantele din config in procesul curent; ce a ramas de la rularea anterioara se reface
+    import agents, engine, vectorized, kernels  # ca sa existe in sys.modules
+    for name, value in _defaults.items():
+        set_constant(name, value)
+    for name, value in params.items():
+        if not hasattr(config, name):
+            raise ValueError(f"Parametru necunoscut in config.py: {name}")
+        _defaults.setdefault(name, getattr(config, name))
+        set_constant(name, value)
+
+
+def parameter_grid(values):
+    #{'A': [1, 2], 'B': [3]} -> [{'A': 1, 'B': 3}, {'A': 2, 'B': 3}]
+    names = list(values)
+    return [dict(zip(names, combo)) for combo in itertools.product(*(values[n] for n in names))]
+
+
+def random_design(ranges, samples, seed=0):
+    #esantionare uniforma in intervale; intervalele cu capete int dau valori int
+    rng = random.Random(seed)
+    design = []
+    for _ in range(samples):
+        params = {}
+        for name, (low, high) in ranges.items():
+            if isinstance(low, int) and isinstance(high, int):
+                params[name] = rng.randint(low, high)
+            else:
+                params[name] = rng.uniform(low, high)
+        design.append(params)
+    return design
+
+
+def run_one(task):
+    #o rulare headless; se opreste cand dispare una din specii
+    #cu `start`, rularea continua dintr-un checkpoint (istoricul lui e inclus), cu seed-ul ei
+    run_id, params, seed, frames, backend, start = task
+    apply_parameters(params)
+
+    from engine import create_engine
+    engine = create_engine(backend, seed=seed)
+    if start:
+        import checkpoint
+        checkpoint.load(start, engine, seed=seed)
+    for _ in range(frames):
+        engine.update()
+        prey_count, predator_count, _ = engine.population()
+        if prey_count == 0 or predator_count == 0:
+            break
+
+    history = engine.visualizer.history
+    columns = [history[name].tolist() for name in HISTORY_COLUMNS]
+    return run_id, seed, params, list(zip(*columns))
+
+
+def run_sweep(design, replicates=1, frames=5000, backend=config.BACKEND,
+              workers=None, base_seed=0, out='sweep_results.csv', start=None):
+    tasks = []
+    for point, params in enumerate(design):
+        for replicate in range(replicates):
+            run_id = point * replicates + replicate
+            tasks.append((run_id, params, base_seed + run_id, frames, backend, start))
+
+    param_names = sorted({name for params in design for name in params})
+    with open(out, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['run', 'seed'] + param_names + HISTORY_COLUMNS)
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for run_id, seed, params, rows in pool.map(run_one, tasks):
+                prefix = [run_id, seed] + [params.get(name, '') for name in param_names]
+                writer.writerows(prefix + list(row) for row in rows)
+                print(f"run {run_id}: {len(rows)} frame-uri, {params}")
+
+    print(f"Rezultate salvate în {out}")
+    return out
+
+
+def parse_value(text):
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sweep de parametri din config.py, rulari headless in paralel")
+    parser.add_argument("--grid", action="append", default=[], metavar="NAME=v1,v2,...",
+                        help="valori pentru grila (produs cartezian)")
+    parser.add_argument("--random", action="append", default=[], metavar="NAME=low:high",
+                        help="interval pentru design aleator")
+    parser.add_argument("--samples", type=int, default=10, help="puncte in designul aleator")
+    parser.add_argument("--replicates", type=int, default=1)
+    parser.add_argument("--frames", type=int, default=5000)
+    parser.add_argument("--backend", choices=["objects", "numpy", "tiles"], default=config.BACKEND)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="sweep_results.csv")
+    parser.add_argument("--start", default=None,
+                        help="checkpoint din care porneste fiecare rulare (ex. un echilibru deja atins)")
+    args = parser.parse_args()
+
+    if args.grid and args.random:
+        parser.error("--grid si --random nu se pot combina")
+
+    if args.random:
+        ranges = {}
+        for item in args.random:
+            name, bounds = item.split("=")
+            low, high = bounds.split(":")
+            ranges[name] = (parse_value(low), parse_value(high))
+        design = random_design(ranges, args.samples, args.seed)
+    else:
+        values = {}
+        for item in args.grid:
+            name, options = item.split("=")
+            values[name] = [parse_value(v) for v in options.split(",")]
+        design = parameter_grid(values)
+
+    run_sweep(design, args.replicates, args.frames, args.backend,
+              args.workers, args.seed, args.out, args.start)
@@ -0,0 +1,56 @@
+import random
+
+import pygame
+
+from agents import Agent, Prey, Predator
+from config import *
+
+
+def test_agent_keeps_the_old_constructor():
+    agent = Agent(10, 20, 2.5, (1, 2, 3), random.Random(0))
+    assert (agent.x, agent.y, agent.speed, agent.color) == (10, 20, 2.5, (1, 2, 3))
+    assert abs(agent.velocity.length() - 1) < 1e-12
+
+
+def test_position_and_velocity_write_back():
+    prey = Prey(100, 100, random.Random(0))
+    prey.position.x = 5
+    prey.position[1] += 7
+    prey.position += (1, 1)
+    assert (prey.x, prey.y) == (6, 108)
+
+    prey.velocity.update(1, 0)
+    prey.velocity.x *= -1
+    prey.velocity.rotate_ip(90)
+    assert prey.velocity.distance_to((0, -1)) < 1e-12
+
+    moved = prey.position + pygame.math.Vector2(10, 0) #vectorii calculati nu sunt legati de agent
+    moved.x = 0
+    assert (prey.x, prey.y) == (6, 108)
+
+
+def test_trail_is_a_live_view():
+    predator = Predator(0, 0, random.Random(0))
+    for x in range(TRAIL_LENGTH + 3):
+        predator.x = x
+        predator.record_trail()
+    assert [point.x for point in predator.trail] == list(range(3, TRAIL_LENGTH + 3))
+
+    predator.trail.pop(0)
+    predator.trail.append(pygame.math.Vector2(-1, -1))
+    assert len(predator.trail) == TRAIL_LENGTH
+    assert predator.trail[0].x == 4 and predator.trail[-1] == (-1, -1)
+
+    predator.trail.clear()
+    assert len(predator.trail) == 0 and predator.trail_points() == []
+
+
+def test_max_trail_is_per_instance():
+    short, other = Prey(0, 0, random.Random(0)), Prey(0, 0, random.Random(1))
+    short.max_trail = 3
+    for x in range(5):
+        short.x = other.x = x
+        short.record_trail()
+        other.record_trail()
+    assert [point.x for point in short.trail] == [2, 3, 4]
+    assert len(other.trail) == 5 and other.max_trail == TRAIL_LENGTH
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+import checkpoint
+from engine import create_engine
+from export import StreamingExporter, load_binary
+from history import COLUMN_NAMES
+
+
+def assert_same_run(engine, reference):
+    arrays, meta = engine.snapshot()
+    expected, expected_meta = reference.snapshot()
+    assert meta == expected_meta
+    assert list(arrays) == list(expected)
+    for name, values in expected.items():
+        assert np.array_equal(arrays[name], values), name
+    for name in checkpoint.COUNTERS:
+        assert getattr(engine, name) == getattr(reference, name), name
+    for name in COLUMN_NAMES:
+        assert np.array_equal(engine.visualizer.history[name], reference.visualizer.history[name]), name
+
+
+@pytest.mark.parametrize('backend', ['objects', 'numpy'])
+def test_resumed_run_matches_continuous_run(tmp_path, backend):
+    #salvat la tick-ul 500, incarcat intr-un engine cu alt seed, apoi inca 700 de tick-uri
+    path = str(tmp_path / 'checkpoint.npz')
+    engine = create_engine(backend, seed=7)
+    engine.step(500)
+    checkpoint.save(engine, path)
+
+    resumed = checkpoint.load(path, create_engine(backend, seed=1))
+    resumed.step(700)
+    reference = create_engine(backend, seed=7)
+    reference.step(1200)
+    assert_same_run(resumed, reference)
+
+
+def test_load_rewrites_the_export_from_the_history(tmp_path):
+    path = str(tmp_path / 'checkpoint.npz')
+    engine = create_engine('numpy', seed=7)
+    engine.step(50)
+    checkpoint.save(engine, path)
+
+    resumed = create_engine('numpy', seed=1)
+    exporter = StreamingExporter(str(tmp_path / 'data'), 'binary', chunk=16)
+    resumed.attach_exporter(exporter)
+    checkpoint.load(path, resumed)
+    resumed.step(10)
+    exporter.close()
+
+    data = load_binary(str(tmp_path / 'data'))
+    for name in COLUMN_NAMES:
+        assert np.array_equal(data[name], resumed.visualizer.history[name]), name
@@ -0,0 +1,77 @@
+import numpy as np
+
+from config import *
+from domains import TiledEngine
+from vectorized import VectorizedEngine
+
+FRAMES = 300
+
+
+def state(engine):
+    return (engine.prey.state(False), engine.predators.state(False), {'pos': engine.food.copy()})
+
+
+def assert_same_state(engine, reference):
+    for fields, expected in zip(state(engine), state(reference)):
+        for name, values in expected.items():
+            assert np.array_equal(fields[name], values), name
+
+
+def test_single_tile_matches_numpy():
+    engine = TiledEngine(tiles=(1, 1), seed=3)
+    reference = VectorizedEngine(seed=3)
+    try:
+        for frame in range(FRAMES):
+            engine.update()
+            reference.update()
+            assert engine.population() == reference.population(), frame
+        assert_same_state(engine, reference)
+    finally:
+        engine.close()
+
+
+def test_tiles_do_not_depend_on_worker_count():
+    #agentii trec granitele si se vad peste ele la fel, oricum ar fi impartite dalele pe procese
+    engine = TiledEngine(tiles=(2, 2), workers=2, seed=3)
+    reference = TiledEngine(tiles=(2, 2), workers=1, seed=3)
+    try:
+        for frame in range(FRAMES):
+            engine.update()
+            reference.update()
+            assert engine.population() == reference.population(), frame
+        assert_same_state(engine, reference)
+    finally:
+        engine.close()
+        reference.close()
+
+
+def place(engine, prey_pos, prey_energy, food_pos):
+    #lume fara pradatori si obstacole, doar cu randurile date
+    engine.clear_obstacles()
+    engine.prey.clear()
+    engine.prey.add(np.array(prey_pos, dtype=float), np.zeros((len(prey_pos), 2)),
+                    np.array(prey_energy, dtype=float), BASE_PREY_SPEED)
+    engine.predators.clear()
+    engine.food_arrays.clear()
+    engine.food_arrays.add(np.array(food_pos, dtype=float))
+
+
+def test_contacts_across_a_border_count_as_on_one_tile():
+    #o prada mananca mancarea de pe dala vecina si se imperecheaza cu o prada de peste granita
+    middle = WIDTH / 2
+    prey_pos = [(middle - 5, 200), (middle - 10, 400), (middle + 10, 400)]
+    energy = [50, 120, 120]
+    engine = TiledEngine(tiles=(2, 1), seed=3)
+    reference = VectorizedEngine(seed=3)
+    try:
+        for simulation in (engine, reference):
+            place(simulation, prey_pos, energy, [(middle + 4, 200)])
+        engine.restore(*engine.snapshot())
+        engine.update()
+        reference.update()
+
+        assert engine.population() == reference.population() == (4, 0, 0)
+        assert engine.prey_births_this_frame == 1
+        assert np.array_equal(np.sort(engine.prey.energy[:4]), np.sort(reference.prey.energy[:4]))
+    finally:
+        engine.close()
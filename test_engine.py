@@ -0,0 +1,91 @@
+import pytest
+
+from config import *
+from engine import SimulationEngine
+
+FRAMES = 3000 # cu seed 1, prima diferenta aparea la frame-ul 2848
+
+
+class BruteForceEngine(SimulationEngine):
+    #referinta: bucla din varianta initiala, pe liste intregi, cu stergere imediata
+    #(fara grile, liste Verlet, pool, compactare sau agenti sariti)
+
+    def update(self):
+        self.update_prey()
+        self.update_predators()
+        self.spawn_food()
+
+    def update_prey(self):
+        for prey in self.prey_list[:]:
+            prey.update(self.predator_list, self.prey_list, self.food_list, self.obstacles)
+
+            if not prey.is_alive():
+                self.prey_list.remove(prey)
+                continue
+
+            for food in self.food_list[:]:
+                if prey.distance_to(food) < 10:
+                    prey.eat_food(food)
+                    self.food_list.remove(food)
+                    break
+
+            if prey.can_reproduce():
+                for other in self.prey_list:
+                    if other == prey:
+                        continue
+                    if other.can_reproduce() and prey.distance_to(other) < 30:
+                        self.prey_list.append(prey.reproduce(rng=self.random))
+                        other.reproduction_cooldown = PREY_REPRODUCTION_COOLDOWN
+                        break
+
+    def update_predators(self):
+        for predator in self.predator_list[:]:
+            predator.update(self.prey_list, self.predator_list, self.obstacles)
+
+            if not predator.is_alive():
+                self.predator_list.remove(predator)
+                continue
+
+            for prey in self.prey_list[:]:
+                if predator.distance_to(prey) < 8:
+                    predator.eat_prey(prey)
+                    self.prey_list.remove(prey)
+                    break
+
+            if predator.can_reproduce():
+                for other in self.predator_list:
+                    if other == predator:
+                        continue
+                    if other.can_reproduce() and predator.distance_to(other) < 40:
+                        self.predator_list.append(predator.reproduce(rng=self.random))
+                        other.reproduction_cooldown = PREDATOR_REPRODUCTION_COOLDOWN
+                        break
+
+    def spawn_food(self):
+        self.food_spawn_timer += 1
+        if self.food_spawn_timer >= FOOD_SPAWN_INTERVAL and len(self.food_list) < MAX_FOOD:
+            self.food_list.append(self.food_pool.acquire(self.random.randint(20, WIDTH-20),
+                                                         self.random.randint(20, HEIGHT-20)))
+            self.food_spawn_timer = 0
+
+
+def state(engine):
+    return ([(prey.x, prey.y, prey.vx, prey.vy, prey.energy) for prey in engine.prey_list],
+            [(predator.x, predator.y, predator.vx, predator.vy, predator.energy)
+             for predator in engine.predator_list],
+            [(food.x, food.y) for food in engine.food_list])
+
+
+@pytest.mark.parametrize("use_grid", [True, False])
+def test_long_seeded_run_matches_brute_force(use_grid):
+    #campul de obstacole e interpolat, deci aproape de obstacole nu e identic cu lista lor
+    engine = SimulationEngine(seed=1)
+    engine.use_grid = use_grid
+    engine.use_obstacle_field = False
+    reference = BruteForceEngine(seed=1)
+
+    for frame in range(FRAMES):
+        engine.update()
+        reference.update()
+        assert engine.population() == reference.population(), frame
+    assert state(engine) == state(reference)
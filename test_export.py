@@ -0,0 +1,86 @@
+import csv
+import time
+
+import numpy as np
+import pytest
+
+from export import StreamingExporter, load_binary
+from history import CSV_HEADER, COLUMN_NAMES
+
+
+def rows(count, start=0):
+    return [(frame, frame % 40, frame % 7, frame % 30, frame % 3, frame % 2, frame * 0.5, frame / 3)
+            for frame in range(start, start + count)]
+
+
+def test_csv_round_trip(tmp_path):
+    path = tmp_path / 'data.csv'
+    exporter = StreamingExporter(str(path), 'csv', chunk=7)
+    for row in rows(30):
+        exporter.append(row)
+    exporter.close()
+
+    with open(path, newline='') as f:
+        lines = list(csv.reader(f))
+    assert lines[0] == CSV_HEADER
+    assert [tuple(map(float, line)) for line in lines[1:]] == [tuple(map(float, row)) for row in rows(30)]
+
+
+def test_binary_round_trip_with_memmap(tmp_path):
+    path = tmp_path / 'data'
+    exporter = StreamingExporter(str(path), 'binary', chunk=7)
+    for row in rows(12):
+        exporter.append(row)
+    exporter.restart() #fisierele o iau de la capat
+    for row in rows(30, start=100):
+        exporter.append(row)
+    exporter.close()
+
+    data = load_binary(str(path))
+    assert list(data) == COLUMN_NAMES
+    assert isinstance(data['time'], np.memmap)
+    expected = list(zip(*rows(30, start=100)))
+    for name, values in zip(COLUMN_NAMES, expected):
+        assert data[name].tolist() == list(values), name
+    assert load_binary(str(path), mmap=False)['prey_avg_energy'].tolist() == list(expected[6])
+
+
+
+@pytest.mark.parametrize('fmt', ['csv', 'binary'])
+def test_append_columns_writes_like_appends(tmp_path, fmt):
+    #istoricul unui checkpoint pleaca dintr-o bucata, apoi exportul continua rand cu rand
+    bulk = StreamingExporter(str(tmp_path / 'bulk'), fmt, chunk=7)
+    bulk.append_columns([np.array(values) for values in zip(*rows(20))])
+    for row in rows(5, start=20):
+        bulk.append(row)
+    bulk.close()
+    single = StreamingExporter(str(tmp_path / 'single'), fmt, chunk=7)
+    for row in rows(25):
+        single.append(row)
+    single.close()
+
+    assert bulk.rows_written == single.rows_written == 25
+    if fmt == 'csv':
+        assert (tmp_path / 'bulk').read_text() == (tmp_path / 'single').read_text()
+    else:
+        for name, values in load_binary(str(tmp_path / 'single')).items():
+            assert np.array_equal(load_binary(str(tmp_path / 'bulk'))[name], values), name
+
+
+def test_writer_error_surfaces_on_next_append(tmp_path):
+    exporter = StreamingExporter(str(tmp_path / 'data.csv'), 'csv', chunk=2)
+
+    def fail(handles, rows):
+        raise OSError("disc plin")
+    exporter.write_rows = fail
+
+    exporter.append(rows(1)[0])
+    exporter.append(rows(1)[0]) #chunk plin: randurile pleaca spre thread-ul de scriere
+    deadline = time.monotonic() + 5
+    while exporter.error is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    exporter.append(rows(1)[0])
+    with pytest.raises(OSError, match="disc plin"):
+        exporter.append(rows(1)[0])
+    exporter.close() #eroarea a fost deja raportata o data
@@ -0,0 +1,59 @@
+import numpy as np
+
+from history import HistoryStore, COLUMN_NAMES
+
+
+def row(frame):
+    #valori care se schimba de la un frame la altul, cu prazi 0 din cand in cand
+    prey = (frame * 7) % 50
+    return (frame, prey, frame % 13, frame % 5, frame % 3, frame % 2, frame * 0.5, frame * 0.25)
+
+
+def test_chunked_growth_keeps_every_frame():
+    history = HistoryStore(chunk=16)
+    for frame in range(100):
+        history.append(row(frame))
+    assert len(history) == 100
+    assert len(history.columns['time']) == 112 #7 chunk-uri
+    assert history['time'].tolist() == list(range(100))
+    assert history.last() == row(99)
+
+
+def test_ring_keeps_the_last_frames_exactly():
+    history = HistoryStore(limit=30, decimation=10)
+    frames = 137
+    for frame in range(frames):
+        history.append(row(frame))
+    assert len(history) == 30
+    for index, name in enumerate(COLUMN_NAMES):
+        expected = [row(frame)[index] for frame in range(frames - 30, frames)]
+        assert history[name].tolist() == expected, name
+    assert history.last() == row(frames - 1)
+
+
+def test_long_term_bounds_cover_dropped_frames():
+    #long_term_size mic, ca blocurile sa se si uneasca (block_size se dubleaza)
+    history = HistoryStore(limit=20, decimation=10, long_term_size=8)
+    frames = 500
+    for frame in range(frames):
+        history.append(row(frame))
+    assert history.block_size > 10
+    for index, name in enumerate(COLUMN_NAMES):
+        mins, maxs = history.long_term(name)
+        assert len(mins) == history.blocks
+        for block, (low, high) in enumerate(zip(mins, maxs)):
+            values = [row(frame)[index] for frame in range(block * history.block_size,
+                                                           (block + 1) * history.block_size)]
+            assert low == min(values) and high == max(values), (name, block)
+    assert history.blocks * history.block_size <= frames
+
+
+def test_ratio_is_vectorized_and_safe_at_zero_prey():
+    history = HistoryStore(limit=40)
+    for frame in range(90):
+        history.append(row(frame))
+    prey, predators = history['prey_count'], history['predator_count']
+    assert (prey == 0).any()
+    expected = [p / q if q else 0.0 for p, q in zip(predators.tolist(), prey.tolist())]
+    ratio = history.ratio()
+    assert isinstance(ratio, np.ndarray) and ratio.tolist() == expected
@@ -0,0 +1,74 @@
+import math
+import random
+
+import numpy as np
+
+from agents import Obstacle, Prey
+from config import *
+from engine import SimulationEngine
+from obstacle_field import ObstacleField, AVOID_DISTANCE
+
+
+def random_obstacles(rng, count=5):
+    return [Obstacle(rng.randint(100, WIDTH-100), rng.randint(100, HEIGHT-100), rng.randint(30, 60))
+            for _ in range(count)]
+
+
+def test_field_matches_the_exact_loop():
+    rng = random.Random(0)
+    obstacles = random_obstacles(rng)
+    field = ObstacleField(WIDTH, HEIGHT, OBSTACLE_FIELD_CELL).sync(obstacles)
+    agent = Prey(0, 0, rng)
+
+    angles = []
+    for _ in range(20000):
+        agent.x, agent.y = rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT)
+        exact = agent.avoid_obstacles(obstacles)
+        sample = field.sample(agent.x, agent.y)
+        #evita / nu evita: la fel, in afara unei benzi de o celula in jurul marginii zonei
+        edge = min(abs(math.hypot(agent.x - o.position.x, agent.y - o.position.y) - o.radius - AVOID_DISTANCE)
+                   for o in obstacles)
+        if edge > OBSTACLE_FIELD_CELL:
+            assert (sample is None) == (math.hypot(*exact) == 0), (agent.x, agent.y)
+        if sample is not None and math.hypot(*exact) > 0:
+            cos = ((exact[0] * sample[0] + exact[1] * sample[1])
+                   / math.hypot(*exact) / math.hypot(*sample))
+            angles.append(math.degrees(math.acos(max(-1.0, min(1.0, cos)))))
+
+    #directia e interpolata: aproape peste tot la cateva grade, mai rau doar langa centre si suprapuneri
+    assert len(angles) > 1000
+    assert np.percentile(angles, 90) < 5
+    assert np.percentile(angles, 99) < 15
+    assert max(angles) < 45
+
+
+def test_field_is_rebuilt_when_obstacles_change():
+    rng = random.Random(1)
+    obstacles = random_obstacles(rng)
+    field = ObstacleField(WIDTH, HEIGHT, OBSTACLE_FIELD_CELL).sync(obstacles)
+    points = np.random.default_rng(1).uniform((0, 0), (WIDTH, HEIGHT), size=(20000, 2))
+
+    #adaugat (B) si scos: doar dalele atinse se refac, rezultatul e cel al unei constructii de la zero
+    obstacles.append(Obstacle(400, 300, 50))
+    assert field.sync(obstacles).sample(400 + 60, 300) is not None
+    fresh = ObstacleField(WIDTH, HEIGHT, OBSTACLE_FIELD_CELL).sync(obstacles)
+    assert np.array_equal(field.sample_many(points), fresh.sample_many(points))
+
+    del obstacles[0]
+    fresh = ObstacleField(WIDTH, HEIGHT, OBSTACLE_FIELD_CELL).sync(obstacles)
+    assert np.array_equal(field.sync(obstacles).sample_many(points), fresh.sample_many(points))
+
+    #sters tot (C)
+    obstacles.clear()
+    assert not field.sync(obstacles).sample_many(points).any()
+
+
+def test_engine_field_follows_add_and_clear():
+    engine = SimulationEngine(seed=2)
+    engine.use_obstacle_field = True
+    engine.clear_obstacles()
+    assert engine.avoidance_field().sample(400, 300) is None
+    engine.add_obstacle(400, 300)
+    assert engine.avoidance_field().sample(400 + engine.obstacles[0].radius + 10, 300) is not None
+    engine.clear_obstacles()
+    assert engine.avoidance_field().sample(400 + 40, 300) is None
@@ -0,0 +1,30 @@
+import random
+
+from agents import Food, Prey
+from pool import EntityPool, handle, resolve
+
+
+def test_handle_expires_when_the_entity_is_released():
+    pool = EntityPool(Prey, random.Random(0))
+    prey = pool.acquire(100, 100)
+    ref = handle(prey)
+    assert resolve(ref) is prey
+
+    pool.release(prey)
+    assert resolve(ref) is None
+
+    #acelasi obiect, refolosit pentru o nastere noua: referinta veche ramane expirata
+    assert pool.acquire(200, 200) is prey
+    assert resolve(ref) is None
+    assert resolve(handle(prey)) is prey
+
+
+def test_retired_entity_expires_before_flush():
+    pool = EntityPool(Food, random.Random(0))
+    food = pool.acquire(10, 10)
+    ref = handle(food)
+    pool.retire(food)
+    assert resolve(ref) is None
+    assert len(pool) == 0
+    pool.flush()
+    assert len(pool) == 1
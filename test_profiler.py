@@ -0,0 +1,21 @@
+import pytest
+
+from profiler import PhaseProfiler
+
+
+def test_window_can_only_change_before_samples():
+    profiler = PhaseProfiler(window=4, enabled=True)
+    profiler.resize(6)
+    for value in range(10):
+        profiler.count('prey', value)
+    assert sorted(profiler.samples('prey').tolist()) == [4, 5, 6, 7, 8, 9]
+
+    with pytest.raises(ValueError):
+        profiler.resize(20)
+    assert profiler.window == 6
+
+    profiler.reset()
+    profiler.resize(20)
+    for value in range(10):
+        profiler.count('prey', value)
+    assert profiler.summary()['prey']['samples'] == 10
@@ -0,0 +1,31 @@
+import os
+
+#fara fereastra si fara ferestre matplotlib (graficele de la finalul lui run)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+from engine import create_engine
+from simulation import Simulation
+
+
+def test_run_without_export(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path) #daca s-ar exporta totusi, fisierul ar aparea aici
+    engine = create_engine("objects", record_trails=True, seed=1)
+    sim = Simulation(engine, export=False)
+    sim.speed = 0 #cat de repede se poate, ca primul frame sa aiba deja tick-uri
+
+    frames = []
+    update = sim.update
+
+    def update_and_stop():
+        update()
+        frames.append(engine.visualizer.history['time'][-1])
+        if len(frames) >= 5:
+            sim.running = False
+
+    sim.update = update_and_stop
+    sim.run()
+
+    assert engine.exporter is None
+    assert len(frames) >= 5
+    assert os.listdir(tmp_path) == []
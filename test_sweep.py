@@ -0,0 +1,14 @@
+from sweep import apply_parameters
+
+
+def test_history_settings_reach_the_visualizer():
+    #visualizer.py ia HISTORY_* cu "from config import", deci are copiile lui
+    from visualizer import SimulationVisualizer
+    try:
+        apply_parameters({'HISTORY_LIMIT': 50, 'HISTORY_DECIMATION': 5})
+        history = SimulationVisualizer().history
+        assert (history.limit, history.decimation) == (50, 5)
+    finally:
+        apply_parameters({})
+    history = SimulationVisualizer().history
+    assert (history.limit, history.decimation) == (None, 100)
@@ -0,0 +1,678 @@
+import math
+import random
+import numpy as np
+from config import *
+from agents import Obstacle
+from visualizer import SimulationVisualizer
+from kernels import flock_steering
+from obstacle_field import ObstacleField
+from profiler import PhaseProfiler
+
+
+FIELDS = ('pos', 'vel', 'energy', 'cooldown', 'speed', 'trail', 'trail_count')
+TRAIL_FIELDS = ('trail', 'trail_count')
+
+pair_checks = 0 # perechi candidate testate de neighbor_pairs (citit de profiler)
+PAIR_TABLE_CELLS = 1 << 22 # cel mult atatea celule in tabelul lui neighbor_pairs pe toata lumea
+
+
+class SpeciesArrays:
+    #structure-of-arrays pentru o specie: fiecare camp e un array numpy contiguu
+
+    def __init__(self, capacity=256):
+        self.count = 0
+        self.pos = np.zeros((capacity, 2))
+        self.vel = np.zeros((capacity, 2))
+        self.energy = np.zeros(capacity)
+        self.cooldown = np.zeros(capacity, dtype=np.int32)
+        self.speed = np.zeros(capacity)
+        #urmele tuturor agentilor intr-un singur array; fiecare punct e scris la h si h + TRAIL_LENGTH,
+        #deci ultimele puncte ale fiecarui rand sunt mereu aceeasi felie continua (vezi trail_window)
+        self.trail = np.zeros((capacity, 2 * TRAIL_LENGTH, 2))
+        self.trail_count = np.zeros(capacity, dtype=np.int32)
+        self.trail_head = 0
+
+    def grow(self, needed):
+        capacity = len(self.energy)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name in FIELDS:
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def add(self, pos, vel, energy, speed):
+        n = len(pos)
+        self.grow(self.count + n)
+        sl = slice(self.count, self.count + n)
+        self.pos[sl] = pos
+        self.vel[sl] = vel
+        self.energy[sl] = energy
+        self.cooldown[sl] = 0
+        self.speed[sl] = speed
+        self.trail_count[sl] = 0
+        self.count += n
+
+    def keep(self, mask):
+        #compactare: pastrez doar randurile marcate, in aceeasi ordine
+        #randurile eliberate la coada sunt refolosite de urmatoarele nasteri (add)
+        n = int(mask.sum())
+        for name in FIELDS:
+            arr = getattr(self, name)
+            arr[:n] = arr[:self.count][mask]
+        self.count = n
+
+    def clear(self):
+        #la reset: capacitatea ramane, randurile se refolosesc
+        self.count = 0
+        self.trail_head = 0
+
+    def state(self, trails=True):
+        #randurile ocupate, camp cu camp (pt checkpoint); urmele doar daca se deseneaza
+        return {name: getattr(self, name)[:self.count] for name in FIELDS
+                if trails or name not in TRAIL_FIELDS}
+
+    def restore(self, fields, trail_head):
+        self.clear()
+        self.extend(fields)
+        self.trail_head = trail_head
+
+    def take(self, rows, trails=True):
+        #copii ale randurilor date, camp cu camp (agentii care trec pe alta dala, vezi domains.py)
+        return {name: getattr(self, name)[rows] for name in FIELDS
+                if trails or name not in TRAIL_FIELDS}
+
+    def extend(self, fields):
+        #randuri intregi, ca cele din take() / state(); fara urme, randurile pornesc fara urma
+        n = len(fields['pos'])
+        self.grow(self.count + n)
+        sl = slice(self.count, self.count + n)
+        self.trail_count[sl] = 0
+        for name, values in fields.items():
+            getattr(self, name)[sl] = values
+        self.count += n
+
+    def record_trails(self):
+        h, n = self.trail_head, self.count
+        self.trail[:n, h] = self.pos[:n]
+        self.trail[:n, h + TRAIL_LENGTH] = self.pos[:n]
+        self.trail_head = (h + 1) % TRAIL_LENGTH
+        np.minimum(self.trail_count[:n] + 1, TRAIL_LENGTH, out=self.trail_count[:n])
+
+    def trail_window(self):
+        #view (capacitate, TRAIL_LENGTH, 2) cu ultimele puncte ale fiecarui rand, de la cel mai vechi
+        #la cel mai nou; toate randurile scriu la acelasi h, deci fereastra e aceeasi pentru toti,
+        #iar un rand cu trail_count < TRAIL_LENGTH are punctele valide la coada ei
+        h = self.trail_head
+        return self.trail[:, h:h + TRAIL_LENGTH]
+
+    def __len__(self):
+        return self.count
+
+
+class FoodArrays:
+    #pozitiile mancarii in randuri prealocate, ca la SpeciesArrays: spawn-ul si mancatul
+    #refolosesc randurile in loc sa construiasca un array nou la fiecare schimbare
+
+    def __init__(self, capacity=64):
+        self.count = 0
+        self.pos = np.zeros((capacity, 2))
+
+    def add(self, pos):
+        n = len(pos)
+        capacity = len(self.pos)
+        if self.count + n > capacity:
+            while capacity < self.count + n:
+                capacity *= 2
+            new = np.zeros((capacity, 2))
+            new[:self.count] = self.pos[:self.count]
+            self.pos = new
+        self.pos[self.count:self.count + n] = pos
+        self.count += n
+
+    def keep(self, mask):
+        n = int(mask.sum())
+        self.pos[:n] = self.pos[:self.count][mask]
+        self.count = n
+
+    def clear(self):
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+
+def random_directions(rng, n):
+    vel = rng.uniform(-1, 1, size=(n, 2))
+    return normalized(vel)[0]
+
+
+def normalized(vectors):
+    #vectorii de lungime 0 raman 0 (ca la "if v.length() > 0" din agents.py)
+    length = np.sqrt((vectors * vectors).sum(axis=1))
+    out = np.zeros_like(vectors)
+    nz = length > 0
+    out[nz] = vectors[nz] / length[nz, None]
+    return out, nz
+
+
+def neighbor_pairs(pos_a, pos_b, radius, same=False):
+    #toate perechile (i, j) cu |a_i - b_j| < radius, cu binning pe celule de marimea razei
+    #perechile ies grupate dupa i (crescator), apoi dupa celula vecina si ordinea din pos_b
+    global pair_checks
+    empty = (np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp), np.zeros(0))
+    if len(pos_a) == 0 or len(pos_b) == 0:
+        return empty
+
+    #celula nu e mai mica decat raza; intr-o lume foarte mare creste, ca tabelul de celule sa ramana mic
+    #(depinde doar de raza si de marimea lumii, deci e aceeasi si pe dale)
+    cell = max(radius, math.sqrt(WIDTH * HEIGHT / PAIR_TABLE_CELLS))
+    cell_a = np.floor(pos_a / cell).astype(np.intp)
+    cell_b = np.floor(pos_b / cell).astype(np.intp)
+    low = np.minimum(cell_a.min(axis=0), cell_b.min(axis=0)) - 1
+    cell_a -= low
+    cell_b -= low
+    columns = max(cell_a[:, 0].max(), cell_b[:, 0].max()) + 2
+    rows = max(cell_a[:, 1].max(), cell_b[:, 1].max()) + 2
+
+    #punctele b sortate dupa celula; pentru fiecare celula, cate sunt si de unde incep
+    key_b = cell_b[:, 0] * rows + cell_b[:, 1]
+    order = np.argsort(key_b, kind='stable')
+    cell_counts = np.bincount(key_b, minlength=columns * rows)
+    cell_starts = np.cumsum(cell_counts) - cell_counts
+
+    #cele 9 celule din jurul fiecarui a, pe randuri: (n, 9)
+    offsets = (np.arange(-1, 2)[:, None] * rows + np.arange(-1, 2)).ravel()
+    keys = (cell_a[:, 0] * rows + cell_a[:, 1])[:, None] + offsets
+    counts = cell_counts[keys].ravel()
+    total = int(counts.sum())
+    if total == 0:
+        return empty
+    pair_checks += total
+    i = np.repeat(np.arange(len(pos_a)), counts.reshape(-1, 9).sum(axis=1))
+    k = np.repeat(cell_starts[keys].ravel() - np.cumsum(counts) + counts, counts) + np.arange(total)
+
+    #filtru pe distanta la patrat (fara sqrt), apoi test exact pe ce ramane
+    dx = pos_a[:, 0][i] - pos_b[order, 0][k]
+    dy = pos_a[:, 1][i] - pos_b[order, 1][k]
+    close = np.flatnonzero(dx * dx + dy * dy <= radius * radius * (1 + 1e-9))
+    i, j, dx, dy = i[close], order[k[close]], dx[close], dy[close]
+    d = np.sqrt(dx * dx + dy * dy)
+    keep = d < radius
+    if same:
+        keep &= i != j
+    return i[keep], j[keep], d[keep]
+
+
+def nearest_in_pairs(i, j, d, n):
+    #pentru fiecare i: cel mai apropiat j (la egalitate, indexul mai mic, ca in brute force)
+    #perechile sunt grupate dupa i (vezi neighbor_pairs), deci minimele se iau pe segmente, fara sortare
+    nearest = np.full(n, -1, dtype=np.intp)
+    if len(i) == 0:
+        return nearest
+    starts = np.flatnonzero(np.concatenate(([True], i[1:] != i[:-1])))
+    lengths = np.diff(np.append(starts, len(i)))
+    closest = np.repeat(np.minimum.reduceat(d, starts), lengths)
+    nearest[i[starts]] = np.minimum.reduceat(np.where(d == closest, j, np.iinfo(np.intp).max), starts)
+    return nearest
+
+
+def first_contacts(pos_a, pos_b, radius):
+    #perechi de contact sortate dupa (i, j), pentru arbitrajul secvential
+    i, j, _ = neighbor_pairs(pos_a, pos_b, radius)
+    order = np.lexsort((j, i))
+    return i[order], j[order]
+
+
+def arbitrate(i, j, n):
+    #arbitraj determinist pe perechile din first_contacts: i cu index mic alege primul,
+    #j cu index mic e luat primul, fiecare i ia cel mult un j
+    #intoarce (i-urile care au luat ceva, masca j-urilor luate din cele n)
+    eaten = np.zeros(n, dtype=bool)
+    takers = []
+    done = -1
+    for a, b in zip(i.tolist(), j.tolist()):
+        if a == done or eaten[b]:
+            continue
+        eaten[b] = True
+        done = a
+        takers.append(a)
+    return np.array(takers, dtype=np.intp), eaten
+
+
+def fertile(species, min_energy):
+    #cine se poate imperechea acum
+    n = species.count
+    return (species.energy[:n] >= min_energy) & (species.cooldown[:n] == 0)
+
+
+def mating_pairs(pos, distance):
+    #perechi disjuncte de parteneri la mai putin de distance, in ordinea (i, j) a indexurilor;
+    #intoarce (parintii, care platesc nasterea, partenerii lor)
+    i, j, _ = neighbor_pairs(pos, pos, distance, same=True)
+    order = np.lexsort((j, i))
+    busy = np.zeros(len(pos), dtype=bool)
+    parents, partners = [], []
+    for a, b in zip(i[order].tolist(), j[order].tolist()):
+        if busy[a] or busy[b]:
+            continue
+        busy[a] = busy[b] = True
+        parents.append(a)
+        partners.append(b)
+    return np.array(parents, dtype=np.intp), np.array(partners, dtype=np.intp)
+
+
+def offspring(rng, pos):
+    #pozitiile si directiile puilor nascuti langa parintii din pos
+    # Offset mic pentru nou-nascut
+    offsets = rng.integers(-20, 20, size=(len(pos), 2), endpoint=True)
+    return pos + offsets, random_directions(rng, len(pos))
+
+
+def steer_prey(pos, vel, energy, speed, predator_pos, food, ghosts=None):
+    #decizia fiecarei prazi (fuga, mancare, flocking), scrisa pe loc in vel si speed
+    #depinde doar de vecinii din raza, deci merge si pe o bucata de lume (vezi domains.py);
+    #acolo ghosts = (pos, vel) ale prazilor de peste granita, care intra doar ca vecini in flocking
+    #toate deciziile citesc starea de la inceputul fazei: alinierea foloseste directiile de dinainte
+    #de fuga / mancare, nu vel-ul deja schimbat de ele
+    n = len(pos)
+    heading = vel.copy()
+
+    # PRIORITATE 1: Fugi de predator
+    i, j, d = neighbor_pairs(pos, predator_pos, PREY_VISION)
+    nearest_pred = nearest_in_pairs(i, j, d, n)
+    fleeing = nearest_pred >= 0
+    if fleeing.any():
+        away, nz = normalized(pos[fleeing] - predator_pos[nearest_pred[fleeing]])
+        rows = np.flatnonzero(fleeing)[nz]
+        vel[rows] = away[nz]
+
+    # PRIORITATE 2: Cauta food
+    hungry = ~fleeing & (energy < PREY_HUNGER_ENERGY)
+    if hungry.any() and len(food):
+        rows = np.flatnonzero(hungry)
+        i, j, d = neighbor_pairs(pos[rows], food, PREY_FOOD_VISION)
+        nearest_food = nearest_in_pairs(i, j, d, len(rows))
+        found = nearest_food >= 0
+        toward, nz = normalized(food[nearest_food[found]] - pos[rows[found]])
+        vel[rows[found][nz]] = toward[nz]
+
+    # PRIORITATE 3: Flocking
+    flocking = ~fleeing & ~hungry
+    if flocking.any():
+        flock(pos, heading, vel, speed, flocking, ghosts)
+
+
+def flock(pos, heading, vel, speed, flocking, ghosts=None):
+    #perechi doar pentru prada care face flocking (i), vecini din toata prada (j), plus fantome
+    #alinierea citeste `heading` (directiile de la inceputul fazei), rezultatul se scrie in vel
+    n = len(pos)
+    if ghosts is not None and len(ghosts[0]):
+        pos = np.concatenate((pos, ghosts[0]))
+        heading = np.concatenate((heading, ghosts[1]))
+    rows = np.flatnonzero(flocking)
+    i, j, d = neighbor_pairs(pos[rows], pos, FLOCKING_RADIUS)
+    i = rows[i]
+    keep = i != j
+    direction, steer, _, new_speed = flock_steering(pos, heading, i[keep], j[keep], d[keep], len(pos))
+
+    steer = steer[:n]
+    vel[steer] = direction[:n][steer]
+    speed[flocking] = new_speed[:n][flocking]
+
+
+def steer_predators(pos, vel, prey_pos):
+    #fiecare predator se indreapta spre cea mai apropiata prada din PREDATOR_VISION
+    if len(prey_pos) == 0:
+        return
+    i, j, d = neighbor_pairs(pos, prey_pos, PREDATOR_VISION)
+    nearest = nearest_in_pairs(i, j, d, len(pos))
+    hunting = nearest >= 0
+    toward, nz = normalized(prey_pos[nearest[hunting]] - pos[hunting])
+    vel[np.flatnonzero(hunting)[nz]] = toward[nz]
+
+
+class VectorizedEngine:
+    backend = "numpy"
+    #backend alternativ: aceeasi simulare, dar pe array-uri numpy, cu update sincron pe specie
+    #(toti agentii decid din starea de la inceputul fazei, nu unul dupa altul)
+
+    def __init__(self, record_trails=False, seed=None):
+        self.record_trails = record_trails #urmele conteaza doar cand se deseneaza
+        #ca la SimulationEngine: generatorul simularii, sau modulul random global cand seed e None
+        self.seed = seed
+        self.random = random if seed is None else random.Random(seed)
+        self.prey = SpeciesArrays()
+        self.predators = SpeciesArrays()
+        self.food_arrays = FoodArrays()
+        self.obstacles = []
+        self.obstacle_field = None #ca la SimulationEngine: creat la prima folosire (avoidance_field)
+        self.use_obstacle_field = USE_OBSTACLE_FIELD
+
+        #contoare pt statisitici
+        self.prey_births_this_frame = 0
+        self.predator_births_this_frame = 0
+        self.total_prey_births = 0
+        self.total_predator_births = 0
+        self.total_prey_deaths = 0
+        self.total_predator_deaths = 0
+
+        self.food_spawn_timer = 0
+        self.profiler = PhaseProfiler(PROFILE_WINDOW, PROFILE)
+        self.visualizer = SimulationVisualizer()
+        self.exporter = None #StreamingExporter, vezi attach_exporter
+
+        self.reset_simulation()
+
+    def reset_simulation(self):
+        #generatorul numpy e semanat din self.random, deci seed-ul face rularea reproductibila
+        if self.seed is not None:
+            self.random.seed(self.seed)
+        self.rng = np.random.default_rng(self.random.getrandbits(64))
+        self.food_rng = np.random.default_rng(self.random.getrandbits(64)) #doar mancarea care apare in timp
+
+        self.prey.clear()
+        self.predators.clear()
+        self.prey.add(self.random_positions(INITIAL_PREY, 50),
+                      random_directions(self.rng, INITIAL_PREY),
+                      PREY_INITIAL_ENERGY, BASE_PREY_SPEED)
+        self.predators.add(self.random_positions(INITIAL_PREDATORS, 50),
+                           random_directions(self.rng, INITIAL_PREDATORS),
+                           PREDATOR_INITIAL_ENERGY, BASE_PREDATOR_SPEED)
+        self.food_arrays.clear()
+        self.food_arrays.add(self.random_positions(INITIAL_FOOD, 20))
+
+        self.obstacles = [
+            Obstacle(self.random.randint(100, WIDTH-100),
+                     self.random.randint(100, HEIGHT-100),
+                     self.random.randint(30, 60))
+            for _ in range(INITIAL_OBSTACLES)
+        ]
+
+        self.total_prey_births = 0
+        self.total_predator_births = 0
+        self.total_prey_deaths = 0
+        self.total_predator_deaths = 0
+
+        self.visualizer = SimulationVisualizer(exporter=self.exporter)
+        if self.exporter is not None:
+            self.exporter.restart()
+
+        print("Simulation reset!")
+
+    def reseed(self, seed):
+        self.random.seed(seed)
+        self.rng = np.random.default_rng(self.random.getrandbits(64))
+        self.food_rng = np.random.default_rng(self.random.getrandbits(64))
+
+    def snapshot(self):
+        #agentii, mancarea si generatorul numpy (restul starii il salveaza checkpoint.save)
+        arrays = {}
+        for prefix, species in (('prey', self.prey), ('predators', self.predators)):
+            for name, values in species.state(self.record_trails).items():
+                arrays[f'{prefix}.{name}'] = values
+        arrays['food.pos'] = self.food
+        meta = {
+            'rng': self.rng.bit_generator.state,
+            'food_rng': self.food_rng.bit_generator.state,
+            'trail_head': [self.prey.trail_head, self.predators.trail_head],
+        }
+        return arrays, meta
+
+    def restore(self, arrays, meta):
+        #inversul lui snapshot; dintr-un checkpoint fara urme, agentii pornesc fara urma
+        prey_head, predator_head = meta['trail_head']
+        for prefix, species, trail_head in (('prey', self.prey, prey_head),
+                                            ('predators', self.predators, predator_head)):
+            species.restore({name: arrays[f'{prefix}.{name}'] for name in FIELDS
+                             if f'{prefix}.{name}' in arrays}, trail_head)
+        self.food_arrays.clear()
+        self.food_arrays.add(arrays['food.pos'])
+        self.rng.bit_generator.state = meta['rng']
+        if 'food_rng' in meta: #checkpoint-urile mai vechi nu il au
+            self.food_rng.bit_generator.state = meta['food_rng']
+
+    @property
+    def food(self):
+        #view peste randurile ocupate (n, 2)
+        return self.food_arrays.pos[:self.food_arrays.count]
+
+    def random_positions(self, n, margin, rng=None):
+        rng = self.rng if rng is None else rng
+        x = rng.integers(margin, WIDTH - margin, size=n, endpoint=True)
+        y = rng.integers(margin, HEIGHT - margin, size=n, endpoint=True)
+        return np.column_stack((x, y)).astype(float)
+
+    def step(self, n=1):
+        for _ in range(n):
+            self.update()
+        return self
+
+    def attach_exporter(self, exporter):
+        self.exporter = exporter
+        self.visualizer.exporter = exporter
+
+    def population(self):
+        return len(self.prey), len(self.predators), len(self.food)
+
+    #adaugari manuale (folosite de hotkey-urile din UI)
+    def add_prey(self):
+        self.prey.add(self.random_positions(1, 50), random_directions(self.rng, 1),
+                      PREY_INITIAL_ENERGY, BASE_PREY_SPEED)
+
+    def add_predator(self):
+        self.predators.add(self.random_positions(1, 50), random_directions(self.rng, 1),
+                           PREDATOR_INITIAL_ENERGY, BASE_PREDATOR_SPEED)
+
+    def add_food(self, count=1):
+        self.food_arrays.add(self.random_positions(count, 20))
+
+    def add_obstacle(self, x, y):
+        self.obstacles.append(Obstacle(x, y, self.random.randint(30, 60)))
+
+    def clear_obstacles(self):
+        self.obstacles.clear()
+
+    def update(self):
+        profiler = self.profiler
+        profiler.start('tick')
+        self.prey_births_this_frame = 0
+        self.predator_births_this_frame = 0
+
+        profiler.start('update_prey')
+        self.update_prey()
+        profiler.stop('update_prey')
+
+        profiler.start('update_predators')
+        self.update_predators()
+        profiler.stop('update_predators')
+
+        profiler.start('spawn_food')
+        self.spawn_food()
+        profiler.stop('spawn_food')
+
+        profiler.start('update_history')
+        prey, predators = self.prey, self.predators
+        self.visualizer.record(
+            len(prey), len(predators), len(self.food),
+            self.prey_births_this_frame, self.predator_births_this_frame,
+            float(prey.energy[:prey.count].mean()) if prey.count else 0,
+            float(predators.energy[:predators.count].mean()) if predators.count else 0
+        )
+        profiler.stop('update_history')
+        profiler.stop('tick')
+
+        if profiler.enabled:
+            self.count_stats()
+
+    def count_stats(self):
+        prey_count, predator_count, food_count = self.population()
+        self.profiler.count('neighbor_checks', self.neighbor_checks())
+        self.profiler.count('prey', prey_count)
+        self.profiler.count('predators', predator_count)
+        self.profiler.count('food', food_count)
+
+    def neighbor_checks(self):
+        #perechile candidate testate de la ultimul apel
+        global pair_checks
+        checks = pair_checks
+        pair_checks = 0
+        return checks
+
+    def update_prey(self):
+        if self.prey.count == 0:
+            return
+        self.move_prey()
+        self.eat_food()
+        self.prey_births_this_frame = self.breed_prey()
+        self.total_prey_births += self.prey_births_this_frame
+
+    def move_prey(self):
+        #energie, decizie si miscare; prazile ramase fara energie mor
+        prey = self.prey
+        n = prey.count
+        energy, cooldown = prey.energy[:n], prey.cooldown[:n]
+
+        energy -= PREY_ENERGY_LOSS
+        np.maximum(cooldown - 1, 0, out=cooldown)
+
+        self.steer_prey(n)
+
+        self.integrate(prey, n)
+
+        alive = energy > 0
+        self.total_prey_deaths += int(n - alive.sum())
+        prey.keep(alive)
+
+    def breed_prey(self):
+        return self.reproduce(
+            self.prey, PREY_MATING_DISTANCE, PREY_REPRODUCTION_ENERGY, PREY_REPRODUCTION_COST,
+            PREY_REPRODUCTION_COOLDOWN, PREY_INITIAL_ENERGY, BASE_PREY_SPEED)
+
+    def steer_prey(self, n):
+        prey = self.prey
+        steer_prey(prey.pos[:n], prey.vel[:n], prey.energy[:n], prey.speed[:n],
+                   self.predators.pos[:self.predators.count], self.food)
+
+    def steer_predators(self, n):
+        prey = self.prey
+        steer_predators(self.predators.pos[:n], self.predators.vel[:n], prey.pos[:prey.count])
+
+    def avoidance_field(self):
+        if self.obstacle_field is None:
+            self.obstacle_field = ObstacleField(WIDTH, HEIGHT, OBSTACLE_FIELD_CELL)
+        return self.obstacle_field.sync(self.obstacles)
+
+    def integrate(self, species, n):
+        #echivalentul Agent.update_position pentru toata specia odata
+        pos, vel, speed = species.pos[:n], species.vel[:n], species.speed[:n]
+
+        if self.obstacles and self.use_obstacle_field:
+            avoidance, nz = normalized(self.avoidance_field().sample_many(pos))
+            vel[nz] = avoidance[nz]
+        elif self.obstacles:
+            centers = np.array([(o.position.x, o.position.y) for o in self.obstacles])
+            radii = np.array([o.radius for o in self.obstacles], dtype=float)
+            diff = pos[:, None, :] - centers[None, :, :]
+            dist = np.sqrt((diff * diff).sum(axis=2))
+            inside = (dist < radii + 30) & (dist > 0)
+            weight = np.where(inside, 1 / np.maximum(dist, 1) / np.where(dist > 0, dist, 1), 0)
+            avoidance = (diff * weight[:, :, None]).sum(axis=1)
+            avoidance, nz = normalized(avoidance)
+            vel[nz] = avoidance[nz]
+
+        pos += vel * speed[:, None]
+
+        out_x = (pos[:, 0] < 0) | (pos[:, 0] > WIDTH)
+        out_y = (pos[:, 1] < 0) | (pos[:, 1] > HEIGHT)
+        vel[out_x, 0] *= -1
+        vel[out_y, 1] *= -1
+
+        np.clip(pos[:, 0], 0, WIDTH, out=pos[:, 0])
+        np.clip(pos[:, 1], 0, HEIGHT, out=pos[:, 1])
+
+        if self.record_trails:
+            species.record_trails()
+
+    def eat_food(self):
+        #intoarce randurile prazilor care au mancat
+        prey = self.prey
+        if prey.count == 0 or len(self.food) == 0:
+            return np.zeros(0, dtype=np.intp)
+        i, j = first_contacts(prey.pos[:prey.count], self.food, FOOD_EAT_DISTANCE)
+        takers, eaten = arbitrate(i, j, len(self.food))
+        prey.energy[takers] = np.minimum(prey.energy[takers] + PREY_ENERGY_GAIN_FOOD, PREY_MAX_ENERGY)
+        if eaten.any():
+            self.food_arrays.keep(~eaten)
+        return takers
+
+    def reproduce(self, species, distance, min_energy, cost, cooldown, energy, speed):
+        rows = np.flatnonzero(fertile(species, min_energy))
+        if len(rows) < 2:
+            return 0
+        parents, partners = mating_pairs(species.pos[rows], distance)
+        if len(parents) == 0:
+            return 0
+        parents, partners = rows[parents], rows[partners]
+        species.energy[parents] -= cost
+        species.cooldown[parents] = cooldown
+        species.cooldown[partners] = cooldown
+
+        babies, directions = offspring(self.rng, species.pos[parents])
+        species.add(babies, directions, energy, speed)
+        return len(parents)
+
+    def update_predators(self):
+        if self.predators.count == 0:
+            return
+        self.move_predators()
+        self.eat_prey()
+        self.predator_births_this_frame = self.breed_predators()
+        self.total_predator_births += self.predator_births_this_frame
+
+    def move_predators(self):
+        predators = self.predators
+        n = predators.count
+        energy, cooldown = predators.energy[:n], predators.cooldown[:n]
+
+        energy -= PREDATOR_ENERGY_LOSS
+        np.maximum(cooldown - 1, 0, out=cooldown)
+
+        self.steer_predators(n)
+
+        self.integrate(predators, n)
+
+        alive = energy > 0
+        self.total_predator_deaths += int(n - alive.sum())
+        predators.keep(alive)
+
+    def breed_predators(self):
+        return self.reproduce(
+            self.predators, PREDATOR_MATING_DISTANCE, PREDATOR_REPRODUCTION_ENERGY,
+            PREDATOR_REPRODUCTION_COST, PREDATOR_REPRODUCTION_COOLDOWN, PREDATOR_INITIAL_ENERGY,
+            BASE_PREDATOR_SPEED)
+
+    def eat_prey(self):
+        #intoarce randurile pradatorilor care au mancat
+        predators, prey = self.predators, self.prey
+        if predators.count == 0 or prey.count == 0:
+            return np.zeros(0, dtype=np.intp)
+        i, j = first_contacts(predators.pos[:predators.count], prey.pos[:prey.count], PREY_CATCH_DISTANCE)
+        takers, eaten = arbitrate(i, j, prey.count)
+        predators.energy[takers] = np.minimum(predators.energy[takers] + PREDATOR_ENERGY_GAIN_PREY,
+                                              PREDATOR_MAX_ENERGY)
+        if eaten.any():
+            self.total_prey_deaths += int(eaten.sum())
+            prey.keep(~eaten)
+        return takers
+
+    def spawn_food(self):
+        self.food_spawn_timer += 1
+        if (self.food_spawn_timer >= FOOD_SPAWN_INTERVAL and
+            len(self.food) < MAX_FOOD):
+            #generator separat: pe dale, mancarea noua o trage coordonatorul (vezi domains.py)
+            self.food_arrays.add(self.random_positions(1, 20, self.food_rng))
+            self.food_spawn_timer = 0
@@ -1,19 +1,18 @@
-import matplotlib.pyplot as plt
+from config import HISTORY_LIMIT, HISTORY_DECIMATION
+from history import HistoryStore, COLUMN_NAMES, CSV_HEADER
+
+UNSET = object()
 
 class SimulationVisualizer:
     
-    def __init__(self):
-        self.history = {
-            'time': [],
-            'prey_count': [],
-            'predator_count': [],
-            'food_count': [],
-            'prey_births': [],
-            'predator_births': [],
-            'prey_avg_energy': [],
-            'predator_avg_energy': []
-        }
-        #dictionar cu liste goale
+    def __init__(self, limit=UNSET, exporter=None):
+        #istoric pe coloane (array-uri numpy), history['prey_count'] etc. dau coloana ordonata
+        #cu limit=N se pastreaza doar ultimele N frame-uri + o serie min/max pe termen lung
+        #implicit HISTORY_LIMIT, citit la apel (nu la import), ca sa-l poata schimba sweep.py
+        if limit is UNSET:
+            limit = HISTORY_LIMIT
+        self.history = HistoryStore(limit=limit, decimation=HISTORY_DECIMATION)
+        self.exporter = exporter #StreamingExporter optional, primeste fiecare rand pe loc
 
         self.frame_count = 0 #counter de frame uri
         self.fig = None
@@ -23,32 +22,37 @@ class SimulationVisualizer:
     #la fiecare frame, actualizez istoricul cu datele curente
     def update_history(self, prey_list, predator_list, food_list, 
                       prey_births, predator_births):
-        self.frame_count += 1
-        self.history['time'].append(self.frame_count)
-        self.history['prey_count'].append(len(prey_list))
-        self.history['predator_count'].append(len(predator_list))
-        self.history['food_count'].append(len(food_list))
-        self.history['prey_births'].append(prey_births)
-        self.history['predator_births'].append(predator_births)
-        
         #calculez energia medie pentru prey si predatori
         if prey_list:
             avg_prey_energy = sum(p.energy for p in prey_list) / len(prey_list)
-            self.history['prey_avg_energy'].append(avg_prey_energy)
         else:
-            self.history['prey_avg_energy'].append(0)
+            avg_prey_energy = 0
         
         if predator_list:
             avg_pred_energy = sum(p.energy for p in predator_list) / len(predator_list)
-            self.history['predator_avg_energy'].append(avg_pred_energy)
         else:
-            self.history['predator_avg_energy'].append(0)
+            avg_pred_energy = 0
+        
+        self.record(len(prey_list), len(predator_list), len(food_list),
+                    prey_births, predator_births, avg_prey_energy, avg_pred_energy)
+    
+    #acelasi istoric, dar din valori deja agregate (ex. backend-ul numpy)
+    def record(self, prey_count, predator_count, food_count, 
+               prey_births, predator_births, prey_avg_energy, predator_avg_energy):
+        self.frame_count += 1
+        row = (self.frame_count, prey_count, predator_count, food_count,
+               prey_births, predator_births, prey_avg_energy, predator_avg_energy)
+        self.history.append(row)
+        if self.exporter is not None:
+            self.exporter.append(row)
     
     def plot_graphs(self):
-        if not self.history['time']:
+        if not len(self.history):
             print("Nu exista date pentru grafice!")
             return
         
+        import matplotlib.pyplot as plt #import tarziu, ca engine-ul headless sa nu incarce matplotlib
+        
         # Creez figura cu 4 subgrafice
         self.fig, self.axes = plt.subplots(2, 2, figsize=(14, 10))
         self.fig.suptitle('Predator-Prey Simulation Statistics', 
@@ -64,6 +68,12 @@ class SimulationVisualizer:
                 color='red', linewidth=2, label='Predators')
         ax1.plot(time, self.history['food_count'], 
                 color='gold', linewidth=1, linestyle='--', label='Food')
+        if self.history.blocks:
+            # cu istoric limitat: min/max pe blocuri pentru frame-urile care nu mai sunt in ring
+            block_start, _ = self.history.long_term('time')
+            prey_min, prey_max = self.history.long_term('prey_count')
+            ax1.fill_between(block_start, prey_min, prey_max, step='post',
+                            color='green', alpha=0.15, label='Prey (min/max)')
         ax1.set_xlabel('Time (frames)')
         ax1.set_ylabel('Population')
         ax1.set_title('Population Over Time')
@@ -96,14 +106,7 @@ class SimulationVisualizer:
         
         # Ratio Predator/Prey
         ax4 = self.axes[1, 1]
-        ratios = []
-        for i in range(len(time)):
-            prey_c = self.history['prey_count'][i]
-            pred_c = self.history['predator_count'][i]
-            if prey_c > 0:
-                ratios.append(pred_c / prey_c)
-            else:
-                ratios.append(0)
+        ratios = self.history.ratio('predator_count', 'prey_count')
         
         ax4.plot(time, ratios, color='purple', linewidth=2)
         ax4.axhline(y=0.20, color='orange', linestyle='--', 
@@ -124,21 +127,10 @@ class SimulationVisualizer:
             writer = csv.writer(f)
             
             # Header
-            writer.writerow(['Time', 'Prey', 'Predators', 'Food', 
-                           'Prey_Births', 'Predator_Births',
-                           'Prey_Avg_Energy', 'Predator_Avg_Energy'])
+            writer.writerow(CSV_HEADER)
             
-            # Date
-            for i in range(len(self.history['time'])):
-                writer.writerow([
-                    self.history['time'][i],
-                    self.history['prey_count'][i],
-                    self.history['predator_count'][i],
-                    self.history['food_count'][i],
-                    self.history['prey_births'][i],
-                    self.history['predator_births'][i],
-                    self.history['prey_avg_energy'][i],
-                    self.history['predator_avg_energy'][i]
-                ])
+            # Date (cu limita de istoric, doar ultimele frame-uri)
+            columns = [self.history[name].tolist() for name in COLUMN_NAMES]
+            writer.writerows(zip(*columns))
         
         print(f"Date salvate în {filename}")
\ No newline at end of file